@@ -0,0 +1,1173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Quantumia performans ölçümleri
+
+Kullanım: python3 benchmark.py <ölçüm> [-n ADET]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import datetime
+import gzip
+import hashlib
+import http.server
+import io
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
+import zipfile
+
+import run
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Ölçüm fonksiyonunu kaydet"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+def timed(func, *args, **kwargs):
+    """Fonksiyonu çalıştır, (sonuç, saniye) döndür"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def bare_ai():
+    """__init__ çalıştırmadan (ekran, veritabanı, ağ olmadan) bir örnek oluştur"""
+    return object.__new__(run.QuantumiaAI)
+
+def report(title, rows):
+    """Sonuçları hizalı tablo olarak yazdır"""
+    print(f"📊 {title}")
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        print(f"   {name:<{width}}  {value}")
+
+# -------------------- NİYET YÖNLENDİRİCİ --------------------
+LEGACY_ML_PATTERNS = [
+    (r"(merhaba|selam|hey|hi|hello)", "greeting"),
+    (r"(teşekkür|sağol|thanks|thank you)", "thanks"),
+    (r"(nasılsın|ne haber|how are you)", "how_are_you"),
+    (r"(görüşürüz|hoşça kal|goodbye|bye)", "goodbye"),
+]
+
+LEGACY_COMMANDS = [
+    (["hava durumu", "hava", "weather"], "weather"),
+    (["dosya", "file", "klasör", "dizin"], "files"),
+    (["ping", "ip", "ağ", "network"], "network"),
+    (["şifre", "password", "hash", "güvenlik"], "security"),
+    (["sistem", "bilgi", "cpu", "bellek", "ram"], "system"),
+    (["saat", "tarih", "zaman", "ne zaman"], "time"),
+    (["takvim", "calendar", "ayın"], "calendar"),
+    (["şaka", "güldür", "komik", "espri"], "joke"),
+    (["yardım", "help", "ne yapabilirsin", "özellikler"], "help"),
+]
+
+def legacy_route(user_input):
+    """Eski sıralı anahtar kelime zinciri (karşılaştırma için)"""
+    for pattern, name in LEGACY_ML_PATTERNS:
+        if re.search(pattern, user_input, re.IGNORECASE):
+            return name
+    user_input_lower = user_input.lower()
+    for words, name in LEGACY_COMMANDS:
+        if any(word in user_input_lower for word in words):
+            return name
+    for keyword in run.NATURAL_RESPONSES:
+        if keyword in user_input.lower():
+            return f"natural:{keyword}"
+    return None
+
+def synthetic_messages(count, seed=42):
+    """Tetikleyici ve dolgu kelimelerden sentetik mesajlar üret"""
+    rng = random.Random(seed)
+    triggers = [word for words, _ in LEGACY_COMMANDS for word in words]
+    triggers += list(run.NATURAL_RESPONSES) + ["merhaba", "thanks", "ne haber", "bye"]
+    filler = ("bugün yarın lütfen bana biraz daha fazla anlat acaba olur mu şu bu "
+              "the quick brown fox jumps over lazy dog please tell me more").split()
+    pool = []
+    for _ in range(10000):
+        words = [rng.choice(filler) for _ in range(rng.randint(3, 12))]
+        if rng.random() < 0.7:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(triggers))
+        pool.append(' '.join(words))
+    return list(itertools.islice(itertools.cycle(pool), count))
+
+@benchmark("router")
+def bench_router(n):
+    """Yeni yönlendirici ile eski zinciri N sentetik mesajda karşılaştır"""
+    n = n or 1_000_000
+    messages = synthetic_messages(n)
+    router = bare_ai().build_router()
+
+    _, legacy_seconds = timed(lambda: [legacy_route(m) for m in messages])
+    _, router_seconds = timed(lambda: [router.route(m) for m in messages])
+    report(f"Niyet yönlendirme ({n:,} mesaj)", [
+        ("eski zincir", f"{legacy_seconds:8.2f} s  {n / legacy_seconds:12,.0f} mesaj/s"),
+        ("derlenmiş regex", f"{router_seconds:8.2f} s  {n / router_seconds:12,.0f} mesaj/s"),
+        ("hızlanma", f"{legacy_seconds / router_seconds:8.2f}x"),
+    ])
+
+def group_per_intent_pattern(intents):
+    """Önceki derleme: niyet başına adlandırılmış grup, tetikleyiciler düz alternatif"""
+    parts = []
+    for index, triggers in enumerate(intents):
+        alternatives = [re.escape(t) + (r'(?!\w)' if len(t) <= 3 else '') for t in sorted(triggers, key=len, reverse=True)]
+        parts.append(f"(?P<i{index}>{'|'.join(alternatives)})")
+    return re.compile(r'(?<!\w)(?:' + '|'.join(parts) + ')')
+
+@benchmark("response-tables")
+def bench_response_tables(n):
+    """10, 1.000 ve 10.000 kalıplı yanıt tablosunda mesaj başına eşleme maliyeti"""
+    n = n or 20_000
+    rng = random.Random(3)
+    vocabulary = synthetic_words(30_000, rng)
+    filler = vocabulary[20_000:]
+    rows = []
+    for size in (10, 1_000, 10_000):
+        keywords = vocabulary[:size]
+        natural = {k: {'triggers': [k], 'responses': [f"{k} hakkında konuşalım"]} for k in keywords}
+        tables = run.parse_response_tables({'ml': {}, 'natural': natural})
+        router, build_seconds = timed(bare_ai().build_router, tables)
+        messages = []
+        for _ in range(n):
+            words = [rng.choice(filler) for _ in range(rng.randint(4, 12))]
+            if rng.random() < 0.5:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+            messages.append(' '.join(words))
+        legacy = group_per_intent_pattern([(k,) for k in keywords])
+        sample = messages[:max(100, n * 10 // size)]  # eski kalıp büyük tablolarda çok yavaş
+        _, legacy_seconds = timed(lambda: [legacy.search(m) for m in sample])
+        _, trie_seconds = timed(lambda: [router.route(m) for m in messages])
+        rows.append((f"{size:>6,} kalıp",
+                     f"derleme {build_seconds * 1000:7.1f} ms | niyet başına grup {legacy_seconds / len(sample) * 1e6:8.2f} µs | "
+                     f"trie dizini {trie_seconds / n * 1e6:6.2f} µs/mesaj"))
+    report(f"Yanıt tablosu eşleme ({n:,} mesaj)", rows)
+
+# -------------------- SQLITE YAZMA --------------------
+CONVERSATION_INSERT = """
+    INSERT INTO conversations (timestamp, user_input, response, category)
+    VALUES (?, ?, ?, ?)
+"""
+
+def fresh_memory_db(path, settings):
+    """Boş bir conversations tablosu olan veritabanı oluştur"""
+    conn = sqlite3.connect(path)
+    run.apply_pragmas(conn, settings)
+    conn.execute("""
+        CREATE TABLE conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT, user_input TEXT, response TEXT, category TEXT
+        )
+    """)
+    conn.commit()
+    return conn
+
+@benchmark("memory-writes")
+def bench_memory_writes(n):
+    """Kayıt başına commit ile toplu arka plan yazıcıyı karşılaştır"""
+    n = n or 5_000
+    rows = [(f"2026-01-01T00:00:{i % 60:02d}", f"mesaj {i}", f"yanıt {i}", "general") for i in range(n)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Eski yol: her kayıtta INSERT + commit (fsync)
+        conn = fresh_memory_db(os.path.join(tmp, "legacy.db"), {})
+        def legacy():
+            for row in rows:
+                conn.execute(CONVERSATION_INSERT, row)
+                conn.commit()
+        _, seconds = timed(legacy)
+        conn.close()
+        results.append(("kayıt başına commit", seconds))
+
+        for label, settings in [("toplu (journal=delete)", {}),
+                                ("toplu (wal, sync=normal)", {'journal_mode': 'wal', 'synchronous': 'normal'})]:
+            path = os.path.join(tmp, f"batched_{len(results)}.db")
+            fresh_memory_db(path, settings).close()
+            writer = run.WriteBehindQueue(path, batch_size=500, flush_interval=1.0, settings=settings)
+            def batched():
+                for row in rows:
+                    writer.put(CONVERSATION_INSERT, row)
+                writer.flush()
+            _, seconds = timed(batched)
+            writer.close()
+            results.append((label, seconds))
+
+    report(f"SQLite konuşma yazma ({n:,} kayıt)",
+           [(label, f"{seconds:8.3f} s  {n / seconds:12,.0f} kayıt/s") for label, seconds in results])
+
+# -------------------- BİLGİ ARAMA --------------------
+SYLLABLES = ("ka ke ki ko ku la le li lo lu ma me mi mo mu na ne ni no nu ra re ri ro ru "
+             "sa se si so su ta te ti to tu ya ye yi yo yu şa çe ğı ö ü").split()
+
+def synthetic_words(count, rng):
+    """Hecelerden count adet benzersiz sentetik kelime üret"""
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def knowledge_fixture(path, n, vocabulary, seed=7):
+    """Mevcut şemayla (dizinsiz) n satırlık bilgi tablosu oluştur"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE knowledge (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT, information TEXT, source TEXT, created_at TEXT
+        )
+    """)
+    def rows():
+        for i in range(n):
+            topic = ' '.join(rng.sample(vocabulary, 2))
+            information = ' '.join(rng.choice(vocabulary) for _ in range(12))
+            stamp = datetime.datetime(2020, 1, 1) + datetime.timedelta(seconds=rng.randrange(10 ** 8))
+            yield topic, information, "bench", stamp.isoformat()
+    with conn:
+        conn.executemany("INSERT INTO knowledge (topic, information, source, created_at) VALUES (?, ?, ?, ?)",
+                         rows())
+    return conn
+
+@benchmark("knowledge-search")
+def bench_knowledge_search(n):
+    """LIKE '%konu%' taraması ile FTS5/BM25 sorgusunu aynı veri üzerinde karşılaştır"""
+    n = n or 1_000_000
+    rng = random.Random(11)
+    vocabulary = synthetic_words(max(1000, n // 10), rng)
+    queries = [rng.choice(vocabulary) for _ in range(50)]
+    per = len(queries) / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, build_seconds = timed(knowledge_fixture, os.path.join(tmp, "knowledge.db"), n, vocabulary)
+
+        # Eski yol, mevcut şemada: tam tablo taraması + sıralama
+        def like():
+            for topic in queries:
+                conn.execute("SELECT information FROM knowledge WHERE topic LIKE ? "
+                             "ORDER BY created_at DESC LIMIT 3", (f'%{topic}%',)).fetchall()
+        _, like_seconds = timed(like)
+
+        _, migrate_seconds = timed(run.ensure_knowledge_index, conn)
+        def fts():
+            for topic in queries:
+                conn.execute("""
+                    SELECT k.information FROM knowledge_fts
+                    JOIN knowledge k ON k.id = knowledge_fts.rowid
+                    WHERE knowledge_fts MATCH ?
+                    ORDER BY bm25(knowledge_fts, 10.0, 1.0), k.created_at DESC LIMIT 3
+                """, (run.fts_query(topic),)).fetchall()
+        _, fts_seconds = timed(fts)
+        conn.close()
+
+    report(f"Bilgi arama ({n:,} satır, {len(queries)} sorgu)", [
+        ("veri kurulumu", f"{build_seconds:8.2f} s"),
+        ("tek seferlik geçiş", f"{migrate_seconds:8.2f} s"),
+        ("LIKE '%konu%'", f"{like_seconds / per:8.2f} ms/sorgu"),
+        ("FTS5 + BM25", f"{fts_seconds / per:8.2f} ms/sorgu"),
+    ])
+
+def knowledge_db(path):
+    """Uygulamanın şemasıyla (FTS5, içerik özeti indeksi) boş bilgi veritabanı"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE knowledge (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT, information TEXT, source TEXT, created_at TEXT
+        )
+    """)
+    run.ensure_knowledge_index(conn)
+    run.ensure_knowledge_hashes(conn)
+    conn.close()
+    return path
+
+def write_import_files(tmp, n, vocabulary, rng, duplicates=0.1):
+    """Aynı n kaydı (yaklaşık %10 tekrar) CSV, JSONL ve XML olarak yaz"""
+    unique = max(1, int(n * (1 - duplicates)))
+    records = [(' '.join(rng.sample(vocabulary, 2)).capitalize(), ' '.join(rng.choice(vocabulary) for _ in range(12)))
+               for _ in range(unique)]
+    records += [rng.choice(records) for _ in range(n - unique)]
+    rng.shuffle(records)
+    paths = {fmt: os.path.join(tmp, f"faq.{fmt}") for fmt in run.KNOWLEDGE_IMPORT_FORMATS}
+    with open(paths['csv'], 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["soru", "cevap"])
+        writer.writerows(records)
+    with open(paths['jsonl'], 'w', encoding='utf-8') as f:
+        for topic, information in records:
+            f.write(json.dumps({'topic': topic, 'information': information}, ensure_ascii=False) + "\n")
+    with open(paths['xml'], 'w', encoding='utf-8') as f:
+        f.write("<faq>\n")
+        for topic, information in records:
+            f.write(f"<entry><topic>{topic}</topic><information>{information}</information></entry>\n")
+        f.write("</faq>\n")
+    return records, paths
+
+class StopImport(Exception):
+    pass
+
+@benchmark("knowledge-import")
+def bench_knowledge_import(n):
+    """Toplu bilgi aktarımı: add_knowledge ile satır satır, akışlı yükleyici, devam ve XML belleği"""
+    n = n or 200_000
+    rng = random.Random(13)
+    vocabulary = synthetic_words(5000, rng)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        records, paths = write_import_files(tmp, n, vocabulary, rng)
+        unique = len(set((run.turkish_lower(t), run.turkish_lower(i)) for t, i in records))
+
+        # Eski yol: add_knowledge gibi kayıt başına INSERT, yazma kuyruğu ve canlı FTS tetikleyicisi
+        legacy_n = min(n, 50_000)
+        path = knowledge_db(os.path.join(tmp, "legacy.db"))
+        writer = run.WriteBehindQueue(path, batch_size=500, flush_interval=1.0)
+        def legacy():
+            now = datetime.datetime.now().isoformat()
+            for topic, information in records[:legacy_n]:
+                writer.put("INSERT INTO knowledge (topic, information, source, created_at) VALUES (?, ?, ?, ?)",
+                           (topic, information, "user", now))
+            writer.flush()
+        _, seconds = timed(legacy)
+        writer.close()
+        rows.append((f"add_knowledge, satır satır ({legacy_n:,})", f"{legacy_n / seconds:10,.0f} kayıt/s"))
+
+        for fmt, source in paths.items():
+            importer = run.KnowledgeImporter(knowledge_db(os.path.join(tmp, f"{fmt}.db")))
+            status = importer.run(source)
+            rows.append((f"yükleyici, {fmt}", f"{status.records / status.seconds:10,.0f} kayıt/s | "
+                                             f"{status.inserted:,}/{unique:,} tekil eklendi"))
+
+        # Yarıda kesilip sürdürülen aktarım: toplam süre ve sonuç tek geçişle aynı olmalı
+        importer = run.KnowledgeImporter(knowledge_db(os.path.join(tmp, "resume.db")), batch_size=max(1, n // 10))
+        def interrupt(status):
+            if status.records >= n // 2:
+                raise StopImport
+        try:
+            importer.run(paths['jsonl'], progress=interrupt)
+        except StopImport:
+            pass
+        status = importer.run(paths['jsonl'])
+        rows.append(("kesilip sürdürülen (jsonl)", f"{status.seconds:8.2f} s | {status.resumed_from:,}. kayıttan, "
+                                                    f"{status.inserted:,} tekil"))
+
+        # XML akış ayrıştırma belleği: onda bir ve tam dosya
+        small = os.path.join(tmp, "small.xml")
+        with open(small, 'w', encoding='utf-8') as f:
+            f.write("<faq>\n" + ''.join(f"<entry><topic>{t}</topic><information>{i}</information></entry>\n"
+                                        for t, i in records[:n // 10]) + "</faq>\n")
+        peaks = []
+        for source in (small, paths['xml']):
+            tracemalloc.start()
+            for _ in run.iter_knowledge_records(source):
+                pass
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        rows.append(("XML tepe bellek, n/10 → n", f"{peaks[0] / 1024:6.0f} KB → {peaks[1] / 1024:,.0f} KB"))
+    report(f"Bilgi aktarımı ({n:,} kayıt, ~%10 tekrar)", rows)
+
+# -------------------- ANLAMSAL ARAMA --------------------
+@benchmark("semantic-search")
+def bench_semantic_search(n):
+    """TF-IDF sorgu gecikmesini 10k, 100k ve 1M belgede ölç (-n en büyük boyutu sınırlar)"""
+    n = n or 1_000_000
+    rng = random.Random(5)
+    vocabulary = synthetic_words(50_000, rng)
+    sizes = [size for size in (10_000, 100_000, 1_000_000) if size <= n] or [n]
+    texts = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(4, 16))) for _ in range(max(sizes))]
+    queries = [' '.join(rng.choice(vocabulary) for _ in range(4)) for _ in range(200)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            index = run.SemanticIndex(os.path.join(tmp, "unused.db"), os.path.join(tmp, f"model_{size}.npz"))
+            _, fit_seconds = timed(index.fit, texts[:size], [run.TABLE_KNOWLEDGE] * size, range(size),
+                                   {'conversations': 0, 'knowledge': size})
+            _, save_seconds = timed(index.save)
+            _, load_seconds = timed(index.load)
+            _, query_seconds = timed(lambda: [index.query(q, k=5) for q in queries])
+            rows.append((f"{size:,} belge",
+                         f"eğitim {fit_seconds:7.2f} s | kaydet {save_seconds:6.2f} s | "
+                         f"yükle {load_seconds:6.2f} s | sorgu {query_seconds / len(queries) * 1000:7.3f} ms"))
+    report("TF-IDF anlamsal arama (top-5)", rows)
+
+# -------------------- İŞ YÖNETİCİSİ --------------------
+def percentile(values, p):
+    """Sıralı olmayan listeden p. yüzdelik (en yakın sıra)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+class DiscardWriter:
+    """Geçmiş kayıtlarını veritabanına yazmayan yazma kuyruğu yerine geçen nesne"""
+    def put(self, sql, params):
+        pass
+
+def dispatch_ai():
+    """dispatch() için gereken alanlarla hafif bir örnek kur"""
+    ai = bare_ai()
+    ai.name = "Quantumia"
+    ai.creator = "OrionixOS"
+    ai.user_name = "Kullanıcı"
+    ai.response_cache = run.ResponseCache()
+    ai.router = ai.build_router()
+    ai._responses_watch = run.FileWatch("data/responses.json", interval=float('inf'))
+    ai.history = run.ConversationHistory(DiscardWriter(), None)
+    ai._local = threading.local()
+    ai.jobs = None
+    ai._awaiting_input = False
+    return ai
+
+def heavy_io_job():
+    run.cancellable_sleep(60)
+
+def heavy_cpu_job():
+    buffer = os.urandom(16 * 1024 * 1024)
+    while not run.job_cancelled():
+        hashlib.sha256(buffer).digest()
+
+@benchmark("jobs-latency")
+def bench_jobs_latency(n):
+    """20 ağır iş çalışırken basit niyetlerin ek gecikmesini ölç"""
+    n = n or 5_000
+    ai = dispatch_ai()
+    messages = ["merhaba", "saat kaç", "takvim", "teşekkürler", "şaka yap"]
+
+    async def scenario(heavy):
+        ai.jobs = run.JobManager(asyncio.get_running_loop())
+        for i in range(heavy):
+            if i % 2:
+                ai.jobs.submit("cpu", heavy_cpu_job, run.JOB_CPU)
+            else:
+                ai.jobs.submit("io", heavy_io_job, run.JOB_IO)
+        await asyncio.sleep(0.5)  # işler ısınsın
+        latencies = []
+        for i in range(n):
+            start = time.perf_counter()
+            ai.dispatch(messages[i % len(messages)])
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0)
+        running = len(ai.jobs.active())
+        ai.jobs.shutdown()
+        return latencies, running
+
+    rows = []
+    for heavy in (0, 20):
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, running = asyncio.run(scenario(heavy))
+        rows.append((f"{running} ağır iş çalışırken",
+                     f"p50 {percentile(latencies, 50):7.3f} ms | p99 {percentile(latencies, 99):7.3f} ms | "
+                     f"maks {max(latencies):7.2f} ms"))
+    report(f"Basit niyet gecikmesi ({n:,} mesaj)", rows)
+
+# -------------------- YEDEKLEME --------------------
+def legacy_zip_backup(paths, target):
+    """Eski create_backup: her seferinde tam zip (sıkıştırmasız)"""
+    with zipfile.ZipFile(target, 'w') as zipf:
+        for path in paths:
+            zipf.write(path, os.path.basename(path))
+    return os.path.getsize(target)
+
+def churn(conn, fraction, pool, rng):
+    """Satırların fraction kadarını rastgele yeni içerikle güncelle"""
+    total = conn.execute("SELECT MAX(id) FROM conversations").fetchone()[0]
+    ids = rng.sample(range(1, total + 1), max(1, int(total * fraction)))
+    conn.executemany("UPDATE conversations SET response = ? WHERE id = ?",
+                     [(pool[rng.randrange(len(pool))], i) for i in ids])
+    conn.commit()
+
+@benchmark("backup")
+def bench_backup(n):
+    """Tam zip ve artımlı yedeklemeyi -n MB'lık veritabanında %1 değişiklikle karşılaştır"""
+    megabytes = n or 1024
+    rng = random.Random(11)
+    vocabulary = synthetic_words(20_000, rng)
+    pool = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(20, 200))) for _ in range(50_000)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "ai_memory.db")
+        conn = fresh_memory_db(db, {'journal_mode': 'wal', 'synchronous': 'normal'})
+        start = time.perf_counter()
+        while os.path.getsize(db) < megabytes * 1024 * 1024:
+            conn.executemany("INSERT INTO conversations (timestamp, user_input, response, category) "
+                             "VALUES ('', ?, ?, 'general')",
+                             [(pool[rng.randrange(len(pool))], pool[rng.randrange(len(pool))])
+                              for _ in range(20_000)])
+            conn.commit()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        rows.append(("veri kurulumu", f"{os.path.getsize(db) / 2**20:8.0f} MB, {time.perf_counter() - start:6.1f} s"))
+        engine = run.BackupEngine(os.path.join(tmp, "backups"))
+        for label in ("ilk yedek", "%1 değişiklik sonrası"):
+            if label != "ilk yedek":
+                churn(conn, 0.01, pool, rng)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            size, zip_seconds = timed(legacy_zip_backup, [db], os.path.join(tmp, "legacy.zip"))
+            manifest, engine_seconds = timed(engine.backup, db)
+            stats = manifest['stats']
+            rows.append((f"{label}: zip", f"{zip_seconds:8.2f} s | +{size / 2**20:9.1f} MB"))
+            rows.append((f"{label}: artımlı", f"{engine_seconds:8.2f} s | +{stats['stored_bytes'] / 2**20:9.1f} MB "
+                                              f"({stats['new_chunks']:,}/{stats['chunks']:,} yeni parça)"))
+        _, verify_seconds = timed(engine.verify, manifest['id'])
+        rows.append(("doğrulama", f"{verify_seconds:8.2f} s"))
+        conn.close()
+    report(f"Yedekleme ({megabytes:,} MB veritabanı)", rows)
+
+# -------------------- ÇALIŞMA ZAMANI ÖLÇÜMLERİ --------------------
+@benchmark("instrumentation")
+def bench_instrumentation(n):
+    """respond() maliyetini ölçüm kapalı, açık ve cProfile örneklemeli karşılaştır"""
+    n = n or 200_000
+    ai = dispatch_ai()
+    ai.semantic = None  # doğal dil yedeği veritabanına gitmesin
+    sync = []
+    for message in synthetic_messages(20_000):
+        match = ai.router.route(message)
+        if match is not None and match.stage != run.STAGE_COMMAND:
+            sync.append(message)
+    messages = list(itertools.islice(itertools.cycle(sync), n))
+
+    def respond_all():
+        for message in messages:
+            ai.respond(message)
+
+    rows = []
+    for label, enabled, sample_every in (("kapalı", False, None), ("açık", True, None),
+                                         ("açık + cProfile 1/10", True, 10)):
+        run.metrics.reset()
+        run.metrics.enabled = enabled
+        if sample_every:
+            run.metrics.start_profiling(sample_every)
+        _, seconds = timed(respond_all)
+        run.metrics.stop_profiling()
+        rows.append((label, f"{seconds / n * 1e6:7.2f} µs/yanıt"))
+    run.metrics.enabled = False
+    report(f"Ölçüm yükü ({n:,} ML/doğal dil yanıtı)", rows)
+
+# -------------------- LOGGING --------------------
+@benchmark("logging")
+def bench_logging(n):
+    """Çağıran iş parçacığının saniyede yayabildiği kayıt: eşzamanlı işleyiciler ve kuyruk hattı"""
+    n = n or 200_000
+    bench_logger = logging.getLogger('QuantumiaAI.bench')
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull:
+        def emit():
+            for i in range(n):
+                bench_logger.info(f"kayıt {i}: kullanıcı girdisi işlendi")
+
+        root = logging.getLogger()
+        saved = list(root.handlers)
+        for handler in saved:
+            root.removeHandler(handler)
+        # Eski düzen: basicConfig ile FileHandler + StreamHandler, çağıranda yazar
+        legacy = [logging.FileHandler(os.path.join(tmp, "legacy.log")), logging.StreamHandler(devnull)]
+        for handler in legacy:
+            handler.setFormatter(logging.Formatter(run.LOG_FORMAT))
+            root.addHandler(handler)
+        _, seconds = timed(emit)
+        rows.append(("eşzamanlı (FileHandler)", f"{n / seconds:10,.0f} kayıt/s"))
+        for handler in legacy:
+            root.removeHandler(handler)
+            handler.close()
+
+        for label, json_format in (("kuyruk + döndürme", False), ("kuyruk + JSONL", True)):
+            with contextlib.redirect_stderr(devnull):
+                run.setup_logging(os.path.join(tmp, f"queued_{json_format}.log"),
+                                  json_format=json_format, max_bytes=8 * 1024 * 1024)
+                _, seconds = timed(emit)
+                _, drain = timed(run.stop_logging)
+            archives = len([name for name in os.listdir(tmp) if name.endswith('.gz')])
+            rows.append((label, f"{n / seconds:10,.0f} kayıt/s (boşaltma {drain:5.2f} s, {archives} arşiv)"))
+
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved:
+            root.addHandler(handler)
+    report(f"Logging ({n:,} kayıt, çağıran iş parçacığı)", rows)
+
+# -------------------- KONUŞMA GEÇMİŞİ --------------------
+def fill_conversations(path, n, seed=11):
+    """n turluk, kategorileri ve zamanı dağılmış bir conversations tablosu kur"""
+    rng = random.Random(seed)
+    vocabulary = synthetic_words(2000, rng)
+    categories = ['greeting', 'weather', 'time', 'system', 'files', run.FALLBACK_CATEGORY, 'general']
+    start = datetime.datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE conversations (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT,
+                    user_input TEXT, response TEXT, category TEXT)""")
+    run.ensure_conversation_index(conn)
+    with conn:
+        conn.executemany(
+            "INSERT INTO conversations (timestamp, user_input, response, category) VALUES (?, ?, ?, ?)",
+            [((start + datetime.timedelta(seconds=i * 15)).isoformat(),
+              ' '.join(rng.choices(vocabulary, k=6)), ' '.join(rng.choices(vocabulary, k=12)),
+              rng.choice(categories)) for i in range(n)])
+    conn.close()
+    return vocabulary, start
+
+@benchmark("history")
+def bench_history(n):
+    """Geçmiş sayfası gecikmesi (imleçle derin sayfalar dahil) ve sıcak katmanın sabit belleği"""
+    n = n or 1_000_000
+    import tracemalloc
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        (vocabulary, start), build = timed(fill_conversations, path, n)
+        pool = run.ConnectionPool(path)
+        writer = run.WriteBehindQueue(path)
+        history = run.ConversationHistory(writer, pool)
+        middle = (start + datetime.timedelta(seconds=n * 15 // 2)).isoformat()
+        cases = [
+            ("en yeni sayfa", None, {}),
+            ("ortadan (imleç)", n // 2, {}),
+            ("kategori", None, {'category': 'weather'}),
+            ("kategori, ortadan", n // 2, {'category': run.FALLBACK_CATEGORY}),
+            ("zaman aralığı", None, {'since': start.isoformat(), 'until': middle}),
+            ("metin (FTS)", None, {'text': vocabulary[7]}),
+            ("metin, ortadan", n // 2, {'text': vocabulary[11]}),
+        ]
+        rows = []
+        for label, cursor, filters in cases:
+            times = []
+            for _ in range(50):
+                _, seconds = timed(history.page, cursor, 20, **filters)
+                times.append(seconds * 1000)
+            rows.append((label, f"p50 {percentile(times, 50):6.2f} ms | p99 {percentile(times, 99):6.2f} ms"))
+
+        # Sıcak katman: tur sayısı arttıkça bellek sabit kalmalı
+        hot = run.ConversationHistory(DiscardWriter(), None)
+        tracemalloc.start()
+        for turns in (10_000, 100_000, 1_000_000):
+            while len(hot) < turns:
+                hot.record("bugün hava nasıl olacak", "🌤️ İstanbul: parçalı bulutlu, 21°C", "weather")
+            rows.append((f"sıcak katman {turns:,} tur", f"{tracemalloc.get_traced_memory()[0] / 1024:8.1f} KB"))
+        tracemalloc.stop()
+        writer.close()
+        pool.close()
+    report(f"Konuşma geçmişi ({n:,} kayıt, kurulum {build:.1f} s, sayfa 20 satır)", rows)
+
+# -------------------- DOSYA ÖZETLERİ --------------------
+def legacy_hash(path, algorithms):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return {name: hashlib.new(name, data).hexdigest() for name in algorithms}
+
+@benchmark("hashing")
+def bench_hashing(n):
+    """Ağaç özetleme: tam okuma + sıralı, akışlı + paralel ve SQLite önbellekli yeniden çalıştırma"""
+    n = n or 256  # MB
+    algorithms = ('blake2b', 'sha3_256')
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        remaining = n * 1024 * 1024
+        i = 0
+        while remaining > 0:
+            size = min(remaining, rng.choice((64 * 1024, 1024 * 1024, 16 * 1024 * 1024)))
+            folder = os.path.join(tree, f"d{i % 8}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"f{i}.bin"), 'wb') as f:
+                f.write(os.urandom(size))
+            remaining -= size
+            i += 1
+        db_path = os.path.join(tmp, "hashes.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""CREATE TABLE file_hashes (path TEXT NOT NULL, algorithm TEXT NOT NULL,
+                            size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL,
+                            hashed_at TEXT, PRIMARY KEY (path, algorithm)) WITHOUT ROWID""")
+        writer = run.WriteBehindQueue(db_path)
+        pool = run.ConnectionPool(db_path)
+        hasher = run.FileHasher(algorithms, cache=run.HashCache(pool, writer))
+        paths = hasher.expand([tree])
+        mb = n
+
+        _, legacy = timed(lambda: [legacy_hash(path, algorithms) for path in paths])
+        (_, cold), _ = timed(hasher.hash_paths, paths)
+        (_, warm), _ = timed(hasher.hash_paths, paths)
+        writer.close()
+        pool.close()
+    report(f"Dosya özetleme ({len(paths)} dosya, {mb} MB, {' + '.join(algorithms)})", [
+        ("tam okuma, sıralı", f"{mb / legacy:8.1f} MB/s ({legacy:6.2f} s)"),
+        ("akışlı, paralel", f"{cold['mb_per_s']:8.1f} MB/s ({cold['seconds']:6.2f} s)"),
+        ("önbellekli tekrar", f"{mb / warm['seconds']:8.1f} MB/s ({warm['seconds']:6.3f} s, "
+                              f"{warm['cached']}/{warm['files']} önbellekten)"),
+    ])
+
+# -------------------- HAVA DURUMU --------------------
+class StubWeatherHandler(http.server.BaseHTTPRequestHandler):
+    """Open-Meteo /v1/forecast yanıtını taklit eden yerel uç nokta (sabit gecikmeli)"""
+    protocol_version = "HTTP/1.1"
+    delay = 0.01
+    hits = 0
+    connections = set()
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        type(self).hits += 1
+        type(self).connections.add(self.client_address)
+        time.sleep(self.delay)
+        lat, lon = float(query['latitude'][0]), float(query['longitude'][0])
+        body = json.dumps({'latitude': lat, 'longitude': lon, 'current': {
+            'temperature_2m': round(10 + lat % 15, 1), 'relative_humidity_2m': int(40 + lon % 50),
+            'weather_code': 2, 'wind_speed_10m': 11.5}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@contextlib.contextmanager
+def stub_weather_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 256
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def synthetic_places(count, rng):
+    names = set()
+    while len(names) < count:
+        names.add(''.join(rng.choices("abcçdefgğhıijklmnoöprsştuüvyz", k=rng.randint(5, 10))).capitalize())
+    return [run.Place(name, round(rng.uniform(36, 42), 2), round(rng.uniform(26, 45), 2), "TR", None)
+            for name in sorted(names)]
+
+@benchmark("weather")
+def bench_weather(n):
+    """Çok şehirli hava durumu: tek tek requests.get, havuzlu + birleştirilmiş, disk önbelleği, çevrimdışı"""
+    n = n or 300
+    rng = random.Random(5)
+    places = synthetic_places(n, rng)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, stub_weather_server() as base_url:
+        cache_path = os.path.join(tmp, "weather_cache.db")
+        params = {'current': 'temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m'}
+
+        StubWeatherHandler.connections = set()
+        _, legacy = timed(lambda: [run.requests.get(f"{base_url}/v1/forecast", timeout=5, params=dict(
+            params, latitude=place.lat, longitude=place.lon)).json() for place in places])
+        rows.append(("requests.get, sırayla", f"{legacy:6.2f} s | {n} istek, "
+                                              f"{len(StubWeatherHandler.connections)} bağlantı"))
+
+        provider = run.WeatherProvider(run.WeatherCache(cache_path), base_url, workers=32)
+        StubWeatherHandler.hits = 0
+        StubWeatherHandler.connections = set()
+        duplicated = places + places  # her şehir iki kez, eşzamanlı
+        _, cold = timed(provider.forecast_many, duplicated)
+        rows.append(("havuzlu, paralel (2× tekrar)", f"{cold:6.2f} s | {StubWeatherHandler.hits} istek, "
+                                                     f"{len(StubWeatherHandler.connections)} bağlantı"))
+        _, warm = timed(provider.forecast_many, places)
+        rows.append(("bellek önbelleği", f"{warm * 1000:6.1f} ms"))
+        provider.close()
+        provider.cache.close()
+
+        StubWeatherHandler.hits = 0
+        restarted = run.WeatherProvider(run.WeatherCache(cache_path), base_url, workers=32)
+        _, disk = timed(restarted.forecast_many, places)
+        rows.append(("yeniden başlatma (disk)", f"{disk * 1000:6.1f} ms | {StubWeatherHandler.hits} istek"))
+        restarted.cache.close()
+
+        # Çevrimdışı: süresi dolmuş kayıtlar, ulaşılamayan uç nokta
+        offline = run.WeatherProvider(run.WeatherCache(cache_path), f"http://127.0.0.1:{free_port()}", ttl=0,
+                                      workers=32, timeout=1)
+        results, seconds = timed(offline.forecast_many, places)
+        stale = sum(1 for _, forecast in results if isinstance(forecast, run.Forecast) and forecast.stale)
+        rows.append(("çevrimdışı yedek", f"{seconds * 1000:6.1f} ms | {stale}/{n} eski kayıttan"))
+        offline.close()
+        offline.cache.close()
+
+    # Yer sözlüğü: trie taraması ve ad listesinde doğrusal arama
+    names = synthetic_places(20_000, rng)
+    gazetteer = run.Gazetteer.load()
+    for place in names:
+        gazetteer.add(place.name, place)
+    folded = [run.turkish_fold(place.name) for place in names]
+    queries = [f"hava durumu {rng.choice(names).name.upper()}'da yarın" for _ in range(2000)]
+    _, trie = timed(lambda: [gazetteer.find(query) for query in queries])
+    _, linear = timed(lambda: [next((name for name in folded if name in run.turkish_fold(query)), None)
+                               for query in queries[:200]])
+    rows.append((f"yer eşleme ({gazetteer.count:,} ad), doğrusal", f"{linear / 200 * 1e6:8.1f} µs/sorgu"))
+    rows.append((f"yer eşleme ({gazetteer.count:,} ad), trie", f"{trie / len(queries) * 1e6:8.1f} µs/sorgu"))
+    report(f"Hava durumu ({n} şehir, yerel taklit sunucu, 10 ms gecikme)", rows)
+
+# -------------------- VİKİPEDİ --------------------
+class StubWikiHandler(http.server.BaseHTTPRequestHandler):
+    """REST özet ve api.php bağlantı uç noktalarını taklit eden yerel Vikipedi (sabit gecikmeli)"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Başlık ve gövde ayrı yazılır; keep-alive'da gecikmeli ACK beklenmesin
+    delay = 0.01
+    hits = 0
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        type(self).hits += 1
+        time.sleep(self.delay)
+        if url.path.startswith("/api/rest_v1/page/summary/"):
+            title = urllib.parse.unquote(url.path.rsplit('/', 1)[1]).replace('_', ' ')
+            if title.startswith("Yok"):
+                return self.reply(404, {'type': 'not_found'})
+            body = {'type': 'standard', 'title': title, 'extract': synthetic_extract(title),
+                    'content_urls': {'desktop': {'page': f"https://tr.wikipedia.org/wiki/{title}"}}}
+            return self.reply(200, body)
+        if url.path == "/w/api.php":
+            title = urllib.parse.parse_qs(url.query)['titles'][0]
+            limit = int(urllib.parse.parse_qs(url.query)['pllimit'][0])
+            links = [{'ns': 0, 'title': f"{title} {i}"} for i in range(limit)]
+            return self.reply(200, {'query': {'pages': [{'title': title, 'links': links}]}})
+        self.reply(404, {})
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@contextlib.contextmanager
+def stub_wiki_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubWikiHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def synthetic_extract(title, words=80):
+    rng = random.Random(title)
+    return f"{title}, " + ' '.join(rng.choice(("bir", "şehir", "tarih", "bilim", "yıl", "nehir", "ülke", "dil",
+                                               "kuruldu", "büyük", "merkezi", "olarak", "bilinen"))
+                                   for _ in range(words)) + "."
+
+@benchmark("wiki")
+def bench_wiki(n):
+    """Vikipedi özetleri: döküm aktarımı, önbellek isabeti, ağdan çekme, birleştirme ve ön çekme"""
+    n = n or 50_000
+    rng = random.Random(9)
+    titles = [' '.join(w.capitalize() for w in synthetic_words(rng.randint(1, 3), rng)) + f" {i}"
+              for i in range(n)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, stub_wiki_server() as base_url:
+        dump = os.path.join(tmp, "trwiki-abstract.jsonl.gz")
+        with gzip.open(dump, 'wt', encoding='utf-8') as f:
+            for title in titles:
+                f.write(json.dumps({'title': title, 'extract': synthetic_extract(title)}, ensure_ascii=False) + "\n")
+        lookup = run.WikiLookup(run.WikiCache(os.path.join(tmp, "wiki_cache.db")), base_url, prefetch=0)
+        count, seconds = timed(lookup.import_dump, dump)
+        (_, _, size, stored), = lookup.cache.stats()
+        rows.append((f"döküm aktarımı ({lookup.cache.codec})", f"{count / seconds:10,.0f} madde/s | "
+                                                               f"{size / stored:.1f}× sıkıştırma"))
+
+        queries = [rng.choice(titles).lower() for _ in range(2000)]
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            assert lookup.lookup(query) is not None
+            timings.append(time.perf_counter() - start)
+        rows.append(("önbellek isabeti, p50", f"{percentile(timings, 50) * 1000:10.3f} ms"))
+        rows.append(("önbellek isabeti, p99", f"{percentile(timings, 99) * 1000:10.3f} ms"))
+
+        StubWikiHandler.hits = 0
+        _, legacy = timed(lambda: [run.requests.get(f"{base_url}/api/rest_v1/page/summary/Konu_{i}",
+                                                    timeout=5).json() for i in range(50)])
+        rows.append(("requests.get, her sorguda", f"{legacy / 50 * 1000:10.3f} ms"))
+        _, miss = timed(lambda: [lookup.lookup(f"Yeni konu {i}") for i in range(50)])
+        rows.append(("ağdan çekme (havuzlu)", f"{miss / 50 * 1000:10.3f} ms"))
+
+        StubWikiHandler.hits = 0
+        with run.ThreadPoolExecutor(32) as executor:
+            results = list(executor.map(lambda _: lookup.lookup("Eşzamanlı konu"), range(32)))
+        rows.append(("32 eşzamanlı aynı sorgu", f"{StubWikiHandler.hits:10d} istek | "
+                                                f"{sum(1 for r in results if r)}/32 yanıt"))
+
+        lookup.prefetch = 10
+        _, prefetch = timed(lookup.prefetch_links, "Ön çekme")
+        linked = sum(1 for i in range(10) if lookup.lookup(f"Ön çekme {i}", fetch=False))
+        rows.append(("bağlantı ön çekme (10 madde)", f"{prefetch * 1000:10.1f} ms | {linked}/10 önbellekte"))
+        lookup.close()
+        lookup.cache.close()
+    report(f"Vikipedi ({n:,} madde, yerel taklit sunucu, 10 ms gecikme)", rows)
+
+# -------------------- ARŞİVLER --------------------
+def archive_tree(root, n, rng):
+    """n küçük metin dosyalı (0.5-8 KB), 100 dizine dağılmış ağaç"""
+    words = synthetic_words(2000, rng)
+    total = 0
+    for i in range(n):
+        folder = os.path.join(root, f"d{i % 100:03d}")
+        os.makedirs(folder, exist_ok=True)
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(80, 1300)))
+        with open(os.path.join(folder, f"f{i:05d}.txt"), 'w', encoding='utf-8') as f:
+            total += f.write(text)
+    return total
+
+@benchmark("archives")
+def bench_archives(n):
+    """n üyeli arşiv: seri extractall ile paralel/akışlı açma, listeleme ve tar.gz oluşturma"""
+    n = n or 10_000
+    rng = random.Random(21)
+    rows = []
+    toolkit = run.ArchiveToolkit()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "tree")
+        size = archive_tree(source, n, rng)
+
+        def serial_targz(path):
+            with tarfile.open(path, 'w:gz') as archive:
+                archive.add(source, "tree")
+        _, serial = timed(serial_targz, os.path.join(tmp, "serial.tar.gz"))
+        stats = toolkit.create(os.path.join(tmp, "tree.tar.gz"), [source])
+        rows.append(("tar.gz oluşturma, tarfile w:gz", f"{serial:8.2f} s"))
+        rows.append((f"tar.gz oluşturma, {toolkit.cpu_workers} çekirdek", f"{stats['seconds']:8.2f} s | "
+                                                                        f"%{stats['size'] / size * 100:.0f}"))
+        toolkit.create(os.path.join(tmp, "tree.zip"), [source])
+
+        for fmt in ("zip", "tar.gz"):
+            path = os.path.join(tmp, f"tree.{fmt}")
+            _, listing = timed(lambda: sum(1 for _ in toolkit.entries(path)))
+            rows.append((f"{fmt} listeleme", f"{listing * 1000:8.1f} ms"))
+
+            def legacy():
+                if fmt == "zip":
+                    with zipfile.ZipFile(path) as archive:
+                        archive.extractall(os.path.join(tmp, f"legacy-{fmt}"))
+                else:
+                    with tarfile.open(path) as archive:
+                        archive.extractall(os.path.join(tmp, f"legacy-{fmt}"))
+            _, serial = timed(legacy)
+            rows.append((f"{fmt} açma, seri extractall", f"{serial:8.2f} s"))
+            for workers in sorted({1, 4, toolkit.workers}):
+                stats = run.ArchiveToolkit(workers).extract(path, os.path.join(tmp, f"out-{fmt}-{workers}"))
+                assert stats['files'] == n, stats
+                rows.append((f"{fmt} açma, {workers} iş parçacığı", f"{stats['seconds']:8.2f} s | "
+                                                                  f"{serial / stats['seconds']:.2f}×"))
+    report(f"Arşivler ({n:,} üye, {size / 1024 / 1024:.0f} MB, {os.cpu_count()} çekirdek)", rows)
+
+# -------------------- ŞİFRE ÜRETİCİ --------------------
+def legacy_password(length=12):
+    chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()"
+    return ''.join(random.choice(chars) for _ in range(length))
+
+@benchmark("passwords")
+def bench_passwords(n):
+    """Saniyede şifre: random.choice, secrets ile tekil ve numpy ile toplu üretim"""
+    n = n or 1_000_000
+    single = max(1, n // 20)
+    generator = run.PasswordGenerator(run.PasswordPolicy(16))
+    generator.generate(1)  # numpy yüklemesi ölçüme girmesin
+    _, legacy = timed(lambda: [legacy_password(16) for _ in range(single)])
+    _, one = timed(lambda: [generator.generate_one() for _ in range(single)])
+    _, bulk = timed(lambda: sum(1 for _ in generator.stream(n)))
+    report(f"Şifre üretimi (16 karakter, {generator.policy.entropy_bits():.1f} bit)", [
+        ("random.choice (eski)", f"{single / legacy:12,.0f} şifre/s"),
+        ("secrets, tekil", f"{single / one:12,.0f} şifre/s"),
+        ("os.urandom + numpy, toplu", f"{n / bulk:12,.0f} şifre/s"),
+    ])
+
+# -------------------- SİSTEM ÖRNEKLEYİCİ --------------------
+def legacy_system_status():
+    return (run.psutil.cpu_percent(), run.psutil.virtual_memory(), run.psutil.disk_usage('/'),
+            run.psutil.net_io_counters())
+
+@benchmark("system-status")
+def bench_system_status(n):
+    """Sistem durumu okuması: her çağrıda psutil ve örnekleyicinin son örneği/penceresi"""
+    n = n or 2_000
+    _, legacy = timed(lambda: [legacy_system_status() for _ in range(n)])
+    sampler = run.SystemSampler(interval=0.01, history=600).start()
+    sampler.wait(timeout=2)
+    time.sleep(1)
+    _, latest = timed(lambda: [sampler.latest() for _ in range(n)])
+    _, summary = timed(lambda: [sampler.summary(300) for _ in range(n // 10)])
+    sampler.stop()
+    report(f"Sistem durumu ({n:,} okuma, {sampler.capacity:,} örneklik tampon)", [
+        ("psutil (eşzamanlı)", f"{legacy / n * 1e6:9.1f} µs/okuma"),
+        ("örnekleyici latest()", f"{latest / n * 1e6:9.1f} µs/okuma"),
+        ("örnekleyici summary(5 dk)", f"{summary / (n // 10) * 1e6:9.1f} µs/okuma"),
+    ])
+
+# -------------------- HTTP SUNUCUSU --------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def server_process(port):
+    """run.py --serve'i boş bir çalışma dizininde ayrı süreçte başlat, hazır olunca ver"""
+    with tempfile.TemporaryDirectory() as tmp:
+        process = subprocess.Popen([sys.executable, os.path.abspath(run.__file__), "--serve", "--port", str(port)],
+                                   cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                    break
+                except OSError:
+                    if time.monotonic() > deadline or process.poll() is not None:
+                        raise RuntimeError("sunucu başlatılamadı")
+                    time.sleep(0.1)
+            yield process
+        finally:
+            process.terminate()
+            process.wait()
+
+async def http_client(port, messages, latencies):
+    """Tek keep-alive bağlantı üzerinden sırayla POST /chat gönder"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    session = None
+    try:
+        for message in messages:
+            body = json.dumps({'query': message, 'session': session}).encode('utf-8')
+            start = time.perf_counter()
+            writer.write(b"POST /chat HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = int(re.search(rb"Content-Length: (\d+)", headers).group(1))
+            payload = json.loads(await reader.readexactly(length))
+            latencies.append((time.perf_counter() - start) * 1000)
+            session = payload['session']
+    finally:
+        writer.close()
+
+@benchmark("http-load")
+def bench_http_load(n):
+    """Yerel sunucuya 1, 16 ve 128 eşzamanlı keep-alive istemciyle yük bindir (-n istemci başı toplam istek)"""
+    n = n or 5_000
+    messages = [m for m in synthetic_messages(2_000) if run.turkish_lower(m).find('ping') < 0]
+    port = free_port()
+    rows = []
+    with server_process(port):
+        for clients in (1, 16, 128):
+            per_client = max(1, n // clients)
+            latencies = []
+
+            async def load():
+                await asyncio.gather(*(http_client(port, messages[i::clients][:per_client] or messages[:per_client],
+                                                   latencies) for i in range(clients)))
+
+            _, seconds = timed(asyncio.run, load())
+            rows.append((f"{clients:>3} istemci",
+                         f"{len(latencies) / seconds:8.0f} istek/s | p50 {percentile(latencies, 50):7.2f} ms | "
+                         f"p99 {percentile(latencies, 99):7.2f} ms"))
+    report(f"HTTP /chat yük testi ({n:,} istek/seviye, keep-alive)", rows)
+
+# -------------------- YAPILANDIRMA DEPOSU --------------------
+def config_ai(path, threshold=1000, debounce=1.0):
+    """Yalnızca yapılandırma alanları kurulmuş, ConfigStore'lu örnek"""
+    ai = bare_ai()
+    ai.config_file = path
+    ai.user_name = "Kullanıcı"
+    ai.user_data = {}
+    ai.modules = {'weather': True, 'games': True}
+    ai.memory_settings, ai.sampler_settings, ai.weather_settings, ai.wiki_settings = {}, {}, {}, {}
+    ai.config_settings = {'debounce': debounce, 'max_delay': 10.0, 'snapshot_threshold': threshold}
+    ai.config_store = run.ConfigStore(path, ai.collect_config, **ai.config_settings)
+    return ai
+
+def legacy_load_config(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@benchmark("config")
+def bench_config(n):
+    """n anahtarlı user_data: eski indent=2 JSON ile atomik/anlık görüntülü depo, yükleme ve debounce"""
+    n = n or 100_000
+    rng = random.Random(25)
+    words = synthetic_words(500, rng)
+    user_data = {f"{rng.choice(words)}_{i}": ({'value': ' '.join(rng.choice(words) for _ in range(3)), 'count': i}
+                                              if i % 2 else rng.choice(words))
+                 for i in range(n)}
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy_config.json")
+        config = {'user_name': "Kullanıcı", 'modules': {}, 'user_data': user_data}
+
+        def legacy_save():
+            with open(legacy_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+        _, seconds = timed(legacy_save)
+        rows.append(("kaydetme, json.dump indent=2", f"{seconds * 1000:8.1f} ms | "
+                                                     f"{os.path.getsize(legacy_path) / 1024 / 1024:5.1f} MB"))
+
+        for label, threshold in (("depo, yalnız JSON", -1), ("depo, JSON + anlık görüntü", 1000)):
+            path = os.path.join(tmp, f"config_{threshold}.json")
+            ai = config_ai(path, threshold)
+            ai.user_data = dict(user_data)
+            _, seconds = timed(ai.save_config)
+            ai.config_store.close()
+            size = os.path.getsize(path)
+            rows.append((f"kaydetme, {label}", f"{seconds * 1000:8.1f} ms | {size / 1024 / 1024:5.1f} MB (atomik)"))
+
+        loads = []
+        for _ in range(5):
+            loads.append(timed(legacy_load_config, legacy_path)[1])
+        rows.append(("yükleme, json.load indent=2", f"{min(loads) * 1000:8.1f} ms"))
+        for label, threshold in (("yalnız JSON", -1), ("anlık görüntü", 1000)):
+            loads = []
+            for _ in range(5):
+                ai = config_ai(os.path.join(tmp, f"config_{threshold}.json"), threshold)
+                _, seconds = timed(ai.load_config)
+                ai.config_store.close()
+                assert len(ai.user_data) == n
+                loads.append(seconds)
+            rows.append((f"yükleme (load_config), {label}", f"{min(loads) * 1000:8.1f} ms"))
+
+        # Elle düzenlenen JSON anlık görüntüden önce gelir
+        path = os.path.join(tmp, "config_1000.json")
+        with open(path, 'rb') as f:
+            edited = json.loads(f.read())
+        edited['user_name'] = "Elle"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(edited, f, ensure_ascii=False)
+        ai = config_ai(path)
+        ai.load_config()
+        ai.config_store.close()
+        assert ai.user_name == "Elle"
+
+        # 10.000 hızlı değişiklik tek yazımda birleşir
+        ai = config_ai(os.path.join(tmp, "debounce.json"), debounce=0.2)
+        ai.load_config()
+        _, seconds = timed(lambda: [ai.user_data.__setitem__(f"k{i}", i) for i in range(10_000)])
+        time.sleep(0.5)
+        writes = ai.config_store.writes
+        ai.config_store.close()
+        rows.append(("10.000 değişiklik (debounce 0.2 s)", f"{seconds / 10_000 * 1e6:8.2f} µs/değişiklik | "
+                                                           f"{writes} yazım"))
+    report(f"Yapılandırma ({n:,} user_data anahtarı)", rows)
+
+# -------------------- ANA PROGRAM --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantumia performans ölçümleri")
+    parser.add_argument('name', choices=sorted(BENCHMARKS), help="Çalıştırılacak ölçüm")
+    parser.add_argument('-n', '--count', type=int, default=None, help="Ölçek (varsayılan ölçüme göre)")
+    args = parser.parse_args(argv)
+    BENCHMARKS[args.name](args.count)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,4649 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import random
 import os
-import time
 import datetime
 import json
-import requests
-import wikipedia
 import webbrowser
 import platform
-import psutil
-import pyjokes
 import math
 import calendar
 import socket
+import errno
 import threading
 import subprocess
 import sys
 import re
 import base64
 import hashlib
+import secrets
+import zlib
 import zipfile
 import tarfile
+import lzma
 import shutil
 import csv
+import unicodedata
 import xml.etree.ElementTree as ET
 import sqlite3
+import importlib
+import functools
+import itertools
+import shlex
+import mmap
+import heapq
+import queue
+import argparse
+import asyncio
+import ipaddress
+import copy
+import uuid
+import bisect
+import io
+import cProfile
+import pstats
+from array import array
 from urllib.parse import quote, urlparse
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import deque
-import pickle
+from collections import deque, namedtuple, OrderedDict
+from types import MappingProxyType
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+import marshal
+import struct
 import logging
+import logging.handlers
+import multiprocessing
+import gzip
+import atexit
 from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# -------------------- LOGGING KONFİGÜRASYONU --------------------
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class JsonLogFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON nesnesi olarak biçimlendir (JSONL)"""
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Boyut veya süre dolunca döndüren, eski dosyaları gzip ile sıkıştıran dosya işleyicisi
+
+    Yalnızca dinleyici iş parçacığında çalışır; döndürme ve sıkıştırma kullanıcıyı bekletmez.
+    """
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, interval=24 * 3600):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        # Her kayıt yazımdan sonra boşaltıldığı için alttaki tamponun konumu dosya boyutudur;
+        # üst sınıf boyutu ölçmek için kaydı bir kez daha biçimlendirirdi
+        size = self.stream.buffer.tell()
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return size > 0
+        return 0 < self.maxBytes <= size
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Çağıran iş parçacığında yalnızca mesajı birleştirip kuyruğa atan işleyici
+
+    Zaman damgası ve satır biçimi dinleyicide uygulanır; argümanlar burada metne çevrilir ki
+    sonradan değişen nesneler kaydı bozmasın.
+    """
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_log_listener = None
+
+def setup_logging(path='quantumia.log', level=logging.INFO, json_format=False, console=True,
+                  max_bytes=10 * 1024 * 1024, backup_count=5, interval=24 * 3600):
+    """Kayıtları kuyruğa atan, dosyaya ve konsola arka plan iş parçacığında yazan boru hattını kur
+
+    Çağıran iş parçacığı yalnızca kaydı hazırlayıp kuyruğa ekler. Yeniden çağrılırsa önceki
+    dinleyici boşaltılıp durdurulur.
+    """
+    global _log_listener
+    file_handler = CompressingRotatingFileHandler(path, max_bytes, backup_count, interval)
+    file_handler.setFormatter(JsonLogFormatter() if json_format else logging.Formatter(LOG_FORMAT))
+    handlers = [file_handler]
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(stream_handler)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LogQueueHandler(log_queue))
+    root.setLevel(level)
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+    else:
+        atexit.register(stop_logging)
+    _log_listener = listener
+    listener.start()
+    return listener
+
+def stop_logging():
+    """Kuyruktaki kayıtları yaz ve dinleyiciyi durdur (çıkışta otomatik çağrılır)"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+# Süreç havuzu çocukları (spawn) modülü yeniden içe aktarır; günlük dosyasını yalnız ana süreç yönetir
+if multiprocessing.parent_process() is None:
+    setup_logging()
+logger = logging.getLogger('QuantumiaAI')
+
+# -------------------- TEMBEL MODÜL YÜKLEME --------------------
+class LazyModule:
+    """Ağır bağımlılıkları ilk kullanımda yükleyen vekil modül"""
+    _lock = threading.Lock()
+    load_times = {}
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        """Modülü (bir kez) içe aktar"""
+        if self._module is None:
+            with LazyModule._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    LazyModule.load_times[self._name] = time.perf_counter() - start
+                    logger.debug(f"Tembel modül yüklendi: {self._name}")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "yüklendi" if self._module is not None else "bekliyor"
+        return f"<LazyModule {self._name} ({state})>"
+
+requests = LazyModule('requests')
+psutil = LazyModule('psutil')
+pyjokes = LazyModule('pyjokes')
+np = LazyModule('numpy')
+scipy_sparse = LazyModule('scipy.sparse')
+sklearn_text = LazyModule('sklearn.feature_extraction.text')
+zstd = LazyModule('zstandard')  # İsteğe bağlı: yoksa Vikipedi önbelleği zlib kullanır
+
+IMPORT_DURATION = time.perf_counter() - _IMPORT_START
+
+# -------------------- BAŞLANGIÇ PROFİLLEME --------------------
+class StartupProfiler:
+    """Başlangıç aşamalarının sürelerini ölç"""
+    def __init__(self):
+        self.phases = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name, background=False):
+        """Bir aşamayı monotonik saatle ölç"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, background)
+
+    def record(self, name, seconds, background=False):
+        """Ölçülmüş bir süreyi kaydet"""
+        with self._lock:
+            self.phases.append((name, seconds, background))
+
+    def report(self):
+        """Aşama dökümünü tablo olarak döndür"""
+        with self._lock:
+            phases = list(self.phases)
+        # Arka plan aşamaları etkileşime geçmeyi geciktirmez, toplama katılmaz
+        total = sum(seconds for _, seconds, background in phases if not background)
+        lines = ["⏱️ Başlangıç Profili:"]
+        for name, seconds, background in phases:
+            if background:
+                lines.append(f"   {name:<12} {seconds * 1000:9.2f} ms  (arka plan)")
+            else:
+                share = (seconds / total * 100) if total else 0.0
+                lines.append(f"   {name:<12} {seconds * 1000:9.2f} ms  ({share:5.1f}%)")
+        lines.append(f"   {'toplam':<12} {total * 1000:9.2f} ms  (etkileşime kadar)")
+        for name, seconds in sorted(LazyModule.load_times.items()):
+            lines.append(f"   ↳ tembel import {name}: {seconds * 1000:.2f} ms")
+        return "\n".join(lines)
+
+# -------------------- ÇALIŞMA ZAMANI ÖLÇÜMLERİ --------------------
+# Gecikme kovalarının üst sınırları (ms); sonuncusundan büyükler +Inf kovasına düşer
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı; yüzdelikler kova içinde doğrusal yaklaşıklanır"""
+    __slots__ = ('counts', 'count', 'total', 'max', 'errors')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = LATENCY_BUCKETS_MS[i - 1] if i else 0.0
+                high = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+class _NullTimer:
+    """Ölçüm kapalıyken dönen, hiçbir şey yapmayan zamanlayıcı"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ('metrics', 'key', 'start')
+
+    def __init__(self, metrics, key):
+        self.metrics = metrics
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.key, (time.perf_counter() - self.start) * 1000, exc_type is not None)
+        return False
+
+class Metrics:
+    """Niyet, işleyici ve SQLite sürelerini (tür, ad) anahtarlı histogramlarda topla
+
+    Kapalıyken timer() paylaşılan boş bir zamanlayıcı döndürür; ölçüm noktası başına maliyet
+    tek bir öznitelik kontrolüdür. cProfile örneklemesi ayrıca açılır ve her sample_every
+    çağrıdan birini profiller.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.sampling = False
+        self._profile = None
+        self._profile_lock = threading.Lock()
+        self._sample_every = 10
+        self._sample_counter = itertools.count()
+
+    def timer(self, kind, name):
+        """with metrics.timer('handler', 'weather'): ..."""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, (kind, name))
+
+    def observe(self, key, ms, error=False):
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.observe(ms)
+            if error:
+                histogram.errors += 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+        self.started = time.time()
+
+    def snapshot(self):
+        """{tür: {ad: özet}} biçiminde tutarlı bir kopya"""
+        with self._lock:
+            items = [(key, histogram.count, histogram.errors, histogram.total, histogram.max,
+                      list(histogram.counts), [histogram.percentile(p) for p in (50, 95, 99)])
+                     for key, histogram in self._histograms.items()]
+        result = {}
+        for (kind, name), count, errors, total, peak, counts, (p50, p95, p99) in sorted(items):
+            result.setdefault(kind, {})[name] = {
+                'count': count, 'errors': errors, 'total_ms': round(total, 3),
+                'mean_ms': round(total / count, 3) if count else 0.0,
+                'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3),
+                'max_ms': round(peak, 3), 'buckets': counts
+            }
+        return result
+
+    def to_json(self):
+        return json.dumps({'started': self.started, 'bucket_bounds_ms': LATENCY_BUCKETS_MS,
+                           'metrics': self.snapshot()}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus metin biçimi (histogram, saniye cinsinden)"""
+        lines = ["# HELP quantumia_duration_seconds Niyet, işleyici ve SQLite süreleri",
+                 "# TYPE quantumia_duration_seconds histogram"]
+        errors = []
+        for kind, names in self.snapshot().items():
+            for name, stats in names.items():
+                labels = f'kind="{kind}",name="{name.replace(chr(34), chr(39))}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS_MS + (float('inf'),), stats['buckets']):
+                    cumulative += n
+                    le = "+Inf" if bound == float('inf') else repr(bound / 1000)
+                    lines.append(f'quantumia_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"quantumia_duration_seconds_sum{{{labels}}} {stats['total_ms'] / 1000}")
+                lines.append(f"quantumia_duration_seconds_count{{{labels}}} {stats['count']}")
+                errors.append(f"quantumia_errors_total{{{labels}}} {stats['errors']}")
+        lines += ["# HELP quantumia_errors_total Hata ile biten ölçümler", "# TYPE quantumia_errors_total counter"]
+        return "\n".join(lines + errors) + "\n"
+
+    # cProfile örneklemesi
+    def start_profiling(self, sample_every=10):
+        self._sample_every = max(1, sample_every)
+        self._profile = cProfile.Profile()
+        self.sampling = True
+
+    def stop_profiling(self, top=15, dump_path=None):
+        """Örneklemeyi durdur; en pahalı fonksiyonları metin olarak döndür"""
+        with self._profile_lock:
+            profile, self._profile = self._profile, None
+            self.sampling = False
+        if profile is None:
+            return None
+        if dump_path:
+            profile.dump_stats(dump_path)
+        out = io.StringIO()
+        try:
+            pstats.Stats(profile, stream=out).strip_dirs().sort_stats('cumulative').print_stats(top)
+        except TypeError:  # hiç örnek alınmadı
+            return ""
+        return out.getvalue()
+
+    def sampled(self, func, *args):
+        """Örnekleme açıksa her sample_every çağrıdan birini cProfile altında çalıştır"""
+        profile = self._profile
+        if profile is None or next(self._sample_counter) % self._sample_every:
+            return func(*args)
+        # Aynı anda tek profil etkin olabilir; meşgulse bu çağrı örneklenmez
+        if not self._profile_lock.acquire(blocking=False):
+            return func(*args)
+        try:
+            return profile.runcall(func, *args)
+        finally:
+            self._profile_lock.release()
+
+metrics = Metrics()
+
+# -------------------- SİSTEM ÖRNEKLEYİCİ --------------------
+# Halka tamponlarda tutulan seriler: yüzdeler ve ağ hızları (bayt/s)
+SAMPLE_SERIES = ('cpu', 'memory', 'disk', 'sent_rate', 'recv_rate')
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+SystemSample = namedtuple('SystemSample', ['time', 'cpu', 'memory', 'disk', 'sent_rate', 'recv_rate',
+                                           'memory_used', 'memory_total', 'bytes_sent', 'bytes_recv'])
+
+def sparkline(values, width=40, low=None, high=None):
+    """Değerleri en fazla width karakterlik blok grafiğe çevir (fazlası kova ortalamasıyla küçültülür)"""
+    values = list(values)
+    if not values:
+        return ""
+    if len(values) > width:
+        step = len(values) / width
+        values = [sum(chunk) / len(chunk) for chunk in
+                  (values[int(i * step):max(int(i * step) + 1, int((i + 1) * step))] for i in range(width))]
+    low = min(values) if low is None else low
+    high = max(values) if high is None else high
+    span = (high - low) or 1.0
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[max(0, min(top, int(round((v - low) / span * top))))] for v in values)
+
+def format_rate(bytes_per_second):
+    """Bayt/s değerini okunur birimle yaz"""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if bytes_per_second < 1024:
+            return f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+    return f"{bytes_per_second:.1f} GB/s"
+
+class SystemSampler:
+    """CPU, RAM, disk ve ağ ölçümlerini arka planda sabit aralıkla toplayan örnekleyici
+
+    Her seri, kapasitesi history/interval olan bir array('d') halka tamponudur; bellek
+    kullanımı çalışma süresinden bağımsızdır. İşleyiciler psutil'i çağırmadan latest()
+    ve window() ile son örneği ve pencereyi okur. cpu_percent başlangıçta bir kez
+    hazırlanır, böylece her örnek iki ölçüm arasındaki gerçek kullanımı verir.
+    """
+    def __init__(self, interval=1.0, history=600, disk_path='/'):
+        self.interval = max(0.05, float(interval))
+        self.capacity = max(2, int(math.ceil(history / self.interval)))
+        self.disk_path = disk_path
+        self.boot_time = None
+        self._times = array('d', bytes(8 * self.capacity))
+        self._series = {name: array('d', bytes(8 * self.capacity)) for name in SAMPLE_SERIES}
+        self._next = 0
+        self._count = 0
+        self._latest = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.boot_time = psutil.boot_time()
+            psutil.cpu_percent(interval=None)
+            network = psutil.net_io_counters()
+        except Exception as e:
+            logger.error(f"Sistem örnekleyici başlatılamadı: {e}")
+            self._ready.set()
+            return
+        last = (time.monotonic(), network.bytes_sent, network.bytes_recv)
+        # İlk örnek kısa bir hazırlıktan sonra, sonrakiler sabit aralıkla
+        delay = min(self.interval, 0.1)
+        while not self._stop.wait(delay):
+            try:
+                last = self._sample(last)
+            except Exception as e:
+                logger.error(f"Sistem örnekleme hatası: {e}")
+            self._ready.set()
+            delay = self.interval - (time.monotonic() - last[0]) % self.interval
+
+    def _sample(self, last):
+        now = time.monotonic()
+        cpu = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        network = psutil.net_io_counters()
+        elapsed = (now - last[0]) or self.interval
+        # Sayaçlar arayüz sıfırlanınca geri gidebilir; negatif hız yazılmaz
+        sent_rate = max(0, network.bytes_sent - last[1]) / elapsed
+        recv_rate = max(0, network.bytes_recv - last[2]) / elapsed
+        sample = SystemSample(time.time(), cpu, memory.percent, disk.percent, sent_rate, recv_rate,
+                              memory.used, memory.total, network.bytes_sent, network.bytes_recv)
+        with self._lock:
+            i = self._next
+            self._times[i] = sample.time
+            for name in SAMPLE_SERIES:
+                self._series[name][i] = getattr(sample, name)
+            self._next = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self._latest = sample
+        return now, network.bytes_sent, network.bytes_recv
+
+    def wait(self, timeout=None):
+        """İlk örneği bekle; son örneği (veya None) döndür"""
+        self._ready.wait(timeout)
+        return self._latest
+
+    def latest(self):
+        return self._latest
+
+    def window(self, seconds=None):
+        """Son seconds saniyenin örnekleri: (zamanlar, {seri: değerler}) eskiden yeniye"""
+        with self._lock:
+            count = self._count
+            if seconds is not None:
+                count = min(count, max(1, int(seconds / self.interval)))
+            start = (self._next - count) % self.capacity
+            def ordered(buffer):
+                if start + count <= self.capacity:
+                    return buffer[start:start + count]
+                return buffer[start:] + buffer[:start + count - self.capacity]
+            return ordered(self._times), {name: ordered(buffer) for name, buffer in self._series.items()}
+
+    def summary(self, seconds=None):
+        """Her seri için (son, ortalama, en düşük, en yüksek) ve pencerenin süresi"""
+        times, series = self.window(seconds)
+        if not times:
+            return {}, 0.0
+        stats = {name: (values[-1], sum(values) / len(values), min(values), max(values))
+                 for name, values in series.items()}
+        return stats, times[-1] - times[0]
+
+# -------------------- NİYET YÖNLENDİRİCİ --------------------
+IntentMatch = namedtuple('IntentMatch', ['intent', 'priority', 'stage', 'spans'])
+
+# Aşamalar eski zincirin sırasını korur: ML kalıpları → gelişmiş komutlar → doğal konuşma
+STAGE_ML = 0
+STAGE_COMMAND = 1
+STAGE_NATURAL = 2
+
+def turkish_lower(text):
+    """Büyük İ harfini birleşik noktaya bölmeden küçük harfe çevir"""
+    return text.replace('İ', 'i').lower()
+
+# İşleyici türleri: sync olay döngüsünde hemen, io/cpu ilgili iş havuzunda arka planda çalışır
+JOB_SYNC = "sync"
+JOB_IO = "io"
+JOB_CPU = "cpu"
+
+def intent(name, triggers, priority, kind=JOB_SYNC, raw=False):
+    """Metodu niyet yönlendiricisine kendi tetikleyicileri ve iş türüyle kaydet
+
+    raw=True olan işleyiciler girdiyi küçük harfe çevrilmeden alır (ör. dosya yolları).
+    """
+    def decorator(func):
+        func.intent_spec = (name, tuple(triggers), priority, kind)
+        func.intent_raw = raw
+        return func
+    return decorator
+
+def trie_pattern(words, short=3):
+    """Kelimeleri ortak önekleri paylaşan tek bir regex'e çevir
+
+    Her düğümde alternatif sayısı alfabe ile sınırlıdır; kalıp sayısı artınca konum başına
+    maliyet doğrusal büyümez. Uzun eşleşme önce denenir ("hava durumu" > "hava"); short
+    karakter ve altındaki kelimelerin sağında kelime sınırı aranır ("ip" → "tip" değil).
+    """
+    root = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = len(word) <= short
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            branches.append(r'(?!\w)' if node[''] else '')
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(root) if root else '(?!)'
+
+RouterIndex = namedtuple('RouterIndex', ['pattern', 'triggers', 'intents'])
+
+class IntentRouter:
+    """Tüm tetikleyicileri tek bir derlenmiş trie regex'inde birleştiren niyet yönlendirici
+
+    compile() değişmez bir dizin üretir; swap() ile başka bir yönlendiricinin dizini tek
+    atamayla devralınır, böylece çalışırken yeniden yükleme okuyucuları kilitlemez.
+    """
+    def __init__(self):
+        self._intents = {}
+        self._index = None
+
+    def register(self, name, triggers, priority, stage=STAGE_COMMAND, handler=None, kind=JOB_SYNC,
+                 responses=()):
+        """Bir niyeti tetikleyicileri (ve varsa sabit yanıtlarıyla) kaydet"""
+        self._intents[name] = {
+            'triggers': tuple(turkish_lower(t) for t in triggers),
+            'priority': stage * 1000 + priority,
+            'stage': stage,
+            'handler': handler,
+            'kind': kind,
+            'responses': tuple(responses)
+        }
+        self._index = None
+
+    def register_handlers(self, owner):
+        """@intent ile işaretlenmiş metotları kaydet"""
+        for attr in dir(type(owner)):
+            spec = getattr(getattr(type(owner), attr), 'intent_spec', None)
+            if spec:
+                name, triggers, priority, kind = spec
+                self.register(name, triggers, priority, STAGE_COMMAND, getattr(owner, attr), kind)
+
+    @property
+    def index(self):
+        index = self._index
+        if index is None:
+            index = self.compile()._index
+        return index
+
+    def handler(self, name):
+        """Niyetin işleyicisini döndür"""
+        return self.index.intents[name]['handler']
+
+    def kind(self, name):
+        """Niyetin iş türünü döndür (sync/io/cpu)"""
+        return self.index.intents[name]['kind']
+
+    def responses(self, name):
+        """Niyetin sabit yanıtlarını döndür"""
+        return self.index.intents[name]['responses']
+
+    def compile(self):
+        """Tüm tetikleyicileri tek bir regex'e derle; tetikleyici → niyetler eşlemesini kur"""
+        triggers = {}
+        for name, spec in sorted(self._intents.items(), key=lambda item: item[1]['priority']):
+            for trigger in spec['triggers']:
+                triggers.setdefault(trigger, []).append(name)
+        pattern = re.compile(r'(?<!\w)' + trie_pattern(triggers))
+        self._index = RouterIndex(pattern, {t: tuple(names) for t, names in triggers.items()},
+                                  MappingProxyType(dict(self._intents)))
+        return self
+
+    def swap(self, other):
+        """Başka bir yönlendiricinin niyetlerini ve dizinini atomik olarak devral"""
+        index = other.index
+        self._intents = dict(index.intents)
+        self._index = index
+        return self
+
+    def matches(self, text):
+        """Metindeki tüm niyetleri tek geçişte bul: {niyet: [(başlangıç, bitiş), ...]}"""
+        index = self.index
+        found = {}
+        for match in index.pattern.finditer(turkish_lower(text)):
+            for name in index.triggers[match.group()]:
+                found.setdefault(name, []).append(match.span())
+        return found
+
+    def route(self, text, stage=None):
+        """En yüksek öncelikli niyeti döndür (yoksa None)"""
+        index = self.index
+        best = None
+        for match in index.pattern.finditer(turkish_lower(text)):
+            for name in index.triggers[match.group()]:
+                spec = index.intents[name]
+                if stage is not None and spec['stage'] != stage:
+                    continue
+                if best is None or spec['priority'] < best.priority:
+                    best = IntentMatch(name, spec['priority'], spec['stage'], [])
+                if best.intent == name:
+                    best.spans.append(match.span())
+        return best
+
+# Yanıt tablolarının asıl kaynağı depoyla gelen data/responses.json'dur (BUNDLED_RESPONSES).
+# Aşağıdaki tablolar yalnızca o dosya da okunamazsa kullanılan yedektir; dosya değişince
+# bunlar güncellenmek zorunda değildir ({user_name}, {name}, {creator} yanıt anında doldurulur).
+BUNDLED_RESPONSES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'responses.json')
+
+ML_RESPONSES = {
+    'greeting': (("merhaba", "selam", "hey", "hi", "hello"),
+                 ["Merhaba! Nasılsınız?", "Selam! Size nasıl yardımcı olabilirim?"]),
+    'thanks': (("teşekkür", "sağol", "thanks", "thank you"),
+               ["Rica ederim!", "Ne demek! Her zaman yardıma hazırım."]),
+    'how_are_you': (("nasılsın", "ne haber", "how are you"),
+                    ["Çok iyiyim, teşekkür ederim! Sen nasılsın?", "Harikayım! Sorma!"]),
+    'goodbye': (("görüşürüz", "hoşça kal", "goodbye", "bye"),
+                ["Görüşürüz! İyi günler.", "Hoşça kal! Sonra görüşelim."])
+}
+
+NATURAL_RESPONSES = {
+    "merhaba": ["Merhaba {user_name}! Nasılsın? 😊", "Selam! Bugün nasılsın?", "Hoş geldin!"],
+    "selam": ["Selam! Nasılsın?", "Merhaba! Bugün nasılsın?", "Selamlar!"],
+    "teşekkür": ["Rica ederim!", "Ne demek! Her zaman yardıma hazırım.", "Benim için zevk!"],
+    "sağol": ["Rica ederim!", "Önemli değil!", "Her zaman!"],
+    "nasılsın": ["Çok iyiyim, teşekkür ederim! Sen nasılsın?", "Harikayım! Sorma!", "Süperim!"],
+    "iyiyim": ["Harika duydum! 😊", "Güzel!", "Sevindim!"],
+    "görüşürüz": ["Görüşürüz! İyi günler. 👋", "Hoşça kal! Sonra görüşelim.", "Güle güle!"],
+    "hoşça kal": ["Hoşça kalın!", "Görüşmek üzere!", "Kendinize iyi bakın!"],
+    "sen kimsin": ["Ben {name}, {creator} tarafından geliştirilen gelişmiş bir yapay zekayım. 🤖",
+                   "Ben {name}! Size yardımcı olmak için buradayım."],
+    "adın ne": ["Benim adım {name}. 👾", "Bana {name} diyebilirsin. 😊"],
+    "aşk": ["❤️ Sevgi evrenin en güçlü enerjisidir.", "🤖 İnsan-AI dostluğu benim için önemli!"],
+    "yemek": ["🍕 Pizza sever misin?", "🍔 Burger mi yoksa döner mi?", "🥗 Sağlıklı yemekler en iyisi!"],
+    "müzik": ["🎵 Hangi tür müzikleri seversin?", "🎸 Rock müzik dinlemeyi severim!", "🎶 Müzik ruhun gıdasıdır."]
+}
+
+RESPONSE_FIELDS = {'user_name': '', 'name': '', 'creator': ''}
+
+def builtin_response_tables():
+    """Yedek tabloları data/responses.json biçiminde döndür"""
+    return {
+        'version': 1,
+        'ml': {name: {'triggers': list(triggers), 'responses': list(responses)}
+               for name, (triggers, responses) in ML_RESPONSES.items()},
+        'natural': {keyword: {'triggers': [keyword], 'responses': list(responses)}
+                    for keyword, responses in NATURAL_RESPONSES.items()}
+    }
+
+def parse_response_tables(data):
+    """JSON tablolarını doğrula; (ml, natural) = ({ad: (tetikleyiciler, yanıtlar)}, ...) döndür"""
+    tables = []
+    for section in ('ml', 'natural'):
+        entries = data.get(section, {})
+        if not isinstance(entries, dict):
+            raise ValueError(f"'{section}' bir nesne olmalı")
+        parsed = {}
+        for name, entry in entries.items():
+            triggers = entry.get('triggers', [name]) if isinstance(entry, dict) else None
+            responses = entry.get('responses') if isinstance(entry, dict) else None
+            if (not isinstance(triggers, list) or not triggers or not isinstance(responses, list) or not responses
+                    or not all(isinstance(item, str) and item for item in triggers + responses)):
+                raise ValueError(f"{section}.{name}: 'triggers' ve 'responses' boş olmayan metin listeleri olmalı")
+            for response in responses:
+                try:
+                    response.format(**RESPONSE_FIELDS)
+                except (KeyError, IndexError, ValueError) as e:
+                    raise ValueError(f"{section}.{name}: geçersiz yer tutucu ({e}): {response!r}") from None
+            parsed[name] = (tuple(triggers), tuple(responses))
+        tables.append(MappingProxyType(parsed))
+    return tuple(tables)
+
+class FileWatch:
+    """Dosyanın değişip değişmediğini en fazla interval saniyede bir stat ile denetle"""
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self.mtime = self._stat()
+        self._checked = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def changed(self):
+        """Son denetimden beri değiştiyse True (aynı değişikliği tek çağırana bildirir)"""
+        if time.monotonic() - self._checked < self.interval or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked = time.monotonic()
+            mtime = self._stat()
+            if mtime == self.mtime:
+                return False
+            self.mtime = mtime
+            return True
+        finally:
+            self._lock.release()
+
+# -------------------- YANIT ÖNBELLEĞİ --------------------
+class ResponseCache:
+    """TTL destekli, kayıt sayısı ve bellek bütçesiyle sınırlı LRU önbellek"""
+    def __init__(self, max_entries=1024, max_bytes=4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Geçerli kaydı döndür; yoksa (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at, size = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value, ttl=None):
+        """Kaydı ekle; sınırlar aşılırsa en eski kullanılanları çıkar"""
+        size = sys.getsizeof(value) + sys.getsizeof(key)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Sayaçları sözlük olarak döndür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+def normalize_arg(value):
+    """Önbellek anahtarı için argümanı normalize et"""
+    if isinstance(value, str):
+        return ' '.join(turkish_lower(value).split())
+    return value
+
+def cached(ttl=None):
+    """Metot sonucunu self.response_cache içinde sakla (ttl=None: saf memoizasyon)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            cache = getattr(self, 'response_cache', None)
+            if cache is None:
+                return func(self, *args)
+            key = (func.__name__,) + tuple(normalize_arg(arg) for arg in args)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = func(self, *args)
+            # Hata mesajları önbelleğe alınmaz, bir sonraki çağrı yeniden dener
+            if value is not None and not str(value).startswith("❌"):
+                cache.put(key, value, ttl)
+            return value
+        return wrapper
+    return decorator
+
+# -------------------- SQLITE YAZMA KUYRUĞU --------------------
+JOURNAL_MODES = ('delete', 'truncate', 'persist', 'memory', 'wal', 'off')
+SYNCHRONOUS_LEVELS = ('off', 'normal', 'full', 'extra')
+
+def apply_pragmas(conn, settings):
+    """Günlük modu ve senkronizasyon seviyesini bağlantıya uygula"""
+    journal_mode = str(settings.get('journal_mode', 'delete')).lower()
+    synchronous = str(settings.get('synchronous', 'full')).lower()
+    if journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"Geçersiz journal_mode: {journal_mode}")
+    if synchronous not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Geçersiz synchronous: {synchronous}")
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+
+class WriteBehindQueue:
+    """Kayıtları bellekte biriktirip arka planda toplu işlemlerle yazan kuyruk"""
+    def __init__(self, db_path, batch_size=500, flush_interval=1.0, settings=None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.settings = settings or {}
+        self._buffer = []
+        self._enqueued = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._writer, name="quantumia-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, sql, params):
+        """Bir kaydı yazma kuyruğuna ekle"""
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Yazma kuyruğu kapatıldı")
+            self._buffer.append((sql, params))
+            self._enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def pending(self):
+        """Henüz diske yazılmamış kayıt sayısı"""
+        with self._cond:
+            return self._enqueued - self._written
+
+    def flush(self, timeout=None):
+        """Şu ana kadar kuyruğa giren her şey yazılana kadar bekle"""
+        with self._cond:
+            target = self._enqueued
+            if self._written >= target:
+                return True
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target or not self._thread.is_alive(),
+                                       timeout)
+
+    def close(self):
+        """Kalan kayıtları yaz ve yazıcı iş parçacığını durdur"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _writer(self):
+        """Eşik dolunca veya süre geçince tamponu tek işlemde yaz"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            apply_pragmas(conn, self.settings)
+        except Exception as e:
+            logger.error(f"Pragma uygulama hatası: {e}")
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._closing or self._flush_requested
+                        or len(self._buffer) >= self.batch_size,
+                        self.flush_interval)
+                    batch, self._buffer = self._buffer, []
+                    self._flush_requested = False
+                    closing = self._closing
+                if batch:
+                    self._write_batch(conn, batch)
+                    with self._cond:
+                        self._written += len(batch)
+                        self._cond.notify_all()
+                if closing and not batch:
+                    break
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        """Ardışık aynı sorguları executemany ile tek işlemde yaz"""
+        try:
+            with metrics.timer('sqlite', 'write_batch'), conn:
+                for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                    conn.executemany(sql, [params for _, params in group])
+        except Exception as e:
+            logger.error(f"Toplu yazma hatası ({len(batch)} kayıt kaybedildi): {e}")
+
+class ConnectionPool:
+    """İş parçacıkları arasında paylaşılan salt okunur SQLite bağlantı havuzu
+
+    Bağlantı aynı anda tek iş parçacığına ödünç verilir; havuz boşsa ödünç alan bekler.
+    """
+    def __init__(self, db_path, size=8, settings=None):
+        self.db_path = db_path
+        self.size = size
+        self.settings = settings or {}
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            apply_pragmas(conn, self.settings)
+        except Exception as e:
+            logger.error(f"Pragma uygulama hatası: {e}")
+        conn.execute("PRAGMA query_only=1")
+        return conn
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Havuzdan bir bağlantı ödünç al, blok bitince geri ver"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._created < self.size
+                if grow:
+                    self._created += 1
+            if grow:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        """Boştaki bağlantıları kapat (ödünçtekiler iade edilince kapanır)"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+# -------------------- BİLGİ DİZİNİ --------------------
+KNOWLEDGE_FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE knowledge_fts USING fts5(
+        topic, information,
+        content='knowledge', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
+        INSERT INTO knowledge_fts(rowid, topic, information)
+        VALUES (new.id, new.topic, new.information);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, topic, information)
+        VALUES ('delete', old.id, old.topic, old.information);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE ON knowledge BEGIN
+        INSERT INTO knowledge_fts(knowledge_fts, rowid, topic, information)
+        VALUES ('delete', old.id, old.topic, old.information);
+        INSERT INTO knowledge_fts(rowid, topic, information)
+        VALUES (new.id, new.topic, new.information);
+    END
+    '''
+]
+
+def ensure_knowledge_index(conn):
+    """FTS5 bilgi dizinini ve created_at indeksini kur; FTS5 kullanılabilirse True döndür"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_knowledge_created_at ON knowledge(created_at)")
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'knowledge_fts'"
+    ).fetchone()
+    if exists:
+        return True
+    try:
+        # Tek seferlik geçiş: mevcut kayıtlar dizine aktarılır
+        with conn:
+            for statement in KNOWLEDGE_FTS_SCHEMA:
+                conn.execute(statement)
+            conn.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+        logger.info("Bilgi tablosu FTS5 dizinine taşındı")
+        return True
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 kullanılamıyor, LIKE aramasına dönülüyor: {e}")
+        return False
+
+def fts_query(text):
+    """Serbest metni FTS5 önek sorgusuna çevir ("hava durumu" → "hava"* "durumu"*)"""
+    tokens = re.findall(r'\w+', turkish_lower(text))
+    return ' '.join('"' + token + '"*' for token in tokens)
+
+# -------------------- BİLGİ AKTARIMI --------------------
+# Kaynak kayıtlarda konu/bilgi/kaynak olarak tanınan alan adları (küçük harf)
+KNOWLEDGE_TOPIC_FIELDS = ('topic', 'konu', 'title', 'başlık', 'question', 'soru')
+KNOWLEDGE_INFO_FIELDS = ('information', 'bilgi', 'answer', 'cevap', 'yanıt', 'content', 'içerik', 'text')
+KNOWLEDGE_SOURCE_FIELDS = ('source', 'kaynak')
+KNOWLEDGE_IMPORT_FORMATS = ('csv', 'jsonl', 'xml')
+
+KNOWLEDGE_IMPORTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS knowledge_imports (
+        source TEXT PRIMARY KEY,
+        format TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        inserted INTEGER NOT NULL DEFAULT 0,
+        duplicates INTEGER NOT NULL DEFAULT 0,
+        invalid INTEGER NOT NULL DEFAULT 0,
+        first_id INTEGER,
+        state TEXT NOT NULL,
+        started_at TEXT,
+        updated_at TEXT
+    )
+'''
+
+ImportStatus = namedtuple('ImportStatus', ['source', 'state', 'records', 'inserted', 'duplicates', 'invalid',
+                                           'seconds', 'resumed_from'])
+
+def normalize_text(text):
+    """NFC biçimine getir ve boşlukları tekille"""
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
+    return ' '.join(text.split())
+
+def knowledge_hash(topic, information):
+    """Normalize edilmiş konu + bilginin büyük/küçük harf duyarsız 16 baytlık özeti"""
+    key = turkish_lower(f"{topic}\x1f{information}").encode('utf-8')
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+def ensure_knowledge_hashes(conn):
+    """knowledge tablosuna content_hash sütununu ve tekil indeksini ekle, eski kayıtları doldur
+
+    Tekrarlanan eski kayıtlarda özet boş kalır (tekil indeks NULL'ları ayırt etmez).
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(knowledge)")]
+    with conn:
+        if 'content_hash' not in columns:
+            conn.execute("ALTER TABLE knowledge ADD COLUMN content_hash BLOB")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_hash ON knowledge(content_hash)")
+        conn.execute(KNOWLEDGE_IMPORTS_SCHEMA)
+        rows = conn.execute("SELECT id, topic, information FROM knowledge WHERE content_hash IS NULL").fetchall()
+        conn.executemany("UPDATE OR IGNORE knowledge SET content_hash = ? WHERE id = ?",
+                         [(knowledge_hash(normalize_text(topic or ''), normalize_text(information or '')), rowid)
+                          for rowid, topic, information in rows])
+
+def finish_knowledge_imports(conn, fts=True):
+    """Ertelenmiş dizinleri kur: aktarılan kayıtları FTS5'e ekle, tetikleyici ve indeksleri geri getir
+
+    Aktarım sırasında bırakılan ilk id'den sonraki tüm satırlar (o arada başka yoldan
+    eklenenler de) tek geçişte dizinlenir. Yarıda kesilmiş bir aktarımdan sonra açılışta da
+    çağrılır.
+    """
+    first_id = conn.execute("SELECT MIN(first_id) FROM knowledge_imports").fetchone()[0]
+    with conn:
+        if first_id is not None and fts:
+            conn.execute('''
+                INSERT INTO knowledge_fts(rowid, topic, information)
+                SELECT id, topic, information FROM knowledge WHERE id >= ?
+            ''', (first_id,))
+        if fts:
+            conn.execute(KNOWLEDGE_FTS_SCHEMA[1])
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_knowledge_created_at ON knowledge(created_at)")
+        conn.execute("UPDATE knowledge_imports SET first_id = NULL, "
+                     "state = CASE state WHEN 'running' THEN 'paused' ELSE state END")
+
+def knowledge_format(path):
+    """Uzantıdan biçim (.gz yok sayılır): csv, jsonl veya xml"""
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = os.path.splitext(name)[1].lower().lstrip('.')
+    return {'json': 'jsonl', 'ndjson': 'jsonl', 'tsv': 'csv'}.get(ext, ext)
+
+def _pick_field(names, candidates):
+    for candidate in candidates:
+        if candidate in names:
+            return names.index(candidate)
+    return None
+
+def _record_fields(keys):
+    """Kayıt anahtarlarından (konu, bilgi, kaynak) anahtarlarını seç (büyük/küçük harf duyarsız)"""
+    names = [turkish_lower(key) for key in keys]
+    return tuple(None if index is None else keys[index]
+                 for index in (_pick_field(names, fields) for fields in
+                               (KNOWLEDGE_TOPIC_FIELDS, KNOWLEDGE_INFO_FIELDS, KNOWLEDGE_SOURCE_FIELDS)))
+
+def iter_knowledge_records(path, fmt=None, skip=0):
+    """Dosyadaki kayıtları (konu, bilgi, kaynak) olarak akış halinde üret
+
+    Geçersiz kayıtlar da ('', '', None) olarak üretilir; böylece kayıt sırası devam
+    konumu olarak kullanılabilir. skip kadar kayıt atlanır (JSONL'de ayrıştırılmadan).
+    XML iterparse ile okunur ve işlenen kayıt öğeleri ağaçtan çıkarılır; bellek dosya
+    boyutundan bağımsızdır.
+    """
+    fmt = fmt or knowledge_format(path)
+    opener = gzip.open if path.endswith('.gz') else open
+    if fmt == 'jsonl':
+        layouts = {}  # Anahtar dizisi → alan seçimi; kayıtlar genelde aynı biçimde olduğundan bir kez çözülür
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in itertools.islice(f, skip, None):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    yield '', '', None
+                    continue
+                keys = tuple(record)
+                layout = layouts.get(keys)
+                if layout is None:
+                    layout = layouts[keys] = _record_fields(keys)
+                topic_key, info_key, source_key = layout
+                if topic_key is None or info_key is None:
+                    yield '', '', None
+                    continue
+                yield (str(record[topic_key] or ''), str(record[info_key] or ''),
+                       record[source_key] if source_key else None)
+    elif fmt == 'csv':
+        with opener(path, 'rt', encoding='utf-8-sig', newline='') as f:
+            sample = f.read(65536)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.reader(f, dialect)
+            header = next(reader, None)
+            if header is None:
+                return
+            names = [turkish_lower(name.strip()) for name in header]
+            topic_col = _pick_field(names, KNOWLEDGE_TOPIC_FIELDS)
+            info_col = _pick_field(names, KNOWLEDGE_INFO_FIELDS)
+            source_col = _pick_field(names, KNOWLEDGE_SOURCE_FIELDS)
+            if topic_col is None or info_col is None:
+                # Başlıksız dosya: ilk iki sütun konu ve bilgi
+                topic_col, info_col, reader = 0, 1, itertools.chain([header], reader)
+            width = max(topic_col, info_col)
+            for row in itertools.islice(reader, skip, None):
+                if len(row) <= width:
+                    yield '', '', None
+                    continue
+                source = row[source_col] if source_col is not None and source_col < len(row) else None
+                yield row[topic_col], row[info_col], source or None
+    elif fmt == 'xml':
+        with opener(path, 'rb') as f:
+            parents = []
+            seen = 0
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    parents.append(elem)
+                    continue
+                parents.pop()
+                fields = {turkish_lower(child.tag): child.text or '' for child in elem}
+                fields.update((turkish_lower(key), value) for key, value in elem.attrib.items())
+                topic_key = next((key for key in KNOWLEDGE_TOPIC_FIELDS if key in fields), None)
+                info_key = next((key for key in KNOWLEDGE_INFO_FIELDS if key in fields), None)
+                if topic_key is None or info_key is None:
+                    continue
+                seen += 1
+                if seen > skip:
+                    source = next((fields[key] for key in KNOWLEDGE_SOURCE_FIELDS if key in fields), None)
+                    yield fields[topic_key], fields[info_key], source
+                if parents:
+                    parents[-1].remove(elem)
+    else:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt} ({', '.join(KNOWLEDGE_IMPORT_FORMATS)})")
+
+class KnowledgeImporter:
+    """CSV/JSONL/XML dosyalarını knowledge tablosuna akış halinde toplu aktaran yükleyici
+
+    Kayıtlar normalize edilip içerik özetiyle tekilleştirilir (INSERT OR IGNORE, tekil
+    indeks). Yükleme süresince FTS5 ekleme tetikleyicisi ve created_at indeksi kaldırılır,
+    sonda tek geçişte kurulur. Her toplu işlemle birlikte dosyadaki konum da
+    knowledge_imports tablosuna yazılır; kesilen aktarım aynı dosyayla kaldığı yerden sürer.
+    """
+    def __init__(self, db_path, settings=None, fts=True, batch_size=50_000):
+        self.db_path = db_path
+        self.settings = settings or {}
+        self.fts = fts
+        self.batch_size = batch_size
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        apply_pragmas(conn, self.settings)
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=memory")
+        return conn
+
+    def pending(self):
+        """Yarıda kalmış aktarımlar: (kaynak, işlenen kayıt, eklenen) listesi"""
+        conn = self._connect()
+        try:
+            return conn.execute('''
+                SELECT source, position, inserted FROM knowledge_imports WHERE state != 'done' ORDER BY updated_at
+            ''').fetchall()
+        finally:
+            conn.close()
+
+    def run(self, path, fmt=None, progress=None, restart=False):
+        """Dosyayı aktar ve ImportStatus döndür; progress(ImportStatus) her toplu işlemde çağrılır"""
+        fmt = fmt or knowledge_format(path)
+        if fmt not in KNOWLEDGE_IMPORT_FORMATS:
+            raise ValueError(f"Desteklenmeyen biçim: {fmt} ({', '.join(KNOWLEDGE_IMPORT_FORMATS)})")
+        source = os.path.abspath(path)
+        stat = os.stat(source)
+        label = f"import:{os.path.basename(path)}"
+        conn = self._connect()
+        start = time.perf_counter()
+        try:
+            row = conn.execute("SELECT size, mtime_ns, position, state FROM knowledge_imports WHERE source = ?",
+                               (source,)).fetchone()
+            same_file = row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns)
+            if same_file and row[3] == 'done' and not restart:
+                return self._status(conn, source, 0, 0)
+            skip = row[2] if same_file and not restart else 0
+            now = datetime.datetime.now().isoformat()
+            next_id = conn.execute("SELECT IFNULL(MAX(id), 0) + 1 FROM knowledge").fetchone()[0]
+            with conn:
+                if skip == 0:
+                    conn.execute("DELETE FROM knowledge_imports WHERE source = ?", (source,))
+                    conn.execute('''
+                        INSERT INTO knowledge_imports (source, format, size, mtime_ns, state, started_at)
+                        VALUES (?, ?, ?, ?, 'running', ?)
+                    ''', (source, fmt, stat.st_size, stat.st_mtime_ns, now))
+                conn.execute('''
+                    UPDATE knowledge_imports SET state = 'running', first_id = ?, updated_at = ? WHERE source = ?
+                ''', (next_id, now, source))
+                conn.execute("DROP TRIGGER IF EXISTS knowledge_ai")
+                conn.execute("DROP INDEX IF EXISTS idx_knowledge_created_at")
+            if skip:
+                logger.info(f"Bilgi aktarımı {skip:,}. kayıttan sürdürülüyor: {source}")
+            state = 'paused'
+            try:
+                records = iter_knowledge_records(path, fmt, skip)
+                while True:
+                    items = list(itertools.islice(records, self.batch_size))
+                    if not items:
+                        state = 'done'
+                        break
+                    self._load(conn, source, label, items)
+                    if progress:
+                        progress(self._status(conn, source, time.perf_counter() - start, skip))
+                    if job_cancelled():
+                        break
+            finally:
+                finish_knowledge_imports(conn, self.fts)
+                with conn:
+                    conn.execute("UPDATE knowledge_imports SET state = ?, updated_at = ? WHERE source = ?",
+                                 (state, datetime.datetime.now().isoformat(), source))
+            return self._status(conn, source, time.perf_counter() - start, skip)
+        finally:
+            conn.close()
+
+    def _load(self, conn, source, label, items):
+        """Tek toplu işlem: tekilleştirerek ekle ve devam konumunu aynı işlemde yaz"""
+        now = datetime.datetime.now().isoformat()
+        rows = []
+        for topic, information, origin in items:
+            topic, information = normalize_text(topic), normalize_text(information)
+            if topic and information:
+                rows.append((topic, information, origin or label, now, knowledge_hash(topic, information)))
+        with conn:
+            before = conn.total_changes
+            conn.executemany('''
+                INSERT OR IGNORE INTO knowledge (topic, information, source, created_at, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows)
+            inserted = conn.total_changes - before
+            conn.execute('''
+                UPDATE knowledge_imports SET position = position + ?, inserted = inserted + ?,
+                    duplicates = duplicates + ?, invalid = invalid + ?, updated_at = ?
+                WHERE source = ?
+            ''', (len(items), inserted, len(rows) - inserted, len(items) - len(rows), now, source))
+
+    def _status(self, conn, source, seconds, resumed_from):
+        position, inserted, duplicates, invalid, state = conn.execute('''
+            SELECT position, inserted, duplicates, invalid, state FROM knowledge_imports WHERE source = ?
+        ''', (source,)).fetchone()
+        return ImportStatus(source, state, position, inserted, duplicates, invalid, seconds, resumed_from)
+
+# -------------------- KONUŞMA GEÇMİŞİ --------------------
+CONVERSATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_conversations_category ON conversations(category)"
+]
+
+CONVERSATION_FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+        user_input, response,
+        content='conversations', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS conversations_ai AFTER INSERT ON conversations BEGIN
+        INSERT INTO conversations_fts(rowid, user_input, response)
+        VALUES (new.id, new.user_input, new.response);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS conversations_ad AFTER DELETE ON conversations BEGIN
+        INSERT INTO conversations_fts(conversations_fts, rowid, user_input, response)
+        VALUES ('delete', old.id, old.user_input, old.response);
+    END
+    '''
+]
+
+def ensure_conversation_index(conn):
+    """Zaman/kategori indekslerini ve FTS5 geçmiş dizinini kur; FTS5 kullanılabilirse True döndür"""
+    for statement in CONVERSATION_INDEXES:
+        conn.execute(statement)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+    ).fetchone()
+    if exists:
+        return True
+    try:
+        with conn:
+            for statement in CONVERSATION_FTS_SCHEMA:
+                conn.execute(statement)
+            conn.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+        logger.info("Konuşma geçmişi FTS5 dizinine taşındı")
+        return True
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 kullanılamıyor, geçmiş araması LIKE ile yapılacak: {e}")
+        return False
+
+class HistoryTurn:
+    """Sıcak katmandaki tek konuşma turu"""
+    __slots__ = ('time', 'user_input', 'response', 'category')
+
+    def __init__(self, time, user_input, response, category):
+        self.time = time
+        self.user_input = user_input
+        self.response = response
+        self.category = category
+
+HistoryPage = namedtuple('HistoryPage', ['rows', 'cursor'])
+
+class ConversationHistory:
+    """İki katmanlı konuşma geçmişi
+
+    Sıcak katman son hot_size turu __slots__ kayıtlarıyla bellekte tutar; bellek kullanımı
+    tur sayısından bağımsızdır. Her tur yazma kuyruğu üzerinden conversations tablosuna da
+    yazılır. page() diskteki geçmişi id imleciyle sayfalar (OFFSET kullanılmaz).
+    """
+    def __init__(self, writer, pool, hot_size=100, fts=True):
+        self.writer = writer
+        self.pool = pool
+        self.fts = fts
+        self.hot = deque(maxlen=hot_size)
+        self.turns = 0
+
+    def __len__(self):
+        return self.turns
+
+    def record(self, user_input, response, category="general"):
+        now = datetime.datetime.now()
+        self.hot.append(HistoryTurn(now, user_input, response, category))
+        self.turns += 1
+        self.writer.put('''
+            INSERT INTO conversations (timestamp, user_input, response, category)
+            VALUES (?, ?, ?, ?)
+        ''', (now.isoformat(), user_input, response, category))
+
+    def recent(self, n=None):
+        turns = list(self.hot)
+        return turns if n is None else turns[-n:]
+
+    def _first_id_at(self, conn, timestamp):
+        """timestamp anındaki veya sonraki ilk kaydın id'si (timestamp indeksinde tek arama)"""
+        row = conn.execute("SELECT id FROM conversations WHERE timestamp >= ? ORDER BY timestamp, id LIMIT 1",
+                           (timestamp,)).fetchone()
+        return row[0] if row else None
+
+    def page(self, cursor=None, limit=10, category=None, text=None, since=None, until=None):
+        """En yeniden eskiye bir sayfa ve sonraki sayfanın imleci (yoksa None)
+
+        cursor önceki sayfanın son id'sidir. Kayıtlar zaman sırasıyla eklendiğinden since/until
+        (ISO) sınırları timestamp indeksiyle bir id aralığına çevrilir; böylece her filtre
+        birleşimi birincil anahtar, kategori indeksi veya FTS5 rowid sırası üzerinde imleçten
+        devam eder ve LIMIT'e ulaşınca durur.
+        """
+        self.writer.flush(timeout=5)
+        with metrics.timer('sqlite', 'history_page'), self.pool.connection() as conn:
+            high = cursor
+            low = self._first_id_at(conn, since) if since else None
+            if until:
+                end = self._first_id_at(conn, until)
+                if end is not None:
+                    high = end if high is None else min(high, end)
+            if since and low is None:
+                return HistoryPage([], None)
+            where, params = [], []
+            if text and self.fts:
+                source = "conversations_fts f JOIN conversations c ON c.id = f.rowid"
+                key = "f.rowid"
+                where.append("conversations_fts MATCH ?")
+                params.append(fts_query(text))
+            else:
+                source, key = "conversations c", "c.id"
+                if text:
+                    where.append("(c.user_input LIKE ? OR c.response LIKE ?)")
+                    params += [f"%{text}%"] * 2
+            if high is not None:
+                where.append(f"{key} < ?")
+                params.append(high)
+            if low is not None:
+                where.append(f"{key} >= ?")
+                params.append(low)
+            if category:
+                where.append("c.category = ?")
+                params.append(category)
+            sql = (f"SELECT c.id, c.timestamp, c.user_input, c.response, c.category FROM {source}"
+                   + (" WHERE " + " AND ".join(where) if where else "")
+                   + f" ORDER BY {key} DESC LIMIT ?")
+            rows = conn.execute(sql, params + [limit + 1]).fetchall()
+        return HistoryPage(rows[:limit], rows[limit - 1][0] if len(rows) > limit else None)
+
+# -------------------- DİZİN TARAYICI --------------------
+ScanEntry = namedtuple('ScanEntry', ['path', 'name', 'is_dir', 'size', 'depth'])
+
+class DirectoryScanner:
+    """os.scandir tabanlı, akışlı ve isteğe bağlı paralel dizin tarayıcı"""
+    def __init__(self, root, recursive=False, max_depth=None, extensions=None, limit=None,
+                 sizes=True, workers=8):
+        self.root = root
+        self.recursive = recursive
+        self.max_depth = max_depth
+        self.extensions = {ext if ext.startswith('.') else f".{ext}" for ext in extensions or ()}
+        self.limit = limit
+        self.sizes = sizes
+        self.workers = workers
+        self.errors = 0
+        self._errors_lock = threading.Lock()
+
+    def _error(self):
+        """Okunamayan girdiyi say (havuz iş parçacıklarından da çağrılır)"""
+        with self._errors_lock:
+            self.errors += 1
+
+    def _wanted(self, name, is_dir):
+        if not self.extensions:
+            return True
+        return not is_dir and os.path.splitext(name)[1].lower() in self.extensions
+
+    def _make_entry(self, entry, is_dir, depth):
+        size = 0
+        if self.sizes and not is_dir:
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                self._error()
+        return ScanEntry(entry.path, entry.name, is_dir, size, depth)
+
+    def __iter__(self):
+        """Girdileri bulundukça üret (limit varsa orada durur)"""
+        entries = self._walk_parallel() if self.recursive else self._walk_flat()
+        if self.limit is not None:
+            entries = itertools.islice(entries, self.limit)
+        return iter(entries)
+
+    def _walk_flat(self):
+        with os.scandir(self.root) as it:
+            for entry in it:
+                # d_type sayesinde is_dir ek stat gerektirmez
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if self._wanted(entry.name, is_dir):
+                    yield self._make_entry(entry, is_dir, 0)
+
+    def _walk_parallel(self):
+        """Alt dizinleri iş parçacığı havuzunda tara; sonuçlar sınırlı bir kuyruktan akar"""
+        results = queue.Queue(maxsize=4096)
+        stop = threading.Event()
+        done = object()
+        pending = [1]
+        lock = threading.Lock()
+        executor = ThreadPoolExecutor(self.workers, thread_name_prefix="quantumia-scan")
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan(path, depth):
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if stop.is_set():
+                            break
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and (self.max_depth is None or depth < self.max_depth):
+                            with lock:
+                                pending[0] += 1
+                            executor.submit(scan, entry.path, depth + 1)
+                        if self._wanted(entry.name, is_dir):
+                            put(self._make_entry(entry, is_dir, depth))
+            except OSError:
+                self._error()
+            finally:
+                with lock:
+                    pending[0] -= 1
+                    finished = pending[0] == 0
+                if finished:
+                    put(done)
+
+        executor.submit(scan, self.root, 0)
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    return
+                yield item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def page(self, number, size=50):
+        """Yola göre sıralı number. sayfayı döndür, geri kalanları boyut okumadan say: (girdiler, toplam)
+
+        Paralel taramanın sırası iş parçacıklarının zamanlamasına bağlıdır; sayfalar ancak
+        sıralı dilimlenirse tutarlı olur. Bellekte en fazla number × size girdi tutulur.
+        """
+        sizes, self.sizes = self.sizes, False
+        total = 0
+
+        def counted():
+            nonlocal total
+            for total, entry in enumerate(self, 1):
+                yield entry
+
+        try:
+            start = (number - 1) * size
+            items = heapq.nsmallest(start + size, counted(), key=lambda entry: entry.path)[start:]
+        finally:
+            self.sizes = sizes
+        if sizes:
+            items = [entry._replace(size=os.stat(entry.path, follow_symlinks=False).st_size)
+                     if not entry.is_dir else entry for entry in items]
+        return items, total
+
+    def largest(self, n):
+        """En büyük n dosyayı n elemanlı bir yığınla bul (tam liste tutulmaz)"""
+        return heapq.nlargest(n, (entry for entry in self if not entry.is_dir), key=lambda e: e.size)
+
+    def aggregate(self, top=10):
+        """Toplam boyut, uzantı ve birinci seviye alt dizin bazında özet"""
+        files = dirs = total = 0
+        by_extension = {}
+        by_child = {}
+        root_len = len(os.path.join(self.root, ''))
+        for entry in self:
+            if entry.is_dir:
+                dirs += 1
+                continue
+            files += 1
+            total += entry.size
+            ext = os.path.splitext(entry.name)[1].lower() or '(uzantısız)'
+            count, size = by_extension.get(ext, (0, 0))
+            by_extension[ext] = (count + 1, size + entry.size)
+            child = entry.path[root_len:].split(os.sep, 1)[0] if entry.depth else '.'
+            by_child[child] = by_child.get(child, 0) + entry.size
+        return {
+            'files': files,
+            'dirs': dirs,
+            'bytes': total,
+            'extensions': heapq.nlargest(top, by_extension.items(), key=lambda item: item[1][1]),
+            'children': heapq.nlargest(top, by_child.items(), key=lambda item: item[1])
+        }
+
+# -------------------- DOSYA GÖRÜNTÜLEYİCİ --------------------
+SearchHit = namedtuple('SearchHit', ['path', 'line', 'offset', 'text'])
+
+class FileViewer:
+    """mmap tabanlı, sıfır kopyalı sayfalama ve arama yapan dosya görüntüleyici
+
+    Açılış dosya boyutundan bağımsızdır. Satır dizini ilk satır atlamasında ve yalnız
+    gerektiği kadar kurulur; her index_step satırdan biri saklanır (seyrek dizin).
+    """
+    chunk_size = 16 * 1024 * 1024
+
+    def __init__(self, path, index_step=1024):
+        self.path = path
+        self.index_step = index_step
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._index = [0]        # index_step katı satırların başlangıç ofsetleri
+        self._indexed_upto = 0   # bu bayta kadar satır sonları sayıldı
+        self._lines_counted = 0
+        self.total_lines = None if self.size else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _view(self, start, end):
+        """Eşlenmiş bölgenin numpy görünümü (kopyasız)"""
+        return np.frombuffer(self._map, dtype=np.uint8, count=end - start, offset=start)
+
+    def _extend_index(self, line):
+        """Seyrek dizini en az line satırını kapsayacak kadar büyüt"""
+        step = self.index_step
+        while self._indexed_upto < self.size and len(self._index) * step <= line:
+            start = self._indexed_upto
+            end = min(self.size, start + self.chunk_size)
+            newlines = np.flatnonzero(self._view(start, end) == 10)
+            # j. satır (j katı step) j. satır sonundan hemen sonra başlar
+            first = (-self._lines_counted - 1) % step
+            self._index.extend((newlines[first::step] + start + 1).tolist())
+            self._lines_counted += len(newlines)
+            self._indexed_upto = end
+        if self._indexed_upto >= self.size and self.total_lines is None:
+            ends_with_newline = self._map[self.size - 1:self.size] == b'\n'
+            self.total_lines = self._lines_counted + (0 if ends_with_newline else 1)
+
+    def line_offset(self, line):
+        """line. satırın (0 tabanlı) bayt ofseti; dosya daha kısaysa None"""
+        if self._map is None:
+            return None
+        self._extend_index(line)
+        block = line // self.index_step
+        if block >= len(self._index):
+            return None
+        offset = self._index[block]
+        for _ in range(line - block * self.index_step):
+            offset = self._map.find(b'\n', offset) + 1
+            if offset <= 0 or offset >= self.size:
+                return None
+        return offset
+
+    def _count_newlines(self, start, end):
+        """Aralıktaki satır sonlarını parça parça say (bellek kullanımı sabit)"""
+        total = 0
+        while start < end:
+            stop = min(end, start + self.chunk_size)
+            total += int(np.count_nonzero(self._view(start, stop) == 10))
+            start = stop
+        return total
+
+    def read_bytes(self, offset, length):
+        """offset konumundan length baytlık kopyasız görünüm"""
+        if self._map is None:
+            return memoryview(b'')
+        return memoryview(self._map)[offset:min(self.size, offset + length)]
+
+    def read_lines(self, start, count):
+        """start satırından itibaren count satırı döndür"""
+        offset = self.line_offset(start)
+        if offset is None:
+            return []
+        lines = []
+        for _ in range(count):
+            if offset >= self.size:
+                break
+            end = self._map.find(b'\n', offset)
+            end = self.size if end < 0 else end
+            lines.append(bytes(self.read_bytes(offset, end - offset)).decode('utf-8', errors='replace'))
+            offset = end + 1
+        return lines
+
+    def is_binary(self, probe=8192):
+        return self._map is not None and self._map.find(b'\x00', 0, probe) >= 0
+
+    def search(self, pattern, max_hits=100):
+        """Derlenmiş bayt regex'ini eşlenmiş tamponda satır hizalı parçalar halinde ara"""
+        hits = []
+        if self._map is None:
+            return hits
+        line = 0
+        counted_upto = 0
+        last_line_start = -1
+        start = 0
+        while start < self.size and len(hits) < max_hits:
+            end = self._map.find(b'\n', min(self.size, start + self.chunk_size))
+            end = self.size if end < 0 else end + 1
+            for match in pattern.finditer(self._map, start, end):
+                line_start = self._map.rfind(b'\n', 0, match.start()) + 1
+                if line_start == last_line_start:
+                    continue
+                last_line_start = line_start
+                line += self._count_newlines(counted_upto, line_start)
+                counted_upto = line_start
+                line_end = self._map.find(b'\n', line_start)
+                line_end = self.size if line_end < 0 else line_end
+                text = bytes(self.read_bytes(line_start, min(line_end - line_start, 200)))
+                hits.append(SearchHit(self.path, line + 1, match.start(),
+                                      text.decode('utf-8', errors='replace')))
+                if len(hits) >= max_hits:
+                    break
+            start = end
+        return hits
+
+def compile_search_pattern(pattern):
+    """Kullanıcı kalıbını büyük/küçük harf duyarsız bayt regex'ine çevir"""
+    try:
+        return re.compile(pattern.encode('utf-8'), re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        return re.compile(re.escape(pattern.encode('utf-8')), re.IGNORECASE)
+
+def search_file(path, pattern, max_hits=100):
+    """Tek dosyada ara (süreç havuzunda da çalışabilmesi için modül düzeyinde)"""
+    try:
+        with FileViewer(path) as viewer:
+            return viewer.search(compile_search_pattern(pattern), max_hits)
+    except (OSError, ValueError):
+        return []
+
+def process_pool(workers=None):
+    """'spawn' ile başlatılan süreç havuzu
+
+    İşler arka plan iş parçacıklarının (günlük, yazıcı, örnekleyici) çalıştığı süreçten
+    açılır; fork başka bir iş parçacığının tuttuğu kilidi çocuğa kilitli miras bırakabilir.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def search_files(paths, pattern, max_hits=100, workers=None):
+    """Birden çok dosyayı süreç havuzunda paralel ara (re GIL'i bırakmaz)
+
+    max_hits dolunca veya iş iptal edilince kuyrukta bekleyen dosyalar aranmadan bırakılır.
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return search_file(paths[0], pattern, max_hits) if paths else []
+    hits = []
+    executor = process_pool(workers)
+    try:
+        for result in executor.map(search_file, paths, itertools.repeat(pattern),
+                                   itertools.repeat(max_hits), chunksize=8):
+            hits.extend(result[:max_hits - len(hits)])
+            if len(hits) >= max_hits or job_cancelled():
+                break
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return hits
+
+def hexdump(data, offset=0):
+    """Baytları 16'lık satırlar halinde onaltılık döküm olarak biçimlendir"""
+    lines = []
+    for i in range(0, len(data), 16):
+        row = bytes(data[i:i + 16])
+        text = ''.join(chr(b) if 32 <= b < 127 else '.' for b in row)
+        lines.append(f"{offset + i:08x}  {row.hex(' '):<47}  {text}")
+    return "\n".join(lines)
+
+# -------------------- DOSYA ÖZETLERİ --------------------
+# Desteklenen algoritmalar ve kısa adları ("sha3" → sha3_256)
+HASH_ALGORITHMS = ('blake2b', 'blake2s', 'sha3_256', 'sha3_512', 'sha256', 'sha512', 'sha1', 'md5')
+HASH_ALIASES = {'blake2': 'blake2b', 'sha3': 'sha3_256', 'sha-256': 'sha256', 'sha-512': 'sha512',
+                'sha3-256': 'sha3_256', 'sha3-512': 'sha3_512'}
+DEFAULT_HASH_ALGORITHMS = ('blake2b', 'sha256')
+
+HashResult = namedtuple('HashResult', ['path', 'size', 'digests', 'cached', 'error'])
+
+class HashCancelled(Exception):
+    """Özetleme işi iptal edildi"""
+
+class HashCache:
+    """file_hashes tablosunda (yol, boyut, mtime) ile doğrulanan özet önbelleği
+
+    Okumalar paylaşılan bağlantı havuzundan toplu IN sorgularıyla, yazmalar yazma
+    kuyruğundan yapılır; dosya değişince boyut/mtime tutmaz ve özet yeniden hesaplanır.
+    """
+    def __init__(self, pool, writer, batch=500):
+        self.pool = pool
+        self.writer = writer
+        self.batch = batch
+
+    def lookup(self, paths):
+        """{yol: (boyut, mtime_ns, {algoritma: özet})}"""
+        self.writer.flush(timeout=5)
+        found = {}
+        paths = list(paths)
+        with self.pool.connection() as conn:
+            for i in range(0, len(paths), self.batch):
+                chunk = paths[i:i + self.batch]
+                rows = conn.execute(
+                    f"SELECT path, size, mtime_ns, algorithm, digest FROM file_hashes "
+                    f"WHERE path IN ({','.join('?' * len(chunk))})", chunk)
+                for path, size, mtime_ns, algorithm, digest in rows:
+                    entry = found.get(path)
+                    if entry is None or entry[:2] != (size, mtime_ns):
+                        # Aynı yolun farklı mtime'lı satırlarından yalnızca en yenisi kalır
+                        if entry is not None and entry[1] > mtime_ns:
+                            continue
+                        entry = found[path] = (size, mtime_ns, {})
+                    entry[2][algorithm] = digest
+        return found
+
+    def store(self, path, size, mtime_ns, digests):
+        hashed_at = datetime.datetime.now().isoformat()
+        for algorithm, digest in digests.items():
+            self.writer.put('''
+                INSERT OR REPLACE INTO file_hashes (path, algorithm, size, mtime_ns, digest, hashed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (path, algorithm, size, mtime_ns, digest, hashed_at))
+
+class FileHasher:
+    """Dosyaları ve dizin ağaçlarını sabit boyutlu parçalarla akışlı olarak özetle
+
+    Her iş parçacığı tek bir bytearray tamponunu readinto ile doldurur ve memoryview
+    dilimlerini özetleyicilere verir; dosya hiçbir zaman tümüyle belleğe okunmaz.
+    hashlib büyük tamponlarda GIL'i bıraktığı için dosyalar iş parçacığı havuzunda
+    paralel özetlenir.
+    """
+    def __init__(self, algorithms=DEFAULT_HASH_ALGORITHMS, chunk_size=1024 * 1024, workers=None, cache=None):
+        self.algorithms = tuple(algorithms)
+        unknown = [name for name in self.algorithms if name not in HASH_ALGORITHMS]
+        if unknown:
+            raise ValueError(f"Desteklenmeyen algoritma: {', '.join(unknown)}")
+        self.chunk_size = chunk_size
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache = cache
+        self._local = threading.local()
+
+    def _buffer(self):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = bytearray(self.chunk_size)
+        return buffer
+
+    def hash_file(self, path, cancel_event=None):
+        """Dosyanın (boyut, {algoritma: özet}) değerleri"""
+        hashers = [hashlib.new(name) for name in self.algorithms]
+        buffer = self._buffer()
+        view = memoryview(buffer)
+        size = 0
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                chunk = view[:n]
+                for hasher in hashers:
+                    hasher.update(chunk)
+                size += n
+                if cancel_event is not None and cancel_event.is_set():
+                    raise HashCancelled(path)
+        return size, {name: hasher.hexdigest() for name, hasher in zip(self.algorithms, hashers)}
+
+    def expand(self, targets, extensions=None):
+        """Hedefleri dosya yollarına aç (dizinler özyinelemeli, sıralı)"""
+        paths = []
+        for target in targets:
+            if os.path.isdir(target):
+                scanner = DirectoryScanner(target, recursive=True, extensions=extensions, sizes=False)
+                paths.extend(sorted(entry.path for entry in scanner if not entry.is_dir))
+            elif os.path.isfile(target):
+                paths.append(target)
+        return paths
+
+    def _one(self, path, known, cancel_event):
+        try:
+            st = os.stat(path)
+            entry = known.get(path)
+            if (entry and entry[:2] == (st.st_size, st.st_mtime_ns)
+                    and all(name in entry[2] for name in self.algorithms)):
+                return HashResult(path, st.st_size, {name: entry[2][name] for name in self.algorithms}, True, None)
+            size, digests = self.hash_file(path, cancel_event)
+            # Okuma sırasında değişen dosya önbelleğe yazılmaz
+            if self.cache is not None and size == st.st_size and os.stat(path).st_mtime_ns == st.st_mtime_ns:
+                self.cache.store(path, size, st.st_mtime_ns, digests)
+            return HashResult(path, size, digests, False, None)
+        except OSError as e:
+            return HashResult(path, 0, {}, False, e.strerror or str(e))
+
+    def hash_paths(self, paths, cancel_event=None):
+        """Dosyaları paralel özetle: (sonuçlar, istatistikler); sonuçlar girdi sırasında"""
+        paths = [os.path.abspath(path) for path in paths]
+        start = time.perf_counter()
+        known = self.cache.lookup(paths) if self.cache is not None else {}
+        if len(paths) <= 1:
+            results = [self._one(path, known, cancel_event) for path in paths]
+        else:
+            with ThreadPoolExecutor(min(self.workers, len(paths)), thread_name_prefix="quantumia-hash") as executor:
+                futures = [executor.submit(self._one, path, known, cancel_event) for path in paths]
+                try:
+                    results = [future.result() for future in futures]
+                except HashCancelled:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        elapsed = time.perf_counter() - start
+        hashed = sum(r.size for r in results if not r.cached and not r.error)
+        stats = {
+            'files': len(results),
+            'bytes': sum(r.size for r in results),
+            'hashed_bytes': hashed,
+            'cached': sum(1 for r in results if r.cached),
+            'errors': sum(1 for r in results if r.error),
+            'seconds': elapsed,
+            'mb_per_s': hashed / 1024 / 1024 / elapsed if elapsed > 0 else 0.0
+        }
+        return results, stats
+
+def tree_root(targets):
+    """Ağaç özetinde göreli yolların kökü: tek dizin hedefinde dizinin kendisi, aksi halde
+    hedeflerin ortak üst dizini (bulunan dosyalardan değil, istenen hedeflerden hesaplanır)"""
+    targets = [os.path.abspath(target) for target in targets]
+    if len(targets) == 1 and os.path.isdir(targets[0]):
+        return targets[0]
+    return os.path.commonpath([os.path.dirname(target) for target in targets])
+
+def tree_digest(results, algorithm, root):
+    """Ağacın tek özeti: root'a göreli yollar ve dosya özetleri üzerinden (sıra bağımsız)"""
+    results = [r for r in results if not r.error]
+    if not results:
+        return None
+    hasher = hashlib.new(algorithm)
+    for r in sorted(results, key=lambda r: r.path):
+        name = os.path.relpath(r.path, root).replace(os.sep, '/')
+        hasher.update(f"{name}\0{r.digests[algorithm]}\n".encode())
+    return hasher.hexdigest()
+
+# -------------------- ARŞİVLER --------------------
+ARCHIVE_SUFFIXES = (('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'), ('.tar.xz', 'tar.xz'), ('.txz', 'tar.xz'),
+                    ('.tar', 'tar'), ('.zip', 'zip'))
+ARCHIVE_FORMATS = ('zip', 'tar.gz', 'tar.xz', 'tar')
+# Varsayılan sıkıştırma seviyeleri; xz 3: 4 MB sözlük, iş parçacığı başına ~32 MB bellek
+ARCHIVE_LEVELS = {'zip': 6, 'tar.gz': 6, 'tar.xz': 3}
+
+# Arşiv komutlarındaki eylem kelimeleri
+ARCHIVE_ACTIONS = {'liste': 'list', 'listele': 'list', 'list': 'list', 'içerik': 'list',
+                   'aç': 'extract', 'çıkar': 'extract', 'çıkart': 'extract', 'extract': 'extract',
+                   'oluştur': 'create', 'yap': 'create', 'sıkıştır': 'create', 'create': 'create'}
+
+ArchiveEntry = namedtuple('ArchiveEntry', ['name', 'size', 'compressed', 'is_dir'])
+
+class ArchiveError(Exception):
+    """Arşiv biçimi desteklenmiyor veya üye yolu hedef dizinin dışına çıkıyor"""
+
+class ArchiveCancelled(Exception):
+    """Arşiv işi kullanıcı tarafından iptal edildi"""
+
+def archive_format(path):
+    """Uzantıdan arşiv biçimi (zip, tar.gz, tar.xz, tar) ya da None"""
+    name = path.lower()
+    return next((fmt for suffix, fmt in ARCHIVE_SUFFIXES if name.endswith(suffix)), None)
+
+def archive_stem(path):
+    """Arşiv uzantısı atılmış dosya adı ("veri.tar.gz" → "veri")"""
+    name = os.path.basename(path)
+    suffix = next((suffix for suffix, _ in ARCHIVE_SUFFIXES if name.lower().endswith(suffix)), '')
+    return name[:len(name) - len(suffix)] or name
+
+def safe_member_path(root, name):
+    """Üye adını root altındaki yola çevir (kök dizinin kendisi için None)
+
+    Mutlak yollar, sürücü harfleri ve '..' bileşenleri ArchiveError ile reddedilir.
+    """
+    normalized = name.replace('\\', '/')
+    parts = normalized.split('/')
+    if normalized.startswith('/') or re.match(r'^[A-Za-z]:', normalized) or '..' in parts:
+        raise ArchiveError(f"Güvensiz üye yolu: {name}")
+    parts = [part for part in parts if part not in ('', '.')]
+    return os.path.join(root, *parts) if parts else None
+
+class ParallelCompressor:
+    """Yazılan akışı bloklara bölüp blokları iş parçacıklarında sıkıştıran yazıcı (pigz benzeri)
+
+    Her blok bağımsız bir gzip/xz üyesi olarak yazılır; art arda eklenmiş üyeler gzip, xz,
+    tarfile ve lzma tarafından tek akış gibi okunur. zlib ve lzma sıkıştırırken GIL'i
+    bıraktığından bloklar çekirdeklere dağılır. Bellekte en fazla 2×workers blok bekler.
+    """
+    def __init__(self, fileobj, codec='gz', level=6, workers=None, block_size=4 << 20):
+        self.fileobj = fileobj
+        self.codec = codec
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._blocks = 0
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="quantumia-compress")
+
+    def _compress(self, data):
+        if self.codec == 'xz':
+            return lzma.compress(data, preset=self.level)
+        return gzip.compress(data, self.level, mtime=0)
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(self._compress, block))
+        self._blocks += 1
+        while len(self._pending) > 2 * self.workers:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def close(self):
+        """Kalan veriyi sıkıştır ve bekleyen blokları sırayla yaz (alttaki dosya açık kalır)"""
+        if self._buffer or not self._blocks:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self.fileobj.write(self._pending.popleft().result())
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+class ArchiveToolkit:
+    """zip, tar.gz, tar.xz ve tar arşivlerini listeleme, açma ve oluşturma
+
+    Listeleme zip'te yalnızca merkezi dizini, tar'da yalnızca üye başlıklarını okur. Üyeler
+    parça parça kopyalanır, hiçbiri belleğe bütün olarak alınmaz (tar'daki küçük üyeler
+    hariç). zip üyeleri tek bir paylaşılan ZipFile üzerinden iş parçacığı havuzunda açılır;
+    tar akışı sıralı okunur, küçük üyelerin diske yazılması havuza devredilir. Hiçbir şey
+    yazılmadan önce her üye yolu hedef dizin içinde doğrulanır (tar'da ayrı bir başlık
+    taramasıyla); bağlantı ve aygıt üyeleri atlanır.
+    """
+    SMALL_MEMBER = 1 << 20
+
+    def __init__(self, workers=None, cpu_workers=None, block_size=4 << 20):
+        # Tek çekirdekte havuz yalnızca yük getirir (açma CPU'ya bağlı); üyeler sırayla açılır
+        cpus = os.cpu_count() or 1
+        self.workers = workers or (min(32, cpus * 2) if cpus > 1 else 1)
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.block_size = block_size
+
+    @staticmethod
+    def _format(path, fmt=None):
+        fmt = fmt or archive_format(path)
+        if fmt not in ARCHIVE_FORMATS:
+            raise ArchiveError(f"Desteklenmeyen arşiv: {path} ({', '.join(ARCHIVE_FORMATS)})")
+        return fmt
+
+    def entries(self, path):
+        """Üyeleri sırayla üret (ArchiveEntry; tar'da sıkıştırılmış boyut None)"""
+        if self._format(path) == 'zip':
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    yield ArchiveEntry(info.filename, info.file_size, info.compress_size, info.is_dir())
+            return
+        with tarfile.open(path, 'r:*') as archive:
+            for member in archive:
+                archive.members = []  # Başlıklar birikmesin; bellek üye sayısından bağımsız
+                yield ArchiveEntry(member.name, member.size, None, member.isdir())
+
+    def _ensure_dirs(self, root, dirs, known):
+        """Dizinleri root'tan başlayarak bileşen bileşen oluştur
+
+        Her bileşen oluşturulmadan önce (önceden var olan bağlantılar dahil) root içinde
+        doğrulanır; dışarı çıkan bir bağlantının altında hiçbir dizin oluşturulmaz.
+        """
+        for path in sorted(dirs - known):
+            current = root
+            for part in os.path.relpath(path, root).split(os.sep):
+                current = os.path.join(current, part)
+                if current in known:
+                    continue
+                real = os.path.realpath(current)
+                if real != root and not real.startswith(root + os.sep):
+                    raise ArchiveError(f"Güvensiz dizin (bağlantı dışarı çıkıyor): {current}")
+                if not os.path.isdir(current):
+                    os.mkdir(current)
+                known.add(current)
+
+    @staticmethod
+    def _create_file(target):
+        """Üye dosyasını yazmak için aç; hedefte önceden var olan bağlantı izlenmez"""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        if hasattr(os, 'O_NOFOLLOW'):
+            flags |= os.O_NOFOLLOW
+        elif os.path.islink(target):
+            os.unlink(target)
+        try:
+            fd = os.open(target, flags, 0o666)
+        except OSError as e:
+            if e.errno == errno.ELOOP:
+                raise ArchiveError(f"Güvensiz hedef (sembolik bağlantı): {target}") from None
+            raise
+        return open(fd, 'wb')
+
+    def extract(self, path, dest, cancel=None):
+        """Arşivi dest altına aç; {'files', 'dirs', 'bytes', 'skipped', 'seconds'} döndür"""
+        fmt = self._format(path)
+        root = os.path.realpath(dest)
+        os.makedirs(root, exist_ok=True)
+        start = time.perf_counter()
+        if fmt == 'zip':
+            stats = self._extract_zip(path, root, cancel)
+        else:
+            stats = self._extract_tar(path, root, cancel)
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    def _extract_zip(self, path, root, cancel):
+        with zipfile.ZipFile(path) as archive:
+            # Önce tüm yollar doğrulanır: güvensiz tek üye varsa hiçbir şey yazılmaz
+            plan, dirs = [], set()
+            for info in archive.infolist():
+                target = safe_member_path(root, info.filename)
+                if target is None:
+                    continue
+                if info.is_dir():
+                    dirs.add(target)
+                else:
+                    dirs.add(os.path.dirname(target))
+                    plan.append((info, target))
+            self._ensure_dirs(root, dirs, {root})
+
+            # ZipFile üye açmayı kilitle korur; sıkıştırılmış veri kilit altında okunur, açma
+            # (zlib/lzma) ve diske yazma iş parçacıklarında eşzamanlı yürür
+            def extract_group(group):
+                written = 0
+                for info, target in group:
+                    if cancel is not None and cancel.is_set():
+                        raise ArchiveCancelled()
+                    with archive.open(info) as src, self._create_file(target) as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    written += info.file_size
+                return written
+
+            if self.workers == 1:
+                written = extract_group(plan)
+            else:
+                # Küçük üyeler gruplanır; havuz yükü üye başına değil grup başına ödenir
+                group_size = max(1, min(256, len(plan) // (self.workers * 4)))
+                groups = [plan[i:i + group_size] for i in range(0, len(plan), group_size)]
+                with ThreadPoolExecutor(self.workers, thread_name_prefix="quantumia-archive") as executor:
+                    written = sum(executor.map(extract_group, groups))
+        return {'files': len(plan), 'dirs': len(dirs), 'bytes': written, 'skipped': 0}
+
+    def _extract_tar(self, path, root, cancel):
+        stats = {'files': 0, 'dirs': 0, 'bytes': 0, 'skipped': 0}
+        known = {root}
+        pending = deque()
+
+        def write_file(target, data):
+            with self._create_file(target) as f:
+                f.write(data)
+
+        # Önce yalnızca başlıklar taranır: güvensiz tek üye varsa hiçbir şey yazılmaz
+        for entry in self.entries(path):
+            if cancel is not None and cancel.is_set():
+                raise ArchiveCancelled()
+            safe_member_path(root, entry.name)
+
+        with tarfile.open(path, 'r:*') as archive, \
+                ThreadPoolExecutor(self.workers, thread_name_prefix="quantumia-archive") as executor:
+            for member in archive:
+                archive.members = []
+                if cancel is not None and cancel.is_set():
+                    raise ArchiveCancelled()
+                target = safe_member_path(root, member.name)
+                if target is None:
+                    continue
+                if member.isdir():
+                    self._ensure_dirs(root, {target}, known)
+                    stats['dirs'] += 1
+                    continue
+                if not member.isreg():
+                    stats['skipped'] += 1  # Sembolik/sabit bağlantılar ve aygıtlar açılmaz
+                    continue
+                self._ensure_dirs(root, {os.path.dirname(target)}, known)
+                source = archive.extractfile(member)
+                if member.size <= self.SMALL_MEMBER and self.workers > 1:
+                    pending.append(executor.submit(write_file, target, source.read()))
+                    while len(pending) > self.workers * 4:
+                        pending.popleft().result()
+                else:
+                    with self._create_file(target) as dst:
+                        shutil.copyfileobj(source, dst, 1 << 20)
+                stats['files'] += 1
+                stats['bytes'] += member.size
+            for future in pending:
+                future.result()
+        return stats
+
+    @staticmethod
+    def expand(sources, exclude=()):
+        """Kaynakları (yol, arşivdeki ad) çiftlerine aç; dizinler kendi adlarıyla özyinelemeli
+
+        exclude içindeki yollar (oluşturulan arşiv ve geçici dosyası) atlanır.
+        """
+        skip = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+        for source in sources:
+            source = os.path.normpath(source)
+            base = os.path.dirname(os.path.abspath(source))
+            if os.path.isdir(source):
+                for dirpath, dirnames, filenames in os.walk(source):
+                    dirnames.sort()
+                    for name in sorted(filenames):
+                        full = os.path.abspath(os.path.join(dirpath, name))
+                        if os.path.normcase(full) not in skip:
+                            yield full, os.path.relpath(full, base)
+            elif os.path.isfile(source) and os.path.normcase(os.path.abspath(source)) not in skip:
+                yield source, os.path.basename(source)
+
+    def create(self, path, sources, fmt=None, level=None, cancel=None):
+        """Dosya/dizinlerden arşiv oluştur; {'files', 'bytes', 'size', 'seconds'} döndür
+
+        tar.gz ve tar.xz blokları ParallelCompressor ile çekirdeklere dağıtılır. zip'te her
+        üye zipfile ile parça parça sıkıştırılır (standart kitaplık ham üye yazmaya izin
+        vermediğinden sıralı). Arşiv geçici dosyaya yazılır ve bitince yerine taşınır; arşiv
+        kaynak ağacın içindeyse kendisi ve geçici dosyası arşive alınmaz.
+        """
+        fmt = self._format(path, fmt)
+        level = ARCHIVE_LEVELS.get(fmt) if level is None else level
+        start = time.perf_counter()
+        temp = f"{path}.tmp"
+        files = nbytes = 0
+        try:
+            if fmt == 'zip':
+                with zipfile.ZipFile(temp, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as archive:
+                    for source, arcname in self.expand(sources, (path, temp)):
+                        if cancel is not None and cancel.is_set():
+                            raise ArchiveCancelled()
+                        archive.write(source, arcname)
+                        files += 1
+                        nbytes += os.path.getsize(source)
+            else:
+                codec = fmt.partition('.')[2]
+                with open(temp, 'wb') as raw, \
+                        (ParallelCompressor(raw, codec, level, self.cpu_workers, self.block_size)
+                         if codec else nullcontext(raw)) as writer, \
+                        tarfile.open(fileobj=writer, mode='w|', format=tarfile.PAX_FORMAT) as archive:
+                    for source, arcname in self.expand(sources, (path, temp)):
+                        if cancel is not None and cancel.is_set():
+                            raise ArchiveCancelled()
+                        archive.add(source, arcname, recursive=False)
+                        files += 1
+                        nbytes += os.path.getsize(source)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        return {'files': files, 'bytes': nbytes, 'size': os.path.getsize(path),
+                'seconds': time.perf_counter() - start}
+
+# -------------------- ŞİFRE ÜRETİCİ --------------------
+PASSWORD_CLASSES = {
+    'lower': "abcdefghijklmnopqrstuvwxyz",
+    'upper': "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    'digit': "0123456789",
+    'symbol': "!@#$%^&*()"
+}
+AMBIGUOUS_CHARS = "Il1O0o"
+
+class PasswordPolicy:
+    """Şifre kuralları: uzunluk, karakter sınıfları, her birinden en az bir karakter şartı"""
+    def __init__(self, length=12, classes=tuple(PASSWORD_CLASSES), required=None, exclude_ambiguous=False,
+                 exclude=""):
+        unknown = [name for name in classes if name not in PASSWORD_CLASSES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen karakter sınıfı: {', '.join(unknown)}")
+        if length < 1:
+            raise ValueError("Şifre uzunluğu en az 1 olmalı")
+        removed = set(exclude) | (set(AMBIGUOUS_CHARS) if exclude_ambiguous else set())
+        self.length = length
+        self.classes = {name: ''.join(c for c in PASSWORD_CLASSES[name] if c not in removed) for name in classes}
+        self.required = tuple(classes if required is None else required)
+        self.alphabet = ''.join(self.classes.values())
+        if not self.alphabet or any(not self.classes.get(name) for name in self.required):
+            raise ValueError("Karakter kümesi boş")
+        if len(self.required) > length:
+            raise ValueError(f"{length} karakterde {len(self.required)} zorunlu sınıf sağlanamaz")
+
+    def satisfied(self, password):
+        return all(any(c in self.classes[name] for c in password) for name in self.required)
+
+    def valid_count(self):
+        """Kurala uyan şifre sayısı (zorunlu sınıflar üzerinden içerme-dışlama ile tam)"""
+        total = 0
+        for k in range(len(self.required) + 1):
+            for subset in itertools.combinations(self.required, k):
+                missing = sum(len(self.classes[name]) for name in subset)
+                total += (-1) ** k * (len(self.alphabet) - missing) ** self.length
+        return total
+
+    def entropy_bits(self):
+        return math.log2(self.valid_count())
+
+    def acceptance(self):
+        """Düzgün çekilen bir dizinin kurala uyma olasılığı"""
+        return self.valid_count() / len(self.alphabet) ** self.length
+
+class PasswordGenerator:
+    """secrets/os.urandom tabanlı şifre üretici
+
+    Tekil şifreler secrets.choice ile, toplu şifreler numpy ile üretilir: rastgele baytların
+    alfabe boyunun katı olan sınırın altında kalanları tutulur (modülo yanlılığı yok),
+    zorunlu sınıfları içermeyen satırlar atılıp yeniden çekilir; sonuç kurala uyan
+    şifreler üzerinde düzgün dağılımlıdır.
+    """
+    def __init__(self, policy=None):
+        self.policy = policy or PasswordPolicy()
+        self._codes = None
+        self._masks = None
+        self._acceptance = self.policy.acceptance()
+
+    def generate_one(self):
+        alphabet = self.policy.alphabet
+        while True:
+            password = ''.join(secrets.choice(alphabet) for _ in range(self.policy.length))
+            if self.policy.satisfied(password):
+                return password
+
+    def _indices(self, n):
+        """[0, alfabe boyu) aralığında n adet yansız indis"""
+        size = len(self.policy.alphabet)
+        limit = 256 - 256 % size
+        out = np.empty(n, dtype=np.uint8)
+        filled = 0
+        while filled < n:
+            need = n - filled
+            draw = np.frombuffer(os.urandom(int(need * 256 / limit * 1.05) + 64), dtype=np.uint8)
+            kept = draw[draw < limit][:need]
+            out[filled:filled + len(kept)] = kept % size
+            filled += len(kept)
+        return out
+
+    def generate(self, count):
+        """count adet şifre (numpy ile toplu)"""
+        policy = self.policy
+        if self._codes is None:
+            self._codes = np.frombuffer(policy.alphabet.encode('ascii'), dtype=np.uint8)
+            # Alfabe indisinden "bu sınıfa ait mi" tablosu
+            self._masks = [np.isin(self._codes, np.frombuffer(policy.classes[name].encode('ascii'), dtype=np.uint8))
+                           for name in policy.required]
+        rows = []
+        remaining = count
+        while remaining > 0:
+            # Kurala uymayacak satırlar için beklenen kabul oranına göre fazladan çek
+            n = int(remaining / self._acceptance * 1.05) + 4
+            batch = self._indices(n * policy.length).reshape(n, policy.length)
+            valid = np.ones(n, dtype=bool)
+            for mask in self._masks:
+                valid &= mask[batch].any(axis=1)
+            accepted = batch[valid][:remaining]
+            rows.append(accepted)
+            remaining -= len(accepted)
+        text = self._codes[np.concatenate(rows)].tobytes().decode('ascii')
+        length = policy.length
+        return [text[i:i + length] for i in range(0, len(text), length)]
+
+    def stream(self, count, batch=10000):
+        """Şifreleri batch'lik gruplar halinde üret (bellek kullanımı count'tan bağımsız)"""
+        while count > 0:
+            n = min(batch, count)
+            yield from self.generate(n)
+            count -= n
+
+# -------------------- YEDEKLEME --------------------
+class BackupCancelled(Exception):
+    """Yedekleme/geri yükleme işi iptal edildi"""
+
+def chunk_digest(data):
+    """Parçanın içerik adresi"""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+def compress_chunk(data, level=1):
+    """Parçayı sıkıştır (süreç havuzunda çalışabilmesi için modül düzeyinde)"""
+    return zlib.compress(data, level)
+
+def snapshot_database(db_path, target, pages=1024, sleep=0.05):
+    """Canlı veritabanının tutarlı kopyasını SQLite çevrimiçi yedekleme API'siyle al
+
+    Kopya pages sayfalık adımlarla yapılır; adımlar arasında yazarlar kilidi alabilir ve
+    iş iptal edilirse kopya yarıda bırakılır.
+    """
+    def progress(status, remaining, total):
+        if job_cancelled():
+            raise BackupCancelled()
+
+    source = sqlite3.connect(db_path)
+    dest = sqlite3.connect(target)
+    try:
+        source.backup(dest, pages=pages, progress=progress, sleep=sleep)
+    finally:
+        dest.close()
+        source.close()
+
+class ContentChunker:
+    """İçerik tanımlı parçalama (kayan pencere toplamı, numpy ile vektörel)
+
+    Kesim noktası yalnızca son `window` bayta bağlıdır; değişen bayt çevresindeki bir iki
+    parçayı etkiler, geri kalan parçalar aynı özetle yeniden bulunur ve yazılmaz.
+    """
+    def __init__(self, avg_size=16 * 1024, min_size=4 * 1024, max_size=64 * 1024,
+                 window=48, read_size=4 * 1024 * 1024):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.window = window
+        self.read_size = read_size
+        # Rastgele 32 bit değerlerin toplamı düzgün dağılır; eşiğin altı ~1/(avg-min) olasılıkla
+        self.threshold = np.uint32((1 << 32) // max(1, avg_size - min_size))
+        # Sabit tablo: sürümler ve makineler arasında aynı kesimler için hashlib'den türetilir
+        self.gear = np.array([int.from_bytes(hashlib.blake2b(bytes([b]), digest_size=4).digest(), 'little')
+                              for b in range(256)], dtype=np.uint32)
+
+    def _cuts(self, buf, final):
+        """buf içindeki parça sonlarını döndür (buf bir kesim noktasından başlar)"""
+        cuts, last = [], 0
+        if len(buf) > self.window:
+            sums = self.gear[np.frombuffer(buf, dtype=np.uint8)]
+            np.cumsum(sums, out=sums)
+            rolling = sums[self.window:] - sums[:-self.window]
+            hits = np.flatnonzero(rolling < self.threshold) + (self.window + 1)
+            while True:
+                i = int(np.searchsorted(hits, last + self.min_size))
+                cut = int(hits[i]) if i < len(hits) else None
+                if cut is None or cut - last > self.max_size:
+                    cut = last + self.max_size
+                    if cut > len(buf):
+                        break
+                cuts.append(cut)
+                last = cut
+        if final and last < len(buf):
+            cuts.append(len(buf))
+        return cuts
+
+    def split(self, stream):
+        """Akıştan parçaları sırayla üret (bellekte en fazla read_size + max_size bayt)"""
+        pending = b''
+        while True:
+            block = stream.read(self.read_size)
+            final = not block
+            buf = pending + block if pending else block
+            start = 0
+            for cut in self._cuts(buf, final):
+                yield buf[start:cut]
+                start = cut
+            pending = buf[start:]
+            if final:
+                return
+
+class ChunkStore:
+    """İçerik adresli, sıkıştırılmış parça deposu: <kök>/chunks/ab/abcdef..."""
+    def __init__(self, root):
+        self.chunk_dir = os.path.join(root, 'chunks')
+
+    def path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, digest, compressed):
+        """Parçayı geçici dosyaya yazıp atomik olarak yerine taşı"""
+        path = self.path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp, path)
+        return len(compressed)
+
+    def get(self, digest):
+        """Parçayı oku, aç ve özetini doğrula"""
+        with open(self.path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if chunk_digest(data) != digest:
+            raise ValueError(f"parça bozuk: {digest}")
+        return data
+
+class BackupEngine:
+    """Artımlı, tekilleştirilmiş yedekler
+
+    Her yedek manifests/ altında bir JSON manifesttir (dosya başına parça özetleri listesi);
+    parçalar tüm yedekler arasında paylaşılır, değişmeyen veri yeniden yazılmaz.
+    """
+    def __init__(self, root='backups', workers=None, level=1, chunker=None):
+        self.root = root
+        self.store = ChunkStore(root)
+        self.manifest_dir = os.path.join(root, 'manifests')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.workers = workers
+        self.level = level
+        self.chunker = chunker or ContentChunker()
+
+    def manifests(self):
+        """Yedek kimlikleri, eskiden yeniye"""
+        if not os.path.isdir(self.manifest_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.manifest_dir) if name.endswith('.json'))
+
+    def resolve(self, backup_id=None):
+        """Kimliği çöz; boşsa ya da 'son' ise en yeni yedek"""
+        ids = self.manifests()
+        if not ids:
+            return None
+        if not backup_id or backup_id in ('son', 'latest'):
+            return ids[-1]
+        matches = [i for i in ids if i.startswith(backup_id)]
+        return matches[-1] if matches else None
+
+    def load_manifest(self, backup_id):
+        with open(os.path.join(self.manifest_dir, f"{backup_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _new_id(self):
+        base = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_id, n = base, 1
+        while os.path.exists(os.path.join(self.manifest_dir, f"{backup_id}.json")):
+            n += 1
+            backup_id = f"{base}_{n}"
+        return backup_id
+
+    def backup(self, db_path, files=()):
+        """Veritabanının anlık görüntüsünü ve ek dosyaları depola, manifesti döndür"""
+        start = time.perf_counter()
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        backup_id = self._new_id()
+        snapshot = os.path.join(self.tmp_dir, f"{backup_id}.db")
+        stats = {'bytes': 0, 'chunks': 0, 'new_chunks': 0, 'stored_bytes': 0}
+        executor = None
+        try:
+            snapshot_database(db_path, snapshot)
+            sources = [(os.path.basename(db_path), snapshot, 'database')]
+            sources += [(os.path.basename(path), path, 'file') for path in files if os.path.exists(path)]
+            entries = []
+            for name, path, role in sources:
+                entry, executor = self._store_file(path, executor, stats)
+                entry.update(name=name, role=role)
+                entries.append(entry)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if os.path.exists(snapshot):
+                os.remove(snapshot)
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        manifest = {'id': backup_id, 'created': datetime.datetime.now().isoformat(), 'version': 1,
+                    'files': entries, 'stats': stats}
+        path = os.path.join(self.manifest_dir, f"{backup_id}.json")
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+        return manifest
+
+    def _store_file(self, path, executor, stats):
+        """Dosyayı parçala; depoda olmayan parçaları süreç havuzunda sıkıştırıp yaz
+
+        Dosya özeti parça özetleri dizisinin özetidir (veriyi ikinci kez okumadan).
+        """
+        whole = hashlib.blake2b(digest_size=32)
+        chunks = []
+        queued = set()
+        inflight = deque()
+        limit = 4 * (self.workers or os.cpu_count() or 2)
+
+        def drain(keep):
+            while len(inflight) > keep:
+                digest, future = inflight.popleft()
+                stats['stored_bytes'] += self.store.put(digest, future.result())
+
+        size = 0
+        with open(path, 'rb') as f:
+            for chunk in self.chunker.split(f):
+                if job_cancelled():
+                    raise BackupCancelled()
+                digest = chunk_digest(chunk)
+                whole.update(bytes.fromhex(digest))
+                size += len(chunk)
+                chunks.append([digest, len(chunk)])
+                if digest in queued or self.store.has(digest):
+                    continue
+                queued.add(digest)
+                if executor is None:
+                    executor = process_pool(self.workers)
+                inflight.append((digest, executor.submit(compress_chunk, chunk, self.level)))
+                drain(limit)
+        drain(0)
+        stats['bytes'] += size
+        stats['chunks'] += len(chunks)
+        stats['new_chunks'] += len(queued)
+        return {'size': size, 'digest': whole.hexdigest(), 'chunks': chunks}, executor
+
+    def _rebuild(self, entry, out=None):
+        """Dosyayı parçalardan yeniden kur (out yoksa yalnız doğrula); sorun listesi döndür"""
+        whole = hashlib.blake2b(digest_size=32)
+        problems = []
+        for digest, size in entry['chunks']:
+            if job_cancelled():
+                raise BackupCancelled()
+            try:
+                data = self.store.get(digest)
+            except (OSError, ValueError, zlib.error) as e:
+                problems.append(f"{entry['name']}: {e}")
+                continue
+            if len(data) != size:
+                problems.append(f"{entry['name']}: parça boyutu uyuşmuyor ({digest})")
+            whole.update(bytes.fromhex(digest))
+            if out is not None:
+                out.write(data)
+        if not problems and whole.hexdigest() != entry['digest']:
+            problems.append(f"{entry['name']}: dosya özeti uyuşmuyor")
+        return problems
+
+    def verify(self, backup_id):
+        """Yedekteki tüm parçaları ve dosya özetlerini doğrula; sorun listesi döndür"""
+        problems = []
+        for entry in self.load_manifest(backup_id)['files']:
+            problems.extend(self._rebuild(entry))
+        return problems
+
+    def restore(self, backup_id, targets):
+        """Yedeği geri yükle; targets: manifestteki dosya adı -> hedef yol
+
+        Önce tüm dosyalar geçici yollara kurulup doğrulanır, sonra uygulanır. Veritabanı
+        çevrimiçi yedekleme API'siyle canlı dosyanın üzerine kopyalanır (açık bağlantılar
+        geçerli kalır); diğer dosyalar atomik olarak değiştirilir.
+        """
+        manifest = self.load_manifest(backup_id)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        staged = []
+        try:
+            for entry in manifest['files']:
+                if entry['name'] not in targets:
+                    continue
+                tmp = os.path.join(self.tmp_dir, f"restore-{backup_id}-{entry['name']}")
+                staged.append((entry, tmp))
+                with open(tmp, 'wb') as out:
+                    problems = self._rebuild(entry, out)
+                if problems:
+                    raise ValueError("; ".join(problems))
+                if entry['role'] == 'database':
+                    check = sqlite3.connect(tmp)
+                    try:
+                        result = check.execute("PRAGMA quick_check").fetchone()[0]
+                    finally:
+                        check.close()
+                    if result != 'ok':
+                        raise ValueError(f"{entry['name']}: bütünlük denetimi başarısız ({result})")
+            for entry, tmp in staged:
+                target = targets[entry['name']]
+                if entry['role'] == 'database':
+                    source = sqlite3.connect(tmp)
+                    dest = sqlite3.connect(target)
+                    try:
+                        source.backup(dest)
+                    finally:
+                        dest.close()
+                        source.close()
+                else:
+                    os.replace(tmp, target)
+        finally:
+            for _, tmp in staged:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return [entry['name'] for entry, _ in staged]
+
+# -------------------- ANLAMSAL ARAMA --------------------
+# Bu kategoriyle kaydedilen "bilmiyorum" yanıtları dizine alınmaz
+FALLBACK_CATEGORY = "learning"
+
+TABLE_CONVERSATIONS = 0
+TABLE_KNOWLEDGE = 1
+SEMANTIC_MODEL_VERSION = 1  # data/semantic_index.npz biçim sürümü
+
+class SemanticIndex:
+    """Konuşma ve bilgi tabloları üzerinde TF-IDF tabanlı anlamsal arama"""
+    def __init__(self, db_path, model_path, min_score=0.35, refit_interval=3600, refit_ratio=0.25,
+                 merge_threshold=10000, sync_interval=1.0):
+        self.db_path = db_path
+        self.model_path = model_path
+        self.min_score = min_score
+        self.refit_interval = refit_interval
+        self.refit_ratio = refit_ratio
+        self.merge_threshold = merge_threshold
+        self.sync_interval = sync_interval
+        self.vectorizer = None
+        self.matrix = None  # CSC: sütun dilimi = terimin ters indeks listesi
+        self.tail = None    # CSR: henüz birleştirilmemiş yeni satırlar
+        self.doc_table = None
+        self.doc_rowid = None
+        self.last_ids = {'conversations': 0, 'knowledge': 0}
+        self.fitted_at = 0.0
+        self.fitted_docs = 0
+        self.absorbed_docs = 0
+        self.generation = 0  # Her fit() ile artar; eski sözlükle dönüştürülmüş satırları ayırt eder
+        self.dirty = False
+        self.warming = False
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        self._refit_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.vectorizer is not None
+
+    def _read_docs(self, conn, last_ids):
+        """last_ids sonrasındaki satırları (tablo, rowid, metin) olarak oku"""
+        ids = dict(last_ids)
+        docs = []
+        for rowid, text, category in conn.execute(
+                "SELECT id, user_input, category FROM conversations WHERE id > ? ORDER BY id",
+                (last_ids['conversations'],)):
+            ids['conversations'] = rowid
+            if category != FALLBACK_CATEGORY:
+                docs.append((TABLE_CONVERSATIONS, rowid, turkish_lower(text or '')))
+        for rowid, topic, info in conn.execute(
+                "SELECT id, topic, information FROM knowledge WHERE id > ? ORDER BY id",
+                (last_ids['knowledge'],)):
+            ids['knowledge'] = rowid
+            docs.append((TABLE_KNOWLEDGE, rowid, turkish_lower(f"{topic or ''} {info or ''}")))
+        return docs, ids
+
+    def fit(self, texts, tables, rowids, last_ids):
+        """Tüm belgeler üzerinde modeli baştan eğit"""
+        vectorizer = sklearn_text.TfidfVectorizer(sublinear_tf=True, dtype=np.float32)
+        matrix = vectorizer.fit_transform(texts).tocsc()
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.matrix = matrix
+            self.tail = None
+            self.doc_table = np.asarray(tables, dtype=np.uint8)
+            self.doc_rowid = np.asarray(rowids, dtype=np.int64)
+            self.last_ids = dict(last_ids)
+            self.generation += 1
+            self.fitted_at = time.time()
+            self.fitted_docs = len(texts)
+            self.absorbed_docs = 0
+            self.dirty = True
+
+    def refit(self):
+        """Veritabanındaki tüm belgelerle modeli yeniden eğit ve kaydet"""
+        if not self._refit_lock.acquire(blocking=False):
+            return
+        try:
+            self._refit()
+        finally:
+            self._refit_lock.release()
+
+    def _refit(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            docs, last_ids = self._read_docs(conn, {'conversations': 0, 'knowledge': 0})
+        finally:
+            conn.close()
+        if not docs:
+            return
+        tables, rowids, texts = zip(*docs)
+        try:
+            self.fit(texts, tables, rowids, last_ids)
+        except ValueError as e:
+            # Boş kelime dağarcığı: anlamlı belge yok
+            logger.warning(f"Anlamsal dizin eğitilemedi: {e}")
+            return
+        self.save()
+        logger.info(f"Anlamsal dizin eğitildi: {len(docs)} belge")
+
+    def reset(self):
+        """Veritabanı dışarıdan değişti (yedekten geri yükleme): dizini boşalt ve baştan eğit
+
+        Sürmekte olan arka plan eğitimi geri yüklemeden önceki satırları okumuş olabilir;
+        bitmesi beklenir ve sonucu bu eğitimle değiştirilir. Eski sözlükle yapılan
+        eşitlemeler nesil değiştiği için atılır.
+        """
+        with self._refit_lock:
+            with self._lock:
+                self.vectorizer = None
+                self.matrix = None
+                self.tail = None
+                self.doc_table = None
+                self.doc_rowid = None
+                self.last_ids = {'conversations': 0, 'knowledge': 0}
+                self.fitted_docs = 0
+                self.absorbed_docs = 0
+                self.generation += 1
+                self.dirty = False
+            # Eğitilecek belge yoksa bir sonraki açılış eski modeli yüklemesin
+            if os.path.exists(self.model_path):
+                os.remove(self.model_path)
+            self._refit()
+
+    def refit_async(self):
+        """Yeniden eğitimi arka plan iş parçacığında başlat (zaten sürüyorsa bir şey yapma)"""
+        if not self._refit_lock.locked():
+            threading.Thread(target=self.refit, name="quantumia-refit", daemon=True).start()
+
+    def refit_due(self):
+        """Zamanlanmış tam yeniden eğitim zamanı geldi mi"""
+        if not self.ready:
+            return True
+        stale = time.time() - self.fitted_at > self.refit_interval
+        grown = self.absorbed_docs > self.refit_ratio * max(self.fitted_docs, 1)
+        return (stale or grown) and self.absorbed_docs > 0
+
+    def sync(self):
+        """Yeni satırları mevcut sözlük/idf ile dizine ekle"""
+        # Aynı anda tek eşitleme; diğer iş parçacıkları beklemeden mevcut dizini kullanır
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._synced_at = time.monotonic()
+            self._sync()
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self):
+        # sync() yanıt yolunda (olay döngüsü, HTTP işleyicileri) çalışır; eğitim hiçbir
+        # zaman burada yapılmaz, sorgular o sırada mevcut matristen yanıtlanır
+        with self._lock:
+            vectorizer, generation, since = self.vectorizer, self.generation, dict(self.last_ids)
+        if vectorizer is None:
+            self.refit_async()
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            docs, last_ids = self._read_docs(conn, since)
+        finally:
+            conn.close()
+        vectors = None
+        if docs:
+            tables, rowids, texts = zip(*docs)
+            vectors = vectorizer.transform(texts)
+        with self._lock:
+            if self.generation != generation:
+                # Bu arada yeniden eğitim bitti: satırlar eski sözlükle dönüştürüldü ve
+                # yeni matriste zaten olabilir; parti atılır, sonraki eşitleme yeni
+                # last_ids'ten devam eder
+                return
+            if vectors is not None:
+                # Yeni satırlar küçük bir CSR kuyruğunda birikir, eşikte ana matrise katılır
+                if self.tail is None:
+                    self.tail = vectors.tocsr()
+                else:
+                    self.tail = scipy_sparse.vstack([self.tail, vectors], format='csr')
+                if self.tail.shape[0] >= self.merge_threshold:
+                    self._merge_tail()
+                self.doc_table = np.concatenate([self.doc_table, np.asarray(tables, dtype=np.uint8)])
+                self.doc_rowid = np.concatenate([self.doc_rowid, np.asarray(rowids, dtype=np.int64)])
+                self.absorbed_docs += len(docs)
+                self.dirty = True
+            self.last_ids = last_ids
+        if self.refit_due():
+            self.refit_async()
+
+    def _merge_tail(self):
+        """Kuyruktaki satırları ana CSC matrise kat (kilit tutulurken çağrılır)"""
+        if self.tail is not None:
+            self.matrix = scipy_sparse.vstack([self.matrix, self.tail], format='csc')
+            self.tail = None
+
+    def warm_up(self):
+        """Kayıtlı modeli yükle (yoksa eğit) ve eksik satırları ekle"""
+        self.warming = True
+        try:
+            if not self.load():
+                self.refit()
+            self.sync()
+        except Exception as e:
+            logger.error(f"Anlamsal dizin hazırlama hatası: {e}")
+        finally:
+            self.warming = False
+
+    def query(self, text, k=5):
+        """En benzer k belgeyi [(skor, tablo, rowid), ...] olarak döndür"""
+        with self._lock:
+            vectorizer, matrix, tail = self.vectorizer, self.matrix, self.tail
+            doc_table, doc_rowid = self.doc_table, self.doc_rowid
+        if vectorizer is None or matrix.shape[0] == 0:
+            return []
+        # Satırlar L2 normalize: seyrek matris-vektör çarpımı kosinüs benzerliğini verir.
+        # CSC matriste yalnızca sorgu terimlerinin sütunları okunur.
+        vector = vectorizer.transform([turkish_lower(text)])
+        if vector.nnz == 0:
+            return []
+        scores = matrix[:, vector.indices] @ vector.data
+        if tail is not None:
+            scores = np.concatenate([scores, (tail @ vector.T).toarray().ravel()])
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(doc_table[i]), int(doc_rowid[i])) for i in top if scores[i] > 0]
+
+    def answer(self, text, conn):
+        """Yeterince benzer bir belge varsa yanıtını döndür"""
+        if self.warming:
+            return None
+        if time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync()
+        for score, table, rowid in self.query(text, k=1):
+            if score < self.min_score:
+                return None
+            if table == TABLE_CONVERSATIONS:
+                row = conn.execute("SELECT response FROM conversations WHERE id = ?", (rowid,)).fetchone()
+            else:
+                row = conn.execute("SELECT information FROM knowledge WHERE id = ?", (rowid,)).fetchone()
+            return row[0] if row else None
+        return None
+
+    def save(self):
+        """Modeli diske atomik olarak kaydet"""
+        with self._lock:
+            if not self.ready or not self.dirty:
+                return
+            self._merge_tail()
+            # pickle yerine düz diziler: yükleme kod çalıştıramaz, sklearn sürümüne bağlı değil
+            state = {
+                'version': np.int64(SEMANTIC_MODEL_VERSION),
+                'terms': np.asarray(self.vectorizer.get_feature_names_out(), dtype=str),
+                'idf': self.vectorizer.idf_,
+                'data': self.matrix.data,
+                'indices': self.matrix.indices,
+                'indptr': self.matrix.indptr,
+                'shape': np.asarray(self.matrix.shape, dtype=np.int64),
+                'doc_table': self.doc_table,
+                'doc_rowid': self.doc_rowid,
+                'last_ids': np.asarray([self.last_ids['conversations'], self.last_ids['knowledge']],
+                                       dtype=np.int64),
+                'counts': np.asarray([self.fitted_docs, self.absorbed_docs], dtype=np.int64),
+                'fitted_at': np.float64(self.fitted_at)
+            }
+            self.dirty = False
+        tmp_path = f"{self.model_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **state)
+        os.replace(tmp_path, self.model_path)
+
+    def load(self):
+        """Kayıtlı modeli yükle; bulunamazsa False döndür"""
+        if not os.path.exists(self.model_path):
+            return False
+        try:
+            with np.load(self.model_path, allow_pickle=False) as state:
+                if int(state['version']) != SEMANTIC_MODEL_VERSION:
+                    raise ValueError(f"desteklenmeyen model sürümü {int(state['version'])}")
+                terms = state['terms'].tolist()
+                vectorizer = sklearn_text.TfidfVectorizer(sublinear_tf=True, dtype=np.float32)
+                vectorizer.vocabulary_ = {term: i for i, term in enumerate(terms)}
+                vectorizer.idf_ = state['idf']
+                matrix = scipy_sparse.csc_matrix((state['data'], state['indices'], state['indptr']),
+                                                 shape=tuple(state['shape']))
+                doc_table, doc_rowid = state['doc_table'], state['doc_rowid']
+                conversations, knowledge = state['last_ids'].tolist()
+                fitted_docs, absorbed_docs = state['counts'].tolist()
+                fitted_at = float(state['fitted_at'])
+            if matrix.shape != (len(doc_rowid), len(terms)) or len(doc_table) != len(doc_rowid):
+                raise ValueError("model boyutları tutarsız")
+        except Exception as e:
+            logger.warning(f"Anlamsal dizin yüklenemedi, yeniden eğitilecek: {e}")
+            return False
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.matrix = matrix
+            self.tail = None
+            self.doc_table = doc_table
+            self.doc_rowid = doc_rowid
+            self.last_ids = {'conversations': conversations, 'knowledge': knowledge}
+            self.fitted_at = fitted_at
+            self.fitted_docs = fitted_docs
+            self.absorbed_docs = absorbed_docs
+            self.generation += 1
+            self.dirty = False
+        return True
+
+# -------------------- AĞ PROBLARI --------------------
+ProbeResult = namedtuple('ProbeResult', ['host', 'seq', 'rtt', 'error'])
+
+def icmp_checksum(data):
+    """RFC 1071 internet sağlama toplamı"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(int.from_bytes(data[i:i + 2], 'big') for i in range(0, len(data), 2))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+def open_icmp_socket():
+    """İzin varsa ICMP soketi aç: (soket, ip_başlığı_var_mı) ya da (None, False)"""
+    for sock_type, has_ip_header in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            sock.setblocking(False)
+            return sock, has_ip_header
+        except (PermissionError, OSError):
+            continue
+    return None, False
+
+def probe_stats(rtts):
+    """RTT listesinden min/ort/maks ve titreşim (ardışık farkların ortalaması)"""
+    if not rtts:
+        return None
+    jitter = (sum(abs(b - a) for a, b in zip(rtts, rtts[1:])) / (len(rtts) - 1)) if len(rtts) > 1 else 0.0
+    return {'min': min(rtts), 'avg': sum(rtts) / len(rtts), 'max': max(rtts), 'jitter': jitter}
+
+class NetworkProber:
+    """Birçok hedefe aynı anda TCP-connect veya ICMP probu gönderen asyncio motoru"""
+    def __init__(self, timeout=1.0, port=80, method="auto", concurrency=512, interval=0.2):
+        self.timeout = timeout
+        self.port = port
+        self.method = method
+        self.concurrency = concurrency
+        self.interval = interval
+
+    def icmp_available(self):
+        sock, _ = open_icmp_socket()
+        if sock is None:
+            return False
+        sock.close()
+        return True
+
+    async def _resolve(self, host):
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        return infos[0][4][0]
+
+    async def tcp_probe(self, address, port):
+        """TCP bağlantı kurulum süresini ölç (RST de ulaşılabilirlik demektir)"""
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.timeout)
+        except ConnectionRefusedError:
+            return time.perf_counter() - start
+        writer.close()
+        return time.perf_counter() - start
+
+    async def icmp_probe(self, address, seq):
+        """ICMP echo gönderip yanıt süresini ölç"""
+        loop = asyncio.get_running_loop()
+        sock, has_ip_header = open_icmp_socket()
+        if sock is None:
+            raise PermissionError("ICMP izni yok")
+        try:
+            ident = (os.getpid() + seq) & 0xffff
+            header = bytes([8, 0, 0, 0]) + ident.to_bytes(2, 'big') + seq.to_bytes(2, 'big')
+            payload = b'quantumia-probe'
+            checksum = icmp_checksum(header + payload)
+            packet = header[:2] + checksum.to_bytes(2, 'big') + header[4:] + payload
+            # Bağlı ICMP soketi yalnızca bu adresten gelen yanıtları alır
+            sock.connect((address, 0))
+            start = time.perf_counter()
+            await loop.sock_sendall(sock, packet)
+
+            async def wait_reply():
+                while True:
+                    data = await loop.sock_recv(sock, 1024)
+                    if has_ip_header:
+                        data = data[(data[0] & 0x0f) * 4:]
+                    # DGRAM soketlerinde kimliği çekirdek atar, yalnız RAW'da karşılaştırılır
+                    if data[0] != 0 or int.from_bytes(data[6:8], 'big') != seq:
+                        continue
+                    if has_ip_header and int.from_bytes(data[4:6], 'big') != ident:
+                        continue
+                    return time.perf_counter() - start
+
+            return await asyncio.wait_for(wait_reply(), self.timeout)
+        finally:
+            sock.close()
+
+    async def probe(self, host, seq, port, use_icmp, semaphore):
+        """Tek bir probu çalıştır, hatayı sonuç olarak döndür"""
+        async with semaphore:
+            try:
+                address = await asyncio.wait_for(self._resolve(host), self.timeout)
+                if use_icmp:
+                    rtt = await self.icmp_probe(address, seq)
+                else:
+                    rtt = await self.tcp_probe(address, port)
+                return ProbeResult(host, seq, rtt, None)
+            except asyncio.TimeoutError:
+                return ProbeResult(host, seq, None, "zaman aşımı")
+            except Exception as e:
+                return ProbeResult(host, seq, None, str(e) or type(e).__name__)
+
+    async def _run(self, targets, count, on_result):
+        use_icmp = self.method == "icmp" or (self.method == "auto" and self.icmp_available())
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = []
+        for seq in range(1, count + 1):
+            for host, port in targets:
+                # Aynı hedefin ardışık probları aralıklı gönderilir, hedefler arası bekleme yok
+                tasks.append(asyncio.ensure_future(
+                    self._delayed(self.interval * (seq - 1), host, seq, port or self.port, use_icmp, semaphore)))
+        results = {host: [] for host, _ in targets}
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            results[result.host].append(result)
+            if on_result:
+                on_result(result)
+        return results, ("icmp" if use_icmp else "tcp")
+
+    async def _delayed(self, delay, host, seq, port, use_icmp, semaphore):
+        if delay:
+            await asyncio.sleep(delay)
+        return await self.probe(host, seq, port, use_icmp, semaphore)
+
+    def run(self, targets, count=4, on_result=None):
+        """[(host, port), ...] hedeflerini prob'la: ({host: [ProbeResult]}, yöntem)"""
+        return asyncio.run(self._run(targets, count, on_result))
+
+def local_ip():
+    """Yerel IP'yi UDP soket yönlendirmesinden bul (paket gönderilmez, DNS beklenmez)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect(('10.255.255.255', 1))
+        return sock.getsockname()[0]
+    except OSError:
+        return '127.0.0.1'
+    finally:
+        sock.close()
+
+# -------------------- HTTP İSTEMCİSİ --------------------
+def pooled_session(pool_size=16):
+    """Bağlantıları keep-alive ile yeniden kullanan requests.Session"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class RequestCoalescer:
+    """Aynı anahtar için uçuştaki çağrıları birleştir: ikinci çağıran ilkinin sonucunu bekler"""
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, func, *args):
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = func(*args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def __len__(self):
+        return len(self._inflight)
+
+# -------------------- HAVA DURUMU --------------------
+# 81 il merkezi (plaka sırasıyla): ad, enlem, boylam; data/places.tsv ile genişletilebilir
+BUILTIN_PLACES = (
+    ("Adana", 37.00, 35.32), ("Adıyaman", 37.76, 38.28), ("Afyonkarahisar", 38.76, 30.54),
+    ("Ağrı", 39.72, 43.05), ("Amasya", 40.65, 35.83), ("Ankara", 39.93, 32.86), ("Antalya", 36.89, 30.71),
+    ("Artvin", 41.18, 41.82), ("Aydın", 37.84, 27.85), ("Balıkesir", 39.65, 27.88), ("Bilecik", 40.14, 29.98),
+    ("Bingöl", 38.88, 40.50), ("Bitlis", 38.40, 42.11), ("Bolu", 40.74, 31.61), ("Burdur", 37.72, 30.29),
+    ("Bursa", 40.19, 29.06), ("Çanakkale", 40.15, 26.41), ("Çankırı", 40.60, 33.62), ("Çorum", 40.55, 34.95),
+    ("Denizli", 37.78, 29.09), ("Diyarbakır", 37.91, 40.24), ("Edirne", 41.68, 26.56), ("Elazığ", 38.68, 39.22),
+    ("Erzincan", 39.75, 39.49), ("Erzurum", 39.90, 41.27), ("Eskişehir", 39.78, 30.52),
+    ("Gaziantep", 37.07, 37.38), ("Giresun", 40.91, 38.39), ("Gümüşhane", 40.46, 39.48),
+    ("Hakkari", 37.58, 43.74), ("Hatay", 36.20, 36.16), ("Isparta", 37.76, 30.55), ("Mersin", 36.81, 34.64),
+    ("İstanbul", 41.01, 28.98), ("İzmir", 38.42, 27.14), ("Kars", 40.60, 43.10), ("Kastamonu", 41.39, 33.78),
+    ("Kayseri", 38.73, 35.49), ("Kırklareli", 41.73, 27.22), ("Kırşehir", 39.15, 34.16),
+    ("Kocaeli", 40.77, 29.92), ("Konya", 37.87, 32.48), ("Kütahya", 39.42, 29.98), ("Malatya", 38.35, 38.31),
+    ("Manisa", 38.61, 27.43), ("Kahramanmaraş", 37.58, 36.94), ("Mardin", 37.31, 40.74),
+    ("Muğla", 37.22, 28.36), ("Muş", 38.74, 41.49), ("Nevşehir", 38.62, 34.71), ("Niğde", 37.97, 34.68),
+    ("Ordu", 40.98, 37.88), ("Rize", 41.03, 40.52), ("Sakarya", 40.78, 30.40), ("Samsun", 41.29, 36.33),
+    ("Siirt", 37.93, 41.94), ("Sinop", 42.03, 35.15), ("Sivas", 39.75, 37.02), ("Tekirdağ", 40.98, 27.51),
+    ("Tokat", 40.31, 36.55), ("Trabzon", 41.00, 39.72), ("Tunceli", 39.11, 39.55), ("Şanlıurfa", 37.16, 38.79),
+    ("Uşak", 38.68, 29.41), ("Van", 38.49, 43.38), ("Yozgat", 39.82, 34.81), ("Zonguldak", 41.46, 31.79),
+    ("Aksaray", 38.37, 34.03), ("Bayburt", 40.26, 40.23), ("Karaman", 37.18, 33.22),
+    ("Kırıkkale", 39.85, 33.51), ("Batman", 37.88, 41.13), ("Şırnak", 37.52, 42.46), ("Bartın", 41.63, 32.34),
+    ("Ardahan", 41.11, 42.70), ("Iğdır", 39.92, 44.05), ("Yalova", 40.66, 29.28), ("Karabük", 41.20, 32.62),
+    ("Kilis", 36.72, 37.12), ("Osmaniye", 37.07, 36.25), ("Düzce", 40.84, 31.16)
+)
+PLACE_ALIASES = {"antakya": "Hatay", "izmit": "Kocaeli", "adapazarı": "Sakarya", "urfa": "Şanlıurfa",
+                 "maraş": "Kahramanmaraş", "afyon": "Afyonkarahisar", "antep": "Gaziantep", "içel": "Mersin"}
+# Kesme işaretsiz yazılan hal ekleri ("ankarada", "izmirdeki"); uzundan kısaya denenir
+PLACE_SUFFIXES = ('daki', 'deki', 'taki', 'teki', 'dan', 'den', 'tan', 'ten', 'nin', 'nun', 'da', 'de',
+                  'ta', 'te', 'ya', 'ye', 'in', 'un')
+TURKISH_FOLD = str.maketrans({'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u', 'â': 'a', 'î': 'i',
+                              'û': 'u'})
+# WMO hava kodu → Türkçe durum
+WEATHER_CODES = {0: "açık", 1: "az bulutlu", 2: "parçalı bulutlu", 3: "kapalı", 45: "sisli", 48: "kırağılı sis",
+                 51: "hafif çisenti", 53: "çisenti", 55: "yoğun çisenti", 61: "hafif yağmurlu", 63: "yağmurlu",
+                 65: "şiddetli yağmurlu", 71: "hafif karlı", 73: "karlı", 75: "yoğun karlı", 77: "kar taneli",
+                 80: "sağanak", 81: "kuvvetli sağanak", 82: "şiddetli sağanak", 85: "kar sağanaklı",
+                 86: "yoğun kar sağanaklı", 95: "gök gürültülü fırtına", 96: "dolulu fırtına",
+                 99: "şiddetli dolulu fırtına"}
+# Hava durumu sorgularında yer adı olarak denenmeyen kelimeler (katlanmış)
+WEATHER_STOPWORDS = frozenset({'hava', 'durumu', 'weather', 'nasil', 'bugun', 'yarin', 've', 'icin', 'ne',
+                               'sehir', 'sehirler', 'in', 'the', 'for', 'and'})
+
+Place = namedtuple('Place', ['name', 'lat', 'lon', 'country', 'population'])
+Forecast = namedtuple('Forecast', ['place', 'temperature', 'humidity', 'wind', 'code', 'fetched_at', 'stale'])
+
+def turkish_fold(text):
+    """Türkçe kurallarla büyük/küçük harf ve aksan katlama ("İZMİR", "Izmir", "izmir" → "izmir")"""
+    return text.replace('I', 'ı').replace('İ', 'i').lower().translate(TURKISH_FOLD)
+
+class Gazetteer:
+    """Yer adlarını katlanmış kelime dizileri üzerinden bir trie'de tutan yer sözlüğü
+
+    Sorgu kelimeler boyunca bir kez taranır; her konumda trie'de en uzun eşleşme aranır
+    ("new york", "kahramanmaraş"). Aynı ada sahip yerlerden nüfusu büyük olan kalır.
+    """
+    _END = object()
+
+    def __init__(self, stopwords=WEATHER_STOPWORDS):
+        self.root = {}
+        self.count = 0
+        self.stopwords = stopwords
+
+    def add(self, name, place):
+        tokens = re.findall(r'\w+', turkish_fold(name))
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        current = node.get(self._END)
+        if current is None:
+            self.count += 1
+        if current is None or (place.population or 0) > (current.population or 0):
+            node[self._END] = place
+
+    @classmethod
+    def load(cls, path=None):
+        """Yerleşik il listesi ve varsa path'teki yer dosyası
+
+        Dosya GeoNames biçiminde (cities15000.txt gibi) veya 'ad<TAB>enlem<TAB>boylam[<TAB>ülke
+        <TAB>nüfus]' satırlarından oluşabilir.
+        """
+        gazetteer = cls()
+        by_name = {}
+        for name, lat, lon in BUILTIN_PLACES:
+            place = by_name[name] = Place(name, lat, lon, "TR", None)
+            gazetteer.add(name, place)
+        for alias, name in PLACE_ALIASES.items():
+            gazetteer.add(alias, by_name[name])
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    fields = line.rstrip('\n').split('\t')
+                    try:
+                        if len(fields) >= 15:  # GeoNames: ad, ascii ad, ..., enlem, boylam, ..., ülke, ..., nüfus
+                            place = Place(fields[1], float(fields[4]), float(fields[5]), fields[8],
+                                          int(fields[14] or 0))
+                            gazetteer.add(fields[1], place)
+                            gazetteer.add(fields[2], place)
+                        elif len(fields) >= 3:
+                            place = Place(fields[0], float(fields[1]), float(fields[2]),
+                                          fields[3] if len(fields) > 3 else None,
+                                          int(fields[4]) if len(fields) > 4 and fields[4] else None)
+                            gazetteer.add(fields[0], place)
+                    except ValueError:
+                        continue
+        return gazetteer
+
+    def _lookup(self, node, token):
+        child = node.get(token)
+        if child is not None:
+            return child
+        for suffix in PLACE_SUFFIXES:
+            if token.endswith(suffix) and len(token) > len(suffix) + 1:
+                child = node.get(token[:-len(suffix)])
+                if child is not None:
+                    return child
+        return None
+
+    def find_all(self, text, limit=None):
+        """Metindeki yerleri sırayla döndür (tekrarsız, en uzun eşleşme)"""
+        tokens = re.findall(r'\w+', turkish_fold(text))
+        found = []
+        i = 0
+        while i < len(tokens) and (limit is None or len(found) < limit):
+            if tokens[i] in self.stopwords:
+                i += 1
+                continue
+            node, match, end = self.root, None, i
+            for j in range(i, len(tokens)):
+                node = self._lookup(node, tokens[j])
+                if node is None:
+                    break
+                if self._END in node:
+                    match, end = node[self._END], j + 1
+            if match is not None:
+                if match not in found:
+                    found.append(match)
+                i = end
+            else:
+                i += 1
+        return found
+
+    def find(self, text):
+        found = self.find_all(text, limit=1)
+        return found[0] if found else None
+
+class WeatherUnavailable(Exception):
+    """Sağlayıcıya ulaşılamadı ve önbellekte veri yok"""
+
+class WeatherCache:
+    """Koordinat anahtarlı tahmin önbelleği: bellekte sözlük, diskte SQLite (yeniden başlatmada sıcak)"""
+    def __init__(self, path):
+        self.path = path
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=wal")
+        self._conn.execute("PRAGMA synchronous=normal")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS forecasts (
+                key TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key):
+        """(veri sözlüğü, alınma zamanı) ya da None; süresi dolmuş kayıtlar da döner"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            row = self._conn.execute("SELECT payload, fetched_at FROM forecasts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = self._memory[key] = (json.loads(row[0]), row[1])
+        return entry
+
+    def put(self, key, data, fetched_at):
+        self._memory[key] = (data, fetched_at)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO forecasts (key, fetched_at, payload) VALUES (?, ?, ?)",
+                               (key, fetched_at, json.dumps(data)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class WeatherProvider:
+    """Open-Meteo uyumlu tahmin sağlayıcısı
+
+    Bağlantılar keep-alive'lı tek bir requests.Session havuzunda paylaşılır; aynı konum için
+    uçuştaki istekler birleştirilir (ikinci çağıran ilkinin sonucunu bekler). Taze kayıtlar
+    önbellekten döner; sağlayıcıya ulaşılamazsa eski kayıt 'stale' işaretiyle kullanılır.
+    """
+    def __init__(self, cache, base_url="https://api.open-meteo.com", ttl=600, workers=16, timeout=5):
+        self.cache = cache
+        self.base_url = base_url.rstrip('/')
+        self.ttl = ttl
+        self.workers = workers
+        self.timeout = timeout
+        self._session = None
+        self._coalescer = RequestCoalescer()
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = pooled_session(self.workers)
+        return self._session
+
+    @staticmethod
+    def key(place):
+        return f"{place.lat:.2f},{place.lon:.2f}"
+
+    def _forecast(self, place, data, fetched_at, stale):
+        return Forecast(place, data.get('temperature_2m'), data.get('relative_humidity_2m'),
+                        data.get('wind_speed_10m'), data.get('weather_code'), fetched_at, stale)
+
+    def fresh(self, place):
+        """Önbellekte süresi dolmamış tahmin varsa döndür"""
+        entry = self.cache.get(self.key(place))
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            return self._forecast(place, entry[0], entry[1], False)
+        return None
+
+    def forecast(self, place):
+        """Tek konumun tahmini (önbellek → uçuştaki istek → ağ → eski kayıt)"""
+        key = self.key(place)
+        entry = self.cache.get(key)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            return self._forecast(place, entry[0], entry[1], False)
+        return self._forecast(place, *self._coalescer.run(key, self._fetch, place, key, entry))
+
+    def _fetch(self, place, key, entry):
+        params = {'latitude': f"{place.lat:.4f}", 'longitude': f"{place.lon:.4f}",
+                  'current': 'temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m',
+                  'timezone': 'auto'}
+        try:
+            with self._lock:
+                self.requests_sent += 1
+            response = self.session.get(f"{self.base_url}/v1/forecast", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()['current']
+        except (requests.RequestException, ValueError, KeyError) as e:
+            if entry is not None:
+                logger.debug(f"Hava durumu alınamadı ({place.name}), önbellekteki veri kullanılıyor: {e}")
+                return entry[0], entry[1], True
+            raise WeatherUnavailable(f"{place.name}: {e}") from e
+        fetched_at = time.time()
+        self.cache.put(key, data, fetched_at)
+        return data, fetched_at, False
+
+    def forecast_many(self, places):
+        """Konumları paralel sorgula; (yer, tahmin veya hata) listesi, girdi sırasında"""
+        def one(place):
+            try:
+                return place, self.forecast(place)
+            except WeatherUnavailable as e:
+                return place, e
+        # Taze kayıtlar havuza gitmeden yanıtlanır
+        results = [(place, self.fresh(place)) for place in places]
+        missing = [i for i, (_, forecast) in enumerate(results) if forecast is None]
+        if len(missing) <= 1:
+            for i in missing:
+                results[i] = one(places[i])
+            return results
+        with ThreadPoolExecutor(min(self.workers, len(missing)), thread_name_prefix="quantumia-weather") as executor:
+            for i, result in zip(missing, executor.map(one, [places[i] for i in missing])):
+                results[i] = result
+        return results
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+# -------------------- VİKİPEDİ --------------------
+WIKI_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY,
+        lang TEXT NOT NULL,
+        key TEXT NOT NULL,
+        title TEXT NOT NULL,
+        url TEXT,
+        codec TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        summary BLOB NOT NULL,
+        fetched_at REAL NOT NULL,
+        UNIQUE (lang, key)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS aliases (
+        lang TEXT NOT NULL,
+        key TEXT NOT NULL,
+        article_id INTEGER NOT NULL,
+        PRIMARY KEY (lang, key)
+    ) WITHOUT ROWID
+    '''
+]
+
+WIKI_FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    '''
+]
+
+WIKI_UPSERT = '''
+    INSERT INTO articles (lang, key, title, url, codec, size, summary, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (lang, key) DO UPDATE SET
+        title = excluded.title, url = excluded.url, codec = excluded.codec, size = excluded.size,
+        summary = excluded.summary, fetched_at = excluded.fetched_at
+'''
+
+# Sorgudan konu çıkarılırken silinen tetikleyiciler ve soru kalıpları
+WIKI_TRIGGERS = re.compile(r"\b(?:nedir|kimdir|ne demek(?:tir)?|what is|who is|vikipedi(?:'?de)?|wikipedia|"
+                           r"hakkında)\b", re.IGNORECASE)
+
+WikiArticle = namedtuple('WikiArticle', ['lang', 'title', 'summary', 'url', 'fetched_at', 'source'])
+
+def wiki_key(title):
+    """Başlığı önbellek anahtarına çevir ("İstanbul_Boğazı" → "istanbul bogazi")"""
+    return ' '.join(turkish_fold(title.replace('_', ' ')).split())
+
+def wiki_title(topic):
+    """Konuyu Vikipedi başlık biçimine getir (ilk harf Türkçe kurallarla büyük)"""
+    topic = ' '.join(topic.split())
+    if not topic:
+        return topic
+    first = {'i': 'İ', 'ı': 'I'}.get(topic[0], topic[0].upper())
+    return first + topic[1:]
+
+def wiki_codec():
+    """Kullanılabilir en iyi sıkıştırma: zstandard kuruluysa zstd, değilse zlib"""
+    try:
+        zstd.ZstdCompressor
+        return 'zstd'
+    except ImportError:
+        return 'zlib'
+
+def wiki_compress(text, codec):
+    data = text.encode('utf-8')
+    if codec == 'zstd':
+        return zstd.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+def wiki_decompress(blob, codec):
+    if codec == 'zstd':
+        return zstd.ZstdDecompressor().decompress(blob).decode('utf-8')
+    return zlib.decompress(blob).decode('utf-8')
+
+class WikiCache:
+    """Sıkıştırılmış Vikipedi özetlerinin SQLite önbelleği
+
+    Özetler satır başına kayıtlı codec (zstd/zlib) ile saklanır; eski kayıtlar codec
+    değişse de okunabilir. Başlıklar FTS5 ile aranır, yönlendirmeler (ör. "atatürk" →
+    "Mustafa Kemal Atatürk") aliases tablosunda tutulur.
+    """
+    def __init__(self, path, codec=None):
+        self.path = path
+        self.codec = codec or wiki_codec()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=wal")
+        self._conn.execute("PRAGMA synchronous=normal")
+        with self._conn:
+            for statement in WIKI_SCHEMA:
+                self._conn.execute(statement)
+        try:
+            with self._conn:
+                for statement in WIKI_FTS_SCHEMA:
+                    self._conn.execute(statement)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 kullanılamıyor, Vikipedi başlık araması kapalı: {e}")
+            self.fts = False
+
+    def _article(self, lang, row, source):
+        title, url, codec, summary, fetched_at = row
+        return WikiArticle(lang, title, wiki_decompress(summary, codec), url, fetched_at, source)
+
+    def get(self, lang, key):
+        """Anahtar veya yönlendirme ile tam eşleşen kayıt (yoksa None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, url, codec, summary, fetched_at FROM articles WHERE lang = ? AND key = ?",
+                (lang, key)).fetchone()
+            if row is None:
+                row = self._conn.execute('''
+                    SELECT a.title, a.url, a.codec, a.summary, a.fetched_at
+                    FROM aliases w JOIN articles a ON a.id = w.article_id
+                    WHERE w.lang = ? AND w.key = ?
+                ''', (lang, key)).fetchone()
+        return self._article(lang, row, 'cache') if row else None
+
+    def search(self, lang, text, limit=5):
+        """Başlığı FTS5 ile ara; (başlık, anahtar) listesi, en iyi eşleşme önce"""
+        if not self.fts or not fts_query(text):
+            return []
+        with self._lock:
+            return self._conn.execute('''
+                SELECT a.title, a.key FROM articles_fts f JOIN articles a ON a.id = f.rowid
+                WHERE articles_fts MATCH ? AND a.lang = ? ORDER BY rank LIMIT ?
+            ''', (fts_query(text), lang, limit)).fetchall()
+
+    def _row(self, lang, title, summary, url, fetched_at):
+        blob = wiki_compress(summary, self.codec)
+        return (lang, wiki_key(title), title, url, self.codec, len(summary), blob, fetched_at)
+
+    def put(self, lang, title, summary, url=None, fetched_at=None, aliases=()):
+        """Tek özeti yaz; aliases anahtarları da bu kayda yönlenir"""
+        row = self._row(lang, title, summary, url, fetched_at or time.time())
+        with self._lock, self._conn:
+            self._conn.execute(WIKI_UPSERT, row)
+            article_id = self._conn.execute("SELECT id FROM articles WHERE lang = ? AND key = ?",
+                                            (lang, row[1])).fetchone()[0]
+            self._conn.executemany("INSERT OR REPLACE INTO aliases (lang, key, article_id) VALUES (?, ?, ?)",
+                                   [(lang, key, article_id) for key in aliases if key != row[1]])
+
+    def put_many(self, lang, items, fetched_at=None):
+        """(başlık, özet, url) kayıtlarını tek işlemde yaz; yazılan sayıyı döndür"""
+        fetched_at = fetched_at or time.time()
+        rows = [self._row(lang, title, summary, url, fetched_at) for title, summary, url in items]
+        with self._lock, self._conn:
+            self._conn.executemany(WIKI_UPSERT, rows)
+        return len(rows)
+
+    def contains(self, lang, key):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM articles WHERE lang = ? AND key = ?",
+                                      (lang, key)).fetchone() is not None
+
+    def stats(self):
+        """Dil başına (kayıt sayısı, özgün bayt, sıkıştırılmış bayt)"""
+        with self._lock:
+            return self._conn.execute('''
+                SELECT lang, COUNT(*), SUM(size), SUM(LENGTH(summary)) FROM articles GROUP BY lang
+            ''').fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def iter_wiki_dump(path):
+    """Döküm dosyasından (başlık, özet, url) kayıtlarını akış halinde oku
+
+    JSONL (title + extract/abstract/summary alanları) veya Vikipedi özet XML dökümü
+    (*-abstract.xml) desteklenir; ikisi de .gz sıkıştırılmış olabilir. XML iterparse ile
+    okunur ve işlenen <doc> öğeleri silinir, bellek kullanımı dosya boyutundan bağımsızdır.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    if path.endswith(('.xml', '.xml.gz')):
+        with opener(path, 'rb') as f:
+            context = ET.iterparse(f, events=('start', 'end'))
+            _, root = next(context)
+            for event, elem in context:
+                if event != 'end' or elem.tag != 'doc':
+                    continue
+                title = elem.findtext('title') or ''
+                if ': ' in title:  # "Vikipedi: Ankara"
+                    title = title.split(': ', 1)[1]
+                summary = (elem.findtext('abstract') or '').strip()
+                if title and summary:
+                    yield title, summary, elem.findtext('url')
+                root.clear()
+        return
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            title = record.get('title')
+            summary = record.get('extract') or record.get('abstract') or record.get('summary')
+            if title and summary:
+                yield title, summary.strip(), record.get('url')
+
+class WikiLookup:
+    """Çevrimdışı öncelikli Vikipedi özet araması
+
+    Sıra: önbellekte tam eşleşme/yönlendirme → FTS5 başlık eşleşmesi → REST özet uç noktası.
+    Ağ istekleri keep-alive havuzunu paylaşır ve aynı başlık için birleştirilir. Ağdan gelen
+    her maddenin bağlantıları arka planda önceden çekilir; süresi geçmiş kayıtlar hemen
+    döner ve arka planda yenilenir. Bulunamayan başlıklar `missing_ttl` saniye yeniden
+    sorulmaz; bu liste en fazla `missing_limit` kayıt tutar (en eskisi atılır).
+    """
+    def __init__(self, cache, base_url="https://{lang}.wikipedia.org", lang='tr', prefetch=10,
+                 refresh_days=30, workers=4, timeout=5, missing_ttl=3600, missing_limit=10000):
+        self.cache = cache
+        self.base_url = base_url.rstrip('/')
+        self.lang = lang
+        self.prefetch = prefetch
+        self.refresh_after = refresh_days * 86400
+        self.workers = workers
+        self.timeout = timeout
+        self._session = None
+        self._coalescer = RequestCoalescer()
+        self._background = ThreadPoolExecutor(2, thread_name_prefix="quantumia-wiki")
+        self.missing_ttl = missing_ttl
+        self.missing_limit = missing_limit
+        self._missing = OrderedDict()  # Bulunamayan başlıklar: (dil, anahtar) → zaman, eskiden yeniye
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = pooled_session(self.workers)
+        return self._session
+
+    def _base(self, lang):
+        return self.base_url.format(lang=lang)
+
+    def _sent(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def _miss(self, lang, key):
+        """Başlığı bulunamadı olarak işaretle; süresi dolan ve sınırı aşan en eski kayıtları at"""
+        now = time.time()
+        with self._lock:
+            self._missing[(lang, key)] = now
+            self._missing.move_to_end((lang, key))
+            while self._missing:
+                oldest = next(iter(self._missing.values()))
+                if len(self._missing) <= self.missing_limit and now - oldest < self.missing_ttl:
+                    break
+                self._missing.popitem(last=False)
+
+    def _missed(self, lang, key):
+        """Başlık son missing_ttl saniyede bulunamadıysa True"""
+        with self._lock:
+            missed_at = self._missing.get((lang, key))
+            if missed_at is None:
+                return False
+            if time.time() - missed_at < self.missing_ttl:
+                return True
+            del self._missing[(lang, key)]
+            return False
+
+    def lookup(self, topic, lang=None, fetch=True):
+        """Konunun özeti (WikiArticle) ya da None"""
+        lang = lang or self.lang
+        key = wiki_key(topic)
+        if not key:
+            return None
+        article = self.cache.get(lang, key)
+        if article is None:
+            # Önbellekte başlığın anlam ayrımlı biçimi: "Ankara" → "Ankara (il)"
+            for title, found in self.cache.search(lang, topic):
+                if re.sub(r'\s*\(.*\)$', '', found) == key:
+                    article = self.cache.get(lang, found)
+                    break
+        if article is not None:
+            if fetch and time.time() - article.fetched_at > self.refresh_after:
+                self._background.submit(self._refresh, topic, lang)
+            return article
+        if not fetch or self._missed(lang, key):
+            return None
+        article = self._coalescer.run((lang, key), self._fetch, topic, lang)
+        if article is not None and self.prefetch:
+            self._background.submit(self.prefetch_links, article.title, lang)
+        return article
+
+    def _refresh(self, topic, lang):
+        try:
+            self._coalescer.run((lang, wiki_key(topic)), self._fetch, topic, lang)
+        except Exception as e:
+            logger.debug(f"Vikipedi yenileme hatası ({topic}): {e}")
+
+    def _fetch(self, topic, lang):
+        """REST özet uç noktasından çek ve önbelleğe yaz; bulunamazsa/ulaşılamazsa None"""
+        title = wiki_title(topic).replace(' ', '_')
+        url = f"{self._base(lang)}/api/rest_v1/page/summary/{quote(title, safe='')}"
+        try:
+            self._sent()
+            response = self.session.get(url, timeout=self.timeout)
+            if response.status_code == 404:
+                self._miss(lang, wiki_key(topic))
+                return None
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"Vikipedi'ye ulaşılamadı ({topic}): {e}")
+            return None
+        summary = (data.get('extract') or '').strip()
+        if not summary or data.get('type') == 'disambiguation':
+            self._miss(lang, wiki_key(topic))
+            return None
+        canonical = data.get('title') or topic
+        page = (data.get('content_urls') or {}).get('desktop', {}).get('page')
+        fetched_at = time.time()
+        self.cache.put(lang, canonical, summary, page, fetched_at, aliases=[wiki_key(topic)])
+        return WikiArticle(lang, canonical, summary, page, fetched_at, 'network')
+
+    def links(self, title, lang=None, limit=None):
+        """Maddenin (ana ad alanındaki) bağlantılı başlıkları"""
+        params = {'action': 'query', 'prop': 'links', 'titles': title, 'plnamespace': 0,
+                  'pllimit': limit or self.prefetch, 'format': 'json', 'formatversion': 2}
+        try:
+            self._sent()
+            response = self.session.get(f"{self._base(lang or self.lang)}/w/api.php", params=params,
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            pages = response.json()['query']['pages']
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.debug(f"Vikipedi bağlantıları alınamadı ({title}): {e}")
+            return []
+        return [link['title'] for page in pages for link in page.get('links', [])]
+
+    def prefetch_links(self, title, lang=None):
+        """Bağlantılı maddelerden önbellekte olmayanları sırayla çek; çekilen sayıyı döndür"""
+        lang = lang or self.lang
+        fetched = 0
+        for link in self.links(title, lang):
+            key = wiki_key(link)
+            if self.cache.contains(lang, key) or self._missed(lang, key):
+                continue
+            if self._coalescer.run((lang, key), self._fetch, link, lang) is not None:
+                fetched += 1
+        return fetched
+
+    def import_dump(self, path, lang=None, batch=2000, progress=None):
+        """Döküm dosyasını toplu işlemlerle önbelleğe aktar; aktarılan kayıt sayısını döndür"""
+        lang = lang or self.lang
+        count = 0
+        fetched_at = time.time()
+        rows = iter_wiki_dump(path)
+        while True:
+            items = list(itertools.islice(rows, batch))
+            if not items:
+                break
+            count += self.cache.put_many(lang, items, fetched_at)
+            if progress:
+                progress(count)
+            if job_cancelled():
+                logger.info(f"Vikipedi aktarımı iptal edildi ({count} kayıt)")
+                break
+        return count
+
+    def close(self):
+        self._background.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+
+# -------------------- İŞ YÖNETİCİSİ --------------------
+_job_context = threading.local()
+
+def current_job():
+    """Bu iş parçacığında çalışan işi döndür (yoksa None)"""
+    return getattr(_job_context, 'job', None)
+
+def job_cancelled():
+    """Çalışan iş iptal edildiyse True (uzun işleyiciler ara ara kontrol eder)"""
+    job = current_job()
+    return job is not None and job.cancel_event.is_set()
+
+def report_progress(text):
+    """Çalışan işin /jobs'ta görünen ilerleme metnini güncelle (iş dışında yok sayılır)"""
+    job = current_job()
+    if job is not None:
+        job.progress = text
+
+def cancellable_sleep(seconds, step=0.1):
+    """İptal edilince erken dönen uyku; iptal edildiyse True döndürür"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if job_cancelled():
+            return True
+        time.sleep(min(step, max(0.0, deadline - time.monotonic())))
+    return job_cancelled()
+
+class Job:
+    """Arka planda çalışan tek bir işleyici çağrısı"""
+    __slots__ = ('id', 'name', 'kind', 'state', 'started', 'finished', 'task', 'cancel_event', 'progress')
+
+    def __init__(self, job_id, name, kind):
+        self.id = job_id
+        self.name = name
+        self.kind = kind
+        self.state = "bekliyor"
+        self.started = time.monotonic()
+        self.finished = None
+        self.task = None
+        self.cancel_event = threading.Event()
+        self.progress = None  # Uzun işlerin /jobs'ta gösterilen son durumu
+
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+class JobManager:
+    """İşleri türüne göre G/Ç veya CPU havuzunda çalıştıran asyncio tabanlı yönetici"""
+    def __init__(self, loop, io_workers=32, cpu_workers=None):
+        self.loop = loop
+        # İşleyiciler asistanın durumuna bağlı metotlar olduğundan CPU havuzu da iş parçacığı
+        # havuzudur; hashlib/zlib gibi ağır işler GIL'i bırakır.
+        self.executors = {
+            JOB_IO: ThreadPoolExecutor(io_workers, thread_name_prefix="quantumia-io"),
+            JOB_CPU: ThreadPoolExecutor(cpu_workers or os.cpu_count() or 2, thread_name_prefix="quantumia-cpu")
+        }
+        self.jobs = OrderedDict()
+        self._next_id = 1
+        self.history_limit = 50
+
+    def submit(self, name, func, kind=JOB_IO, on_done=None):
+        """İşi başlat; on_done(job, sonuç, hata) olay döngüsünde çağrılır"""
+        job = Job(self._next_id, name, kind)
+        self._next_id += 1
+        self.jobs[job.id] = job
+
+        async def runner():
+            return await self.loop.run_in_executor(self.executors[kind], self._call, job, func)
+
+        job.task = self.loop.create_task(runner())
+        job.task.add_done_callback(lambda task: self._finished(job, task, on_done))
+        return job
+
+    def _call(self, job, func):
+        if job.cancel_event.is_set():
+            return None
+        job.state = "çalışıyor"
+        _job_context.job = job
+        try:
+            with metrics.timer('job', job.name):
+                return func()
+        finally:
+            _job_context.job = None
+
+    def _finished(self, job, task, on_done):
+        job.finished = time.monotonic()
+        result, error = None, None
+        if task.cancelled() or job.cancel_event.is_set():
+            job.state = "iptal edildi"
+        elif task.exception():
+            job.state = "hata"
+            error = task.exception()
+            logger.error(f"İş #{job.id} ({job.name}) hatası: {error}")
+        else:
+            job.state = "tamamlandı"
+            result = task.result()
+        self._trim()
+        if on_done and job.state != "iptal edildi":
+            on_done(job, result, error)
+
+    def _trim(self):
+        """Biten eski işleri listeden düşür"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history_limit)]:
+            del self.jobs[job_id]
+
+    def cancel(self, job_id):
+        """İşi iptal et (başlamadıysa hiç çalışmaz, çalışıyorsa işbirlikçi olarak durur)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        job.task.cancel()
+        return True
+
+    def active(self):
+        return [job for job in self.jobs.values() if not job.finished]
+
+    def shutdown(self):
+        """Tüm işleri iptal et ve havuzları kapat"""
+        for job in self.active():
+            self.cancel(job.id)
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# -------------------- TOPLU MOD --------------------
+BATCH_QUERY_FIELDS = ('query', 'text', 'input', 'message')
+
+def iter_batch_queries(lines):
+    """Satır satır düz metin veya JSONL sorguları (etiket, sorgu, hata) olarak üret
+
+    JSON nesnelerinde sorgu BATCH_QUERY_FIELDS alanlarından birinde, isteğe bağlı etiket
+    'id' alanındadır. Tırnakla başlayıp JSON dizgisi olmayan satırlar ('"Ankara" nedir')
+    düz metin sayılır. Boş satırlar atlanır.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] not in '{"':
+            yield None, line, None
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            if line[0] == '"':
+                yield None, line, None
+            else:
+                yield None, None, f"geçersiz JSON: {e}"
+            continue
+        if isinstance(item, str):
+            yield None, item, None
+            continue
+        tag = item.get('id') if isinstance(item, dict) else None
+        query = next((item[field] for field in BATCH_QUERY_FIELDS
+                      if isinstance(item, dict) and isinstance(item.get(field), str)), None)
+        yield (tag, query, None) if query else (tag, None, "sorgu alanı yok")
+
+# -------------------- HTTP SUNUCUSU --------------------
+LOOPBACK_HOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+def request_host(value):
+    """Host başlığındaki ana makine adı (küçük harf, port ve IPv6 köşeli parantezleri atılmış)"""
+    if not value:
+        return None
+    try:
+        return urlparse(f"//{value.strip()}").hostname
+    except ValueError:
+        return None
+
+def is_loopback(host):
+    """Adres yalnızca bu makineden erişilebilir mi (localhost, 127.0.0.0/8, ::1)"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class QuantumiaServer(ThreadingHTTPServer):
+    """Niyet hattını yerel HTTP/JSON üzerinden sunan çok iş parçacıklı sunucu
+
+    Her istemci kendi oturumunu (kullanıcı adı, geçmiş, ruh hali) alır; yönlendirici,
+    önbellekler, anlamsal dizin ve SQLite bağlantı havuzu oturumlar arasında paylaşılır.
+    Host başlığı allowed_hosts listesinde olmayan istekler (DNS rebinding) reddedilir;
+    token verilmişse /health dışındaki her istek 'Authorization: Bearer <token>' taşımalıdır.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024  # varsayılan 5, eşzamanlı bağlantı patlamalarında SYN'ler düşer
+
+    def __init__(self, address, ai, session_ttl=3600, max_sessions=10000, token=None, allowed_hosts=()):
+        super().__init__(address, QuantumiaRequestHandler)
+        self.ai = ai
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.token = token
+        self.allowed_hosts = set(LOOPBACK_HOSTS) | {host.lower() for host in allowed_hosts}
+        host = address[0].lower()
+        if host in ('', '0.0.0.0', '::'):
+            # Tüm arayüzler: makinenin adı ve yerel IP'si de kabul edilir
+            self.allowed_hosts |= {socket.gethostname().lower(), local_ip()}
+        else:
+            self.allowed_hosts.add(host)
+        self.sessions = OrderedDict()
+        self._sessions_lock = threading.Lock()
+
+    def session(self, session_id=None, user_name=None, create=True):
+        """Oturumu bul (LRU sırasını güncelle) ya da yenisini aç"""
+        now = time.monotonic()
+        with self._sessions_lock:
+            session = self.sessions.get(session_id) if session_id else None
+            if session is not None and now - session.last_seen > self.session_ttl:
+                del self.sessions[session_id]
+                session = None
+            if session is None:
+                if not create:
+                    return None
+                session = self.ai.new_session(user_name)
+                self.sessions[session.session_id] = session
+                while len(self.sessions) > self.max_sessions:
+                    self.sessions.popitem(last=False)
+            else:
+                self.sessions.move_to_end(session_id)
+                if user_name:
+                    session.user_name = user_name
+            session.last_seen = now
+            return session
+
+    def close_session(self, session_id):
+        with self._sessions_lock:
+            return self.sessions.pop(session_id, None) is not None
+
+def session_info(session):
+    """Oturumun JSON gösterimi"""
+    return {
+        'session': session.session_id,
+        'user_name': session.user_name,
+        'mood': session.mood,
+        'history': [{'time': turn.time.isoformat(timespec='seconds'), 'query': turn.user_input,
+                     'response': turn.response, 'category': turn.category}
+                    for turn in session.history.recent()]
+    }
+
+class QuantumiaRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 (keep-alive) JSON uç noktaları
+
+    POST /chat           {"query", "session"?, "user_name"?} -> yanıt
+    POST /chat/stream    aynı gövde; ara çıktılar ve yanıt NDJSON olarak parça parça akar
+    POST /sessions       {"user_name"?} -> yeni oturum
+    GET  /sessions/<id>  oturum bilgisi ve geçmişi; DELETE ile kapatılır
+    GET  /health, GET /metrics (Prometheus metin biçimi)
+
+    POST gövdeleri 'Content-Type: application/json' olmalıdır; tarayıcıların ön kontrolsüz
+    gönderebildiği text/plain ve form gövdeleri 415 ile reddedilir.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "Quantumia/5.0"
+    disable_nagle_algorithm = True
+    max_body = 1024 * 1024
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def send_json(self, status, payload, headers=()):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reject(self, status, error, headers=()):
+        """Hata yanıtı gönder ve bağlantıyı kapat (okunmamış gövde sonraki isteğe karışmasın)"""
+        self.close_connection = True
+        self.send_json(status, {'error': error}, [*headers, ('Connection', 'close')])
+
+    def authorize(self, path):
+        """Host izin listesini ve erişim anahtarını doğrula; reddedilirse yanıtlayıp False döndür"""
+        if request_host(self.headers.get('Host')) not in self.server.allowed_hosts:
+            self.reject(403, 'izin verilmeyen Host başlığı')
+            return False
+        token = self.server.token
+        if token and path != '/health':
+            given = self.headers.get('Authorization', '')
+            if not secrets.compare_digest(given.encode('utf-8'), f"Bearer {token}".encode('utf-8')):
+                self.reject(401, 'geçersiz veya eksik erişim anahtarı', [('WWW-Authenticate', 'Bearer')])
+                return False
+        return True
+
+    def read_json(self):
+        """İstek gövdesini JSON nesnesi olarak oku; hatalıysa 4xx gönderip None döndür"""
+        content_type = (self.headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+        if content_type != 'application/json':
+            self.reject(415, "Content-Type: application/json gerekli")
+            return None
+        try:
+            header = self.headers.get('Content-Length')
+            length = int(header) if header is not None else 0
+            if length < 0:
+                raise ValueError(header)
+        except ValueError:
+            self.reject(400, 'geçersiz Content-Length')
+            return None
+        if length > self.max_body:
+            self.reject(413, 'gövde çok büyük')
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length) if length else b'{}')
+        except ValueError as e:
+            self.send_json(400, {'error': f'geçersiz JSON: {e}'})
+            return None
+        if not isinstance(payload, dict):
+            self.send_json(400, {'error': 'JSON nesnesi bekleniyor'})
+            return None
+        return payload
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if not self.authorize(path):
+            return
+        if path == '/health':
+            self.send_json(200, {'status': 'ok', 'sessions': len(self.server.sessions)})
+        elif path == '/metrics':
+            body = metrics.to_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path.startswith('/sessions/'):
+            session = self.server.session(path[len('/sessions/'):], create=False)
+            if session is None:
+                self.send_json(404, {'error': 'oturum bulunamadı'})
+            else:
+                self.send_json(200, session_info(session))
+        else:
+            self.send_json(404, {'error': 'bilinmeyen uç nokta'})
+
+    def do_DELETE(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if not self.authorize(path):
+            return
+        if path.startswith('/sessions/') and self.server.close_session(path[len('/sessions/'):]):
+            self.send_json(200, {'closed': True})
+        else:
+            self.send_json(404, {'error': 'oturum bulunamadı'})
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if not self.authorize(path):
+            return
+        if path not in ('/chat', '/chat/stream', '/sessions'):
+            self.reject(404, 'bilinmeyen uç nokta')
+            return
+        payload = self.read_json()
+        if payload is None:
+            return
+        session = self.server.session(payload.get('session'), payload.get('user_name'))
+        if path == '/sessions':
+            self.send_json(201, session_info(session))
+            return
+        query = payload.get('query')
+        if not isinstance(query, str) or not query.strip():
+            self.send_json(400, {'error': "'query' alanı gerekli", 'session': session.session_id})
+            return
+        if path == '/chat':
+            try:
+                result = self.answer(session, query.strip())
+            except Exception as e:
+                logger.error(f"Sohbet yanıtı hatası: {e}")
+                self.send_json(500, {'error': str(e), 'session': session.session_id})
+                return
+            self.send_json(200, result)
+        else:
+            self.stream_answer(session, query.strip())
+
+    def answer(self, session, query):
+        """Sorguyu oturum bağlamında yanıtla ve geçmişe ekle"""
+        start = time.perf_counter()
+        match = session.route(query)
+        response, emotion = session.converse(query, match)
+        return {
+            'session': session.session_id,
+            'intent': match.intent if match else None,
+            'response': response,
+            'emotion': emotion,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 3)
+        }
+
+    def write_chunk(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n'
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+
+    def stream_answer(self, session, query):
+        """Parçalı aktarım: işleyicinin stream() çıktıları 'partial', sonuç 'final' olayı"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        session._local.stream_sink = lambda text: self.write_chunk({'type': 'partial', 'text': text})
+        try:
+            result = self.answer(session, query)
+            result['type'] = 'final'
+        except Exception as e:
+            logger.error(f"Akış yanıtı hatası: {e}")
+            result = {'type': 'error', 'error': str(e)}
+        finally:
+            session._local.stream_sink = None
+        self.write_chunk(result)
+        self.wfile.write(b"0\r\n\r\n")
+
+# -------------------- YAPILANDIRMA DEPOSU --------------------
+# Anlık görüntü başlığı: sihir, Python sürümü, marshal sürümü, kaynak JSON boyutu ve mtime_ns, crc32
+CONFIG_SNAPSHOT_MAGIC = b'QCFG'
+CONFIG_SNAPSHOT_HEADER = struct.Struct('<4sHBqqI')
+
+def atomic_write(path, data):
+    """Baytları geçici dosyaya yaz, fsync et ve yerine taşı; yarım yazılmış dosya kalmaz"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Yeniden adlandırmanın da çökmeden sağ çıkması için dizin girdisini diske yaz (POSIX)
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+class TrackedDict(dict):
+    """Her değişiklikte on_change() çağıran sözlük (user_data kirli izleme)"""
+    __slots__ = ('on_change',)
+
+    def __init__(self, data=(), on_change=None):
+        super().__init__(data)
+        self.on_change = on_change
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+class ConfigStore:
+    """JSON yapılandırması için kirli izleme, ertelenmiş atomik yazım ve ikili anlık görüntü
 
-# -------------------- LOGGING KONFİGÜRASYONU --------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('quantumia.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger('QuantumiaAI')
+    mark_dirty() yazımı `debounce` saniye erteler; bu arada gelen değişiklikler tek yazımda
+    birleşir, sürekli değişiklikte bile en geç `max_delay` saniyede bir yazılır. Yazılacak
+    sözlüğü `collect` geri çağrısı yazım anında üretir. user_data en az `snapshot_threshold`
+    anahtar tutuyorsa JSON'un yanına marshal biçiminde bir anlık görüntü yazılır; JSON o
+    zamandan beri değişmediyse load() onu okur (elle düzenlenen JSON her zaman önceliklidir).
+    Başarısız yazım (disk dolu, izin hatası) değişikliği düşürmez: 0.5 saniyeden başlayıp her
+    denemede ikiye katlanan, en fazla `retry_max` saniyelik aralıklarla yeniden denenir.
+    """
+    def __init__(self, path, collect, debounce=1.0, max_delay=10.0, snapshot_threshold=1000, retry_max=30.0):
+        self.path = path
+        self.snapshot_path = os.path.splitext(path)[0] + '.snapshot'
+        self.collect = collect
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.snapshot_threshold = snapshot_threshold
+        self.retry_max = retry_max
+        self.writes = 0
+        self.failures = 0
+        self._changes = 0
+        self._saved = 0
+        self._failed = 0      # Son başarısız yazımın kapsadığı değişiklik sayısı
+        self._attempts = 0
+        self._retry_delay = 0.0
+        self._retry_at = None
+        self._first_dirty = None
+        self._last_dirty = None
+        self._flush_requested = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._writer, name="quantumia-config", daemon=True)
+        self._thread.start()
+
+    def configure(self, settings):
+        """debounce / max_delay / snapshot_threshold / retry_max ayarlarını uygula"""
+        with self._cond:
+            for key in ('debounce', 'max_delay', 'snapshot_threshold', 'retry_max'):
+                if key in settings:
+                    setattr(self, key, settings[key])
+            self._cond.notify_all()
+
+    def load(self):
+        """Yapılandırmayı geçerli anlık görüntüden, yoksa JSON'dan oku (dosya yoksa None)"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        config = self._load_snapshot(st)
+        if config is None:
+            with open(self.path, 'rb') as f:
+                config = json.loads(f.read())
+        return config
+
+    def _load_snapshot(self, st):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Yapılandırma anlık görüntüsü okunamadı: {e}")
+            return None
+        try:
+            magic, python, version, size, mtime, crc = CONFIG_SNAPSHOT_HEADER.unpack_from(data)
+        except struct.error:
+            return None
+        # JSON elle değiştirildiyse veya Python sürümü değiştiyse (marshal biçimi kararlı değil) JSON'a dön
+        if (magic != CONFIG_SNAPSHOT_MAGIC or python != sys.hexversion >> 16 or version != marshal.version
+                or (size, mtime) != (st.st_size, st.st_mtime_ns)):
+            return None
+        payload = memoryview(data)[CONFIG_SNAPSHOT_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            logger.warning("Yapılandırma anlık görüntüsü bozuk, JSON kullanılıyor")
+            return None
+        try:
+            config = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            return None
+        return config if isinstance(config, dict) else None
+
+    def mark_dirty(self):
+        """Değişikliği kaydet; yazım debounce süresi sonunda arka planda yapılır"""
+        with self._cond:
+            now = time.monotonic()
+            self._changes += 1
+            self._last_dirty = now
+            if self._first_dirty is None:
+                self._first_dirty = now
+                self._cond.notify_all()
+
+    def pending(self):
+        """Henüz diske yazılmamış değişiklik sayısı"""
+        with self._cond:
+            return self._changes - self._saved
+
+    def flush(self, timeout=None):
+        """Bekleyen değişiklikleri hemen yaz; yazım başarılıysa True
+
+        Yazım başarısız olursa False döner; değişiklik bekleyen olarak kalır ve arka planda
+        yeniden denenir.
+        """
+        with self._cond:
+            target = self._changes
+            if self._saved >= target:
+                return True
+            attempts = self._attempts
+            self._flush_requested = True
+            self._cond.notify_all()
+            # Bu istekten önce başlamış, daha az değişiklik kapsayan yazımın sonucu sayılmaz
+            self._cond.wait_for(lambda: self._saved >= target
+                                or (self._attempts > attempts and self._failed >= target)
+                                or not self._thread.is_alive(), timeout)
+            return self._saved >= target
+
+    def close(self):
+        """Bekleyen değişiklikleri yaz ve yazıcı iş parçacığını durdur"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _ready(self):
+        """Yazım zamanı geldiyse 0, gelmediyse kalan süre, değişiklik yoksa None"""
+        if self._closing or self._flush_requested:
+            return 0
+        if self._changes <= self._saved:
+            return None
+        deadline = min(self._last_dirty + self.debounce, self._first_dirty + self.max_delay)
+        if self._retry_at is not None:
+            deadline = max(deadline, self._retry_at)
+        return max(0, deadline - time.monotonic())
+
+    def _writer(self):
+        """Debounce süresi dolunca, flush() istenince veya kapanışta yaz"""
+        while True:
+            with self._cond:
+                remaining = self._ready()
+                while remaining != 0:
+                    self._cond.wait(remaining)
+                    remaining = self._ready()
+                target = self._changes
+                write = target > self._saved
+                closing = self._closing
+                self._flush_requested = False
+                self._first_dirty = None
+            ok = self._save() if write else True
+            with self._cond:
+                self._attempts += 1
+                if ok:
+                    self._saved = max(self._saved, target)
+                    self._retry_delay = 0.0
+                    self._retry_at = None
+                else:
+                    # Değişiklik bekleyen olarak kalır; artan aralıklarla yeniden denenir
+                    self.failures += 1
+                    self._failed = max(self._failed, target)
+                    self._retry_delay = min(max(self._retry_delay * 2, 0.5), self.retry_max)
+                    self._retry_at = time.monotonic() + self._retry_delay
+                    if self._first_dirty is None:
+                        self._first_dirty = time.monotonic()
+                self._cond.notify_all()
+            if closing:
+                break
+
+    def _save(self):
+        """collect() çıktısını atomik olarak yaz; büyük user_data için anlık görüntüyü de yenile"""
+        try:
+            with metrics.timer('config', 'save'):
+                config = self.collect()
+                threshold = self.snapshot_threshold
+                large = threshold is not None and 0 <= threshold <= len(config.get('user_data', ()))
+                # Büyük yapılandırmada girintisiz yaz: indent=2 dökümü yavaşlatır, dosyayı şişirir
+                data = json.dumps(config, ensure_ascii=False,
+                                  indent=None if large else 2,
+                                  separators=(',', ':') if large else None).encode('utf-8')
+                atomic_write(self.path, data)
+                if large:
+                    st = os.stat(self.path)
+                    # JSON'dan geri okunan sözlük: anlık görüntü JSON ile birebir aynı türleri taşır
+                    payload = marshal.dumps(json.loads(data))
+                    header = CONFIG_SNAPSHOT_HEADER.pack(CONFIG_SNAPSHOT_MAGIC, sys.hexversion >> 16,
+                                                         marshal.version, st.st_size, st.st_mtime_ns,
+                                                         zlib.crc32(payload))
+                    atomic_write(self.snapshot_path, header + payload)
+                elif os.path.exists(self.snapshot_path):
+                    os.remove(self.snapshot_path)
+            self.writes += 1
+            return True
+        except Exception as e:
+            logger.error(f"Config kaydetme hatası: {e}")
+            return False
 
 # -------------------- AI SİSTEM AYARLARI --------------------
+STATUS_WAIT = 1.0  # İlk istemden önce arka plan durum satırı için en fazla beklenen süre (s)
+
 class QuantumiaAI:
-    def __init__(self):
+    def __init__(self, profiler=None, interactive=True):
         self.name = "Quantumia"
         self.version = "5.0"
         self.creator = "OrionixOS"
@@ -58,12 +4652,64 @@ class QuantumiaAI:
         self.user_data = {}
         self.memory_file = "ai_memory.db"
         self.config_file = "quantumia_config.json"
-        self.conversation_history = deque(maxlen=100)
+        self.responses_file = "data/responses.json"
+        self.history = None  # load_memory() içinde kurulur
+        self.response_cache = ResponseCache()
+        self.jobs = None  # run() içinde olay döngüsüyle kurulur
+        self._awaiting_input = False
+        self.interactive = interactive  # False: toplu/sunucu modu, ekran/renk çıktısı yok
+        self.session_id = None          # Sunucu oturumlarında new_session() ile atanır
+        self._local = threading.local()  # İş parçacığına özel akış hedefi (sunucu akış uç noktası)
+        
+        # SQLite yazma ayarları (journal_mode='wal' isteğe bağlı)
+        self.memory_settings = {
+            'journal_mode': 'delete',
+            'synchronous': 'full',
+            'batch_size': 500,
+            'flush_interval': 1.0
+        }
+        # Hava durumu sağlayıcısı (Open-Meteo uyumlu uç nokta) ve yer sözlüğü
+        self.weather_settings = {
+            'base_url': 'https://api.open-meteo.com',
+            'ttl': 600,
+            'workers': 16,
+            'max_places': 50,
+            'places_file': 'data/places.tsv'
+        }
+        # Vikipedi özetleri: {lang} dil koduyla doldurulur; prefetch bağlantılı madde sayısı
+        self.wiki_settings = {
+            'base_url': 'https://{lang}.wikipedia.org',
+            'lang': 'tr',
+            'prefetch': 10,
+            'refresh_days': 30
+        }
+        # Yapılandırma yazımı: değişiklikler debounce saniye birleştirilir (en geç max_delay);
+        # user_data en az snapshot_threshold anahtar tutunca ikili anlık görüntü de yazılır (-1: kapalı)
+        self.config_settings = {
+            'debounce': 1.0,
+            'max_delay': 10.0,
+            'snapshot_threshold': 1000,
+            'retry_max': 30.0
+        }
+        # Arka plan sistem örnekleyicisi: örnekleme aralığı ve saklanan geçmiş (saniye)
+        self.sampler_settings = {
+            'interval': 1.0,
+            'history': 600
+        }
         
         # Sistem durumu
         self.is_learning = True
-        self.is_online = self.check_internet()
+        self.is_online = None  # Arka plan kontrolü tamamlanınca dolar
+        self.welcome_stats = None
         self.start_time = datetime.datetime.now()
+        self.profiler = profiler or StartupProfiler()
+        self.profiler.record("imports", IMPORT_DURATION)
+        self._welcome_shown = False
+        # Son durum satırını hoş geldin ekranı veya arka plan görevinden yalnız biri yazar
+        self._status_lock = threading.Lock()
+        self._status_ready = threading.Event()
+        self._status_shown = False
+        self._prompting = False
         
         # Modüller
         self.modules = {
@@ -78,12 +4724,141 @@ class QuantumiaAI:
             'network': True
         }
         
-        self.load_config()
-        self.load_memory()
+        with self.profiler.phase("config"):
+            self.config_store = ConfigStore(self.config_file, self.collect_config, **self.config_settings)
+            self.load_config()
+        with self.profiler.phase("sqlite"):
+            self.load_memory()
         self.setup_environment()
+        with self.profiler.phase("router"):
+            self.router = self.build_router(self.load_responses())
+            self._responses_watch = FileWatch(self.responses_file)
+        self.semantic = SemanticIndex(self.memory_file, 'data/semantic_index.npz')
+        self.backups = BackupEngine('backups')
+        self.hash_cache = HashCache(self.db_pool, self.writer)
+        self.weather = WeatherProvider(WeatherCache('data/weather_cache.db'), self.weather_settings['base_url'],
+                                       ttl=self.weather_settings['ttl'], workers=self.weather_settings['workers'])
+        self._gazetteer = None
+        self._gazetteer_lock = threading.Lock()
+        self.wiki = WikiLookup(WikiCache('data/wiki_cache.db'), self.wiki_settings['base_url'],
+                               lang=self.wiki_settings['lang'], prefetch=self.wiki_settings['prefetch'],
+                               refresh_days=self.wiki_settings['refresh_days'])
+        self.sampler = SystemSampler(self.sampler_settings['interval'], self.sampler_settings['history']).start()
+        
+        # Bağlantı kontrolü ve sistem istatistikleri girişi bekletmesin
+        self._startup_thread = threading.Thread(target=self._background_startup, daemon=True)
+        self._startup_thread.start()
         
         logger.info(f"{self.name} v{self.version} başlatıldı")
-        self.show_welcome()
+        if interactive:
+            with self.profiler.phase("welcome"):
+                self.show_welcome()
+        else:
+            # Toplu modda ilk sorgular da anlamsal dizini hazır bulmalı
+            with self.profiler.phase("semantic"):
+                self.semantic.warm_up()
+
+    def _background_startup(self):
+        """Bağlantı ve sistem durumunu arka planda topla"""
+        with self.profiler.phase("probe", background=True):
+            self.is_online = self.check_internet()
+        try:
+            with self.profiler.phase("stats", background=True):
+                sample = self.sampler.wait(timeout=2)
+                if sample is not None:
+                    self.welcome_stats = (sample.cpu, sample.memory, sample.disk)
+        except Exception as e:
+            logger.error(f"Sistem istatistiği hatası: {e}")
+        with self._status_lock:
+            self._status_ready.set()
+        self.show_pending_status()
+        if self.interactive:
+            with self.profiler.phase("semantic", background=True):
+                self.semantic.warm_up()
+
+    def wait_for_startup(self, timeout=None):
+        """Arka plan başlangıç görevinin bitmesini bekle"""
+        self._startup_thread.join(timeout)
+        return not self._startup_thread.is_alive()
+
+    def online(self):
+        """İnternet durumunu döndür (kontrol bitmediyse kısa süre bekle)"""
+        if self.is_online is None:
+            self.wait_for_startup(timeout=3)
+        return bool(self.is_online)
+
+    def show_pending_status(self):
+        """Son durum satırı henüz yazılmadıysa yaz; istem ekrandaysa satırı silip istemi yeniden çiz"""
+        with self._status_lock:
+            if not self._welcome_shown or not self._status_ready.is_set() or self._status_shown:
+                return
+            if self._prompting:
+                print(f"\r\033[K{self.format_startup_status()}\n{self.prompt()}", end='', flush=True)
+            else:
+                print(self.format_startup_status())
+            self._status_shown = True
+
+    def format_startup_status(self):
+        """Arka planda toplanan bağlantı/sistem durumunu biçimlendir"""
+        if self.is_online is None:
+            online = '⏳ Kontrol ediliyor...'
+        else:
+            online = '✅ Bağlı' if self.is_online else '❌ Bağlı Değil'
+        line = f"\033[93m🌐 İnternet: {online}\033[0m"
+        if self.welcome_stats:
+            cpu, memory, disk = self.welcome_stats
+            line += f" \033[90m| 📊 Sistem: CPU {cpu}% | RAM {memory}% | Disk {disk}%\033[0m"
+        return line
+
+    def build_router(self, tables=None):
+        """Üç aşamanın tüm tetikleyicilerinden tek bir niyet yönlendiricisi kur"""
+        ml, natural = tables or parse_response_tables(builtin_response_tables())
+        router = IntentRouter()
+        for priority, (name, (triggers, responses)) in enumerate(ml.items()):
+            router.register(name, triggers, priority, STAGE_ML, responses=responses)
+        router.register_handlers(self)
+        for priority, (keyword, (triggers, responses)) in enumerate(natural.items()):
+            router.register(f"natural:{keyword}", triggers, priority, STAGE_NATURAL, responses=responses)
+        return router.compile()
+
+    def load_responses(self):
+        """Yanıt tablolarını data/responses.json'dan oku
+
+        Çalışma dizininde dosya yoksa depoyla gelen kopya (BUNDLED_RESPONSES) oraya kopyalanır;
+        o da okunamazsa yerleşik yedek tablolar kullanılır.
+        """
+        if not os.path.exists(self.responses_file):
+            try:
+                shutil.copyfile(BUNDLED_RESPONSES, self.responses_file)
+            except OSError as e:
+                logger.error(f"Yanıt tabloları kopyalanamadı, yerleşikler kullanılıyor: {e}")
+                return None
+        try:
+            with open(self.responses_file, 'r', encoding='utf-8') as f:
+                return parse_response_tables(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Yanıt tabloları okunamadı, yerleşikler kullanılıyor: {e}")
+            return None
+
+    def reload_responses(self):
+        """Yanıt dosyası değiştiyse yönlendiriciyi yeniden kurup yerinde değiştir"""
+        if not self._responses_watch.changed():
+            return False
+        try:
+            with open(self.responses_file, 'r', encoding='utf-8') as f:
+                tables = parse_response_tables(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Yanıt tabloları yeniden yüklenemedi, eskileri korunuyor: {e}")
+            return False
+        self.router.swap(self.build_router(tables))
+        self.response_cache.clear()
+        logger.info(f"Yanıt tabloları yeniden yüklendi: {len(tables[0])} ML, {len(tables[1])} doğal kalıp")
+        return True
+
+    def route(self, user_input, stage=None):
+        """Yanıt dosyası değişikliklerini uygulayıp girdiyi yönlendir"""
+        self.reload_responses()
+        return self.router.route(user_input, stage)
 
     def setup_environment(self):
         """Çalışma ortamını hazırla"""
@@ -93,35 +4868,52 @@ class QuantumiaAI:
         Path('downloads').mkdir(exist_ok=True)
 
     def load_config(self):
-        """Yapılandırmayı yükle"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    self.user_name = config.get('user_name', self.user_name)
-                    self.modules = config.get('modules', self.modules)
-                    self.user_data = config.get('user_data', {})
+        """Yapılandırmayı yükle (JSON değişmediyse ikili anlık görüntüden)"""
+        try:
+            config = self.config_store.load()
+            if config:
+                self.user_name = config.get('user_name', self.user_name)
+                self.modules = config.get('modules', self.modules)
+                self.user_data = config.get('user_data', {})
+                self.memory_settings.update(config.get('memory', {}))
+                self.sampler_settings.update(config.get('sampler', {}))
+                self.weather_settings.update(config.get('weather', {}))
+                self.wiki_settings.update(config.get('wiki', {}))
+                self.config_settings.update(config.get('config', {}))
+                self.config_store.configure(self.config_settings)
         except Exception as e:
             logger.error(f"Config yükleme hatası: {e}")
+        self.user_data = TrackedDict(self.user_data, self.config_store.mark_dirty)
+
+    def collect_config(self):
+        """Kaydedilecek yapılandırma (yazıcı iş parçacığında çağrılır, sözlükler kopyalanır)"""
+        return {
+            'user_name': self.user_name,
+            'modules': dict(self.modules),
+            'user_data': dict(self.user_data),
+            'memory': dict(self.memory_settings),
+            'sampler': dict(self.sampler_settings),
+            'weather': dict(self.weather_settings),
+            'wiki': dict(self.wiki_settings),
+            'config': dict(self.config_settings),
+            'last_updated': datetime.datetime.now().isoformat()
+        }
 
     def save_config(self):
-        """Yapılandırmayı kaydet"""
-        try:
-            config = {
-                'user_name': self.user_name,
-                'modules': self.modules,
-                'user_data': self.user_data,
-                'last_updated': datetime.datetime.now().isoformat()
-            }
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Config kaydetme hatası: {e}")
+        """Bekleyen yapılandırma değişikliklerini hemen yaz (dosya yoksa oluştur)"""
+        if not os.path.exists(self.config_file):
+            self.config_store.mark_dirty()
+        if self.config_store.flush():
+            return True
+        logger.warning(f"Yapılandırma kaydedilemedi ({self.config_store.pending()} değişiklik bekliyor); "
+                       f"yazım arka planda yeniden denenecek")
+        return False
 
     def load_memory(self):
         """Belleği SQLite veritabanından yükle"""
         try:
             self.conn = sqlite3.connect(self.memory_file)
+            apply_pragmas(self.conn, self.memory_settings)
             self.cursor = self.conn.cursor()
             
             # Tabloları oluştur
@@ -145,43 +4937,88 @@ class QuantumiaAI:
                 )
             ''')
             
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    hashed_at TEXT,
+                    PRIMARY KEY (path, algorithm)
+                ) WITHOUT ROWID
+            ''')
+            
             self.conn.commit()
+            self.fts_enabled = ensure_knowledge_index(self.conn)
+            ensure_knowledge_hashes(self.conn)
+            if self.conn.execute("SELECT 1 FROM knowledge_imports WHERE first_id IS NOT NULL").fetchone():
+                logger.warning("Yarıda kalan bilgi aktarımının dizinleri tamamlanıyor")
+                finish_knowledge_imports(self.conn, self.fts_enabled)
+            
+            self.writer = WriteBehindQueue(
+                self.memory_file,
+                batch_size=self.memory_settings['batch_size'],
+                flush_interval=self.memory_settings['flush_interval'],
+                settings=self.memory_settings
+            )
+            # Okuma yolları (toplu mod, sunucu oturumları) iş parçacıkları arasında paylaşır
+            self.db_pool = ConnectionPool(self.memory_file, settings=self.memory_settings)
+            self.history = ConversationHistory(self.writer, self.db_pool,
+                                               fts=ensure_conversation_index(self.conn))
+            self._history_query = None  # /history devam için son filtreler ve imleç
             
         except Exception as e:
             logger.error(f"Bellek yükleme hatası: {e}")
 
     def save_to_memory(self, user_input, response, category="general"):
-        """Konuşmayı belleğe kaydet"""
+        """Konuşmayı belleğe kaydet (sıcak katman + conversations tablosu)"""
         try:
-            timestamp = datetime.datetime.now().isoformat()
-            self.cursor.execute('''
-                INSERT INTO conversations (timestamp, user_input, response, category)
-                VALUES (?, ?, ?, ?)
-            ''', (timestamp, user_input, response, category))
-            self.conn.commit()
+            with metrics.timer('sqlite', 'save_to_memory'):
+                self.history.record(user_input, response, category)
         except Exception as e:
             logger.error(f"Bellek kaydetme hatası: {e}")
 
     def add_knowledge(self, topic, information, source="user"):
-        """Bilgi ekle"""
+        """Bilgi ekle (aynı içerik ikinci kez eklenmez)"""
         try:
             timestamp = datetime.datetime.now().isoformat()
-            self.cursor.execute('''
-                INSERT INTO knowledge (topic, information, source, created_at)
-                VALUES (?, ?, ?, ?)
-            ''', (topic, information, source, timestamp))
-            self.conn.commit()
+            topic, information = normalize_text(topic), normalize_text(information)
+            with metrics.timer('sqlite', 'add_knowledge'):
+                self.writer.put('''
+                    INSERT OR IGNORE INTO knowledge (topic, information, source, created_at, content_hash)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (topic, information, source, timestamp, knowledge_hash(topic, information)))
         except Exception as e:
             logger.error(f"Bilgi ekleme hatası: {e}")
 
     def get_knowledge(self, topic):
-        """Bilgi sorgula"""
+        """Bilgi sorgula (BM25 sıralı, eşitlikte en yeni önce)"""
         try:
-            self.cursor.execute('''
-                SELECT information FROM knowledge WHERE topic LIKE ? ORDER BY created_at DESC LIMIT 3
-            ''', (f'%{topic}%',))
-            results = self.cursor.fetchall()
-            return [result[0] for result in results] if results else None
+            with metrics.timer('sqlite', 'get_knowledge'):
+                # Kuyrukta bekleyen bilgiler de görünsün
+                if self.writer.pending():
+                    self.writer.flush()
+                query = fts_query(topic) if self.fts_enabled else None
+                if query:
+                    # Konu eşleşmeleri bilgi metnindeki eşleşmelerden 10 kat ağır basar
+                    self.cursor.execute('''
+                        SELECT k.information FROM knowledge_fts
+                        JOIN knowledge k ON k.id = knowledge_fts.rowid
+                        WHERE knowledge_fts MATCH ?
+                        ORDER BY bm25(knowledge_fts, 10.0, 1.0), k.created_at DESC LIMIT 3
+                    ''', (query,))
+                elif self.fts_enabled:
+                    # Aranacak kelime yoksa created_at indeksiyle en yeniler
+                    self.cursor.execute('''
+                        SELECT information FROM knowledge ORDER BY created_at DESC LIMIT 3
+                    ''')
+                else:
+                    self.cursor.execute('''
+                        SELECT information FROM knowledge WHERE topic LIKE ? ORDER BY created_at DESC LIMIT 3
+                    ''', (f'%{topic}%',))
+                results = self.cursor.fetchall()
+                return [result[0] for result in results] if results else None
         except Exception as e:
             logger.error(f"Bilgi sorgulama hatası: {e}")
             return None
@@ -214,14 +5051,14 @@ class QuantumiaAI:
         print(f"\033[95m{welcome_art}\033[0m")
         print(f"\033[96m🔮 {self.name} v{self.version} - Ultimate Yapay Zeka Sistemi\033[0m")
         print(f"\033[92m⭐ {self.user_name} için özelleştirilmiş\033[0m")
-        print(f"\033[93m🌐 İnternet: {'✅ Bağlı' if self.is_online else '❌ Bağlı Değil'}\033[0m")
         print(f"\033[94m🕐 Başlangıç: {self.start_time.strftime('%d/%m/%Y %H:%M:%S')}\033[0m")
         print("=" * 70)
         
-        # Sistem durumu
-        cpu = psutil.cpu_percent()
-        memory = psutil.virtual_memory().percent
-        print(f"\033[90m📊 Sistem: CPU {cpu}% | RAM {memory}% | Disk {psutil.disk_usage('/').percent}%\033[0m")
+        # Bağlantı ve sistem durumu henüz hazır değilse arka plan görevi bitince yazdırılır
+        with self._status_lock:
+            print(self.format_startup_status())
+            self._welcome_shown = True
+            self._status_shown = self._status_ready.is_set()
         print("=" * 70)
 
     def speak(self, text, emotion="neutral"):
@@ -240,7 +5077,6 @@ class QuantumiaAI:
         emoji = self.get_emotion_emoji(emotion)
         
         print(f"{color}{emoji} {self.name}: {text}\033[0m")
-        self.conversation_history.append((datetime.datetime.now(), text))
 
     def get_emotion_emoji(self, emotion):
         """Duyguya göre emoji döndür"""
@@ -255,23 +5091,37 @@ class QuantumiaAI:
         }
         return emojis.get(emotion, "🤖")
 
-    def listen(self):
-        """Gelişmiş giriş alma"""
+    def prompt(self):
+        return f"\033[93m👤 {self.user_name}: \033[0m"
+
+    def read_input(self):
+        """Ham kullanıcı girdisini al"""
+        if self._welcome_shown and not self._status_shown:
+            # Bağlantı kontrolü kısa sürede biterse durum satırı ilk istemden önce yazılır
+            self._status_ready.wait(STATUS_WAIT)
+        self.show_pending_status()
+        with self._status_lock:
+            self._prompting = True
         try:
-            prompt = f"\033[93m👤 {self.user_name}: \033[0m"
-            user_input = input(prompt).strip()
-            
-            # Özel komutlar
-            if user_input.startswith('/'):
-                return self.process_system_command(user_input)
-            
-            return user_input
-            
+            return input(self.prompt()).strip()
         except (EOFError, KeyboardInterrupt):
             return "/exit"
         except Exception as e:
             logger.error(f"Giriş alma hatası: {e}")
             return ""
+        finally:
+            with self._status_lock:
+                self._prompting = False
+
+    def listen(self):
+        """Gelişmiş giriş alma"""
+        user_input = self.read_input()
+        
+        # Özel komutlar
+        if user_input.startswith('/'):
+            return self.process_system_command(user_input)
+        
+        return user_input
 
     def process_system_command(self, command):
         """Sistem komutlarını işle"""
@@ -287,29 +5137,99 @@ class QuantumiaAI:
         elif cmd == "status":
             self.show_system_status()
             return ""
+        elif cmd == "stats" or cmd.startswith("stats "):
+            self.show_system_trends(cmd[len("stats"):].strip())
+            return ""
         elif cmd == "modules":
             self.show_modules()
             return ""
-        elif cmd == "history":
-            self.show_history()
+        elif cmd == "history" or cmd.startswith("history "):
+            self.show_history(command[1:].split()[1:])
+            return ""
+        elif cmd == "import" or cmd.startswith("import "):
+            self.import_command(shlex.split(command[1:])[1:])
+            return ""
+        elif cmd == "wiki" or cmd.startswith("wiki "):
+            self.wiki_command(command[1:].split()[1:])
             return ""
         elif cmd == "backup":
-            self.create_backup()
+            self.run_job("backup", self.create_backup)
+            return ""
+        elif cmd.startswith("backup "):
+            self.backup_command(cmd[len("backup"):].split())
             return ""
         elif cmd == "update":
-            self.check_updates()
+            self.run_job("update", self.check_updates)
+            return ""
+        elif cmd == "jobs":
+            self.show_jobs()
+            return ""
+        elif cmd.startswith("cancel"):
+            self.cancel_job(cmd[len("cancel"):].strip())
+            return ""
+        elif cmd == "profile" or cmd.startswith("profile "):
+            self.profile_command(command[1:].split()[1:])
             return ""
         
         return f"Bilinmeyen komut: {command}"
 
+    def run_job(self, name, func, kind=JOB_IO, on_done=None):
+        """İş yöneticisi varsa arka planda, yoksa hemen çalıştır"""
+        if self.jobs is None:
+            result = func()
+            if on_done:
+                on_done(None, result, None)
+            return None
+        job = self.jobs.submit(name, func, kind, on_done or self._job_done)
+        self.speak(f"⏳ İş #{job.id} başlatıldı ({name}). /jobs ile izleyebilirsin.", "info")
+        return job
+
+    def _job_done(self, job, result, error):
+        """Biten işin sonucunu yazdır ve istemi yenile"""
+        if error is not None:
+            self.speak(f"[#{job.id}] ❌ İş başarısız oldu: {error}", "sad")
+        elif result:
+            response, emotion = result if isinstance(result, tuple) else (result, "neutral")
+            self.speak(f"[#{job.id}] {response}", emotion)
+        if self._awaiting_input:
+            print(self.prompt(), end='', flush=True)
+
+    def show_jobs(self):
+        """Çalışan ve son biten işleri göster"""
+        if self.jobs is None or not self.jobs.jobs:
+            self.speak("Henüz iş yok.", "info")
+            return
+        lines = ["🧵 İşler:"]
+        for job in self.jobs.jobs.values():
+            lines.append(f"   #{job.id} {job.name:<10} {job.kind:<4} {job.state:<13} {job.elapsed():.1f} s"
+                         + (f" | {job.progress}" if job.progress else ""))
+        self.speak("\n".join(lines), "info")
+
+    def cancel_job(self, arg):
+        """/cancel N komutu"""
+        if self.jobs is None or not arg.lstrip('#').isdigit():
+            self.speak("Kullanım: /cancel <iş numarası>", "warning")
+            return
+        job_id = int(arg.lstrip('#'))
+        if self.jobs.cancel(job_id):
+            self.speak(f"🛑 İş #{job_id} iptal edildi.", "info")
+        else:
+            self.speak(f"İş #{job_id} bulunamadı veya zaten bitti.", "warning")
+
     # EKSİK FONKSİYONLARI EKLEYELİM
+    def places(self):
+        """Yer sözlüğü (ilk hava durumu sorgusunda yüklenir)"""
+        if self._gazetteer is None:
+            with self._gazetteer_lock:
+                if self._gazetteer is None:
+                    self._gazetteer = Gazetteer.load(self.weather_settings['places_file'])
+                    logger.info(f"Yer sözlüğü yüklendi: {self._gazetteer.count} ad")
+        return self._gazetteer
+
     def extract_city(self, query):
         """Sorgudan şehir ismini çıkar"""
-        cities = ['istanbul', 'ankara', 'izmir', 'bursa', 'antalya', 'adana', 'konya']
-        for city in cities:
-            if city in query.lower():
-                return city
-        return None
+        place = self.places().find(query)
+        return place.name if place else None
 
     def extract_path(self, query):
         """Sorgudan dosya yolunu çıkar"""
@@ -339,107 +5259,363 @@ class QuantumiaAI:
 
     def process_advanced_commands(self, user_input):
         """Gelişmiş komutları işle"""
-        user_input_lower = user_input.lower()
-        
-        # Hava durumu
-        if any(word in user_input_lower for word in ["hava durumu", "hava", "weather"]):
-            return self.advanced_weather(user_input_lower)
-        
-        # Dosya işlemleri
-        elif any(word in user_input_lower for word in ["dosya", "file", "klasör", "dizin"]):
-            return self.file_manager(user_input_lower)
-        
-        # Ağ araçları
-        elif any(word in user_input_lower for word in ["ping", "ip", "ağ", "network"]):
-            return self.network_tools(user_input_lower)
-        
-        # Güvenlik araçları
-        elif any(word in user_input_lower for word in ["şifre", "password", "hash", "güvenlik"]):
-            return self.security_tools(user_input_lower)
-        
-        # Sistem bilgisi
-        elif any(word in user_input_lower for word in ["sistem", "bilgi", "cpu", "bellek", "ram"]):
-            return self.get_system_info()
-        
-        # Zaman ve tarih
-        elif any(word in user_input_lower for word in ["saat", "tarih", "zaman", "ne zaman"]):
-            return self.get_time_info()
-        
-        # Takvim
-        elif any(word in user_input_lower for word in ["takvim", "calendar", "ayın"]):
-            return self.show_calendar()
-        
-        # Şaka yap
-        elif any(word in user_input_lower for word in ["şaka", "güldür", "komik", "espri"]):
-            return self.tell_joke()
-        
-        # Yardım
-        elif any(word in user_input_lower for word in ["yardım", "help", "ne yapabilirsin", "özellikler"]):
-            return self.show_help()
-
+        match = self.route(user_input, STAGE_COMMAND)
+        if match:
+            return self.dispatch_intent(match, user_input)
         return None
 
+    def dispatch_intent(self, match, user_input):
+        """Eşleşen komut niyetinin işleyicisini çağır"""
+        handler = self.router.handler(match.intent)
+        if handler.__self__ is not self:
+            # Oturum kopyaları kendi kullanıcı adı/geçmişiyle çalışsın
+            handler = getattr(self, handler.__name__)
+        with metrics.timer('handler', match.intent):
+            if handler.__code__.co_argcount > 1:
+                return handler(user_input if getattr(handler, 'intent_raw', False) else turkish_lower(user_input))
+            return handler()
+
+    def respond(self, user_input, match=None):
+        """Girdiyi tek geçişte yönlendir ve (yanıt, duygu) döndür"""
+        match = match or self.route(user_input)
+        if not (metrics.enabled or metrics.sampling):
+            return self._respond(user_input, match)
+        with metrics.timer('intent', match.intent if match else 'fallback'):
+            return metrics.sampled(self._respond, user_input, match)
+
+    def _respond(self, user_input, match):
+        if match is None:
+            return self.natural_conversation(user_input), "neutral"
+        if match.stage == STAGE_ML:
+            return self.fill_response(random.choice(self.router.responses(match.intent))), "happy"
+        if match.stage == STAGE_COMMAND:
+            response = self.dispatch_intent(match, user_input)
+            if response:
+                return response, "neutral"
+            return self.natural_conversation(user_input), "neutral"
+        return self.natural_conversation(user_input, match), "neutral"
+
+    @intent("weather", ["hava durumu", "hava", "weather"], priority=0, kind=JOB_IO)
     def advanced_weather(self, query):
-        """Gelişmiş hava durumu"""
-        if not self.is_online:
-            return "❌ İnternet bağlantısı gerekiyor"
-        
+        """Gelişmiş hava durumu (birden çok şehir paralel sorgulanır)"""
+        places = self.places().find_all(query, limit=self.weather_settings['max_places'])
+        if not places:
+            return "🌍 Hangi şehir için hava durumu istiyorsunuz? (ör. 'hava durumu İstanbul Ankara İzmir')"
+        results = self.weather.forecast_many(places)
+        if len(results) == 1:
+            return self.weather_report(*results[0])
+        lines = [f"🌤️ {len(results)} şehir için hava durumu:"]
+        for place, forecast in results:
+            if isinstance(forecast, Exception):
+                lines.append(f"   ❌ {place.name}: alınamadı")
+                continue
+            lines.append(f"   ⛅ {place.name}: {WEATHER_CODES.get(forecast.code, 'bilinmiyor')}, "
+                         f"{forecast.temperature}°C, nem {forecast.humidity}%{self.weather_age(forecast)}")
+        return "\n".join(lines)
+
+    def weather_report(self, place, forecast):
+        """Tek şehrin hava durumu raporu"""
+        if isinstance(forecast, Exception):
+            logger.error(f"Hava durumu hatası: {forecast}")
+            return "❌ Hava durumu bilgisi alınamadı (bağlantı yok ve önbellekte veri yok)"
+        return (f"🌤️ {place.name} Hava Durumu:\n"
+                f"   ⛅ Durum: {WEATHER_CODES.get(forecast.code, 'bilinmiyor')}\n"
+                f"   🌡️ Sıcaklık: {forecast.temperature}°C\n"
+                f"   💧 Nem: {forecast.humidity}%\n"
+                f"   💨 Rüzgar: {forecast.wind} km/s{self.weather_age(forecast)}")
+
+    def weather_age(self, forecast):
+        """Bağlantı yokken önbellekten gelen verinin yaşı"""
+        if not forecast.stale:
+            return ""
+        minutes = int((time.time() - forecast.fetched_at) // 60)
+        age = f"{minutes} dk" if minutes < 120 else f"{minutes // 60} saat"
+        return f" (⚠️ çevrimdışı, {age} önceki veri)"
+
+    @intent("wiki", ["nedir", "kimdir", "ne demek", "what is", "who is", "vikipedi", "wikipedia"],
+            priority=9, kind=JOB_IO, raw=True)
+    def wiki_lookup(self, query):
+        """Vikipedi özeti; bulunamazsa None döner ve girdi doğal konuşmaya düşer"""
+        lang = 'en' if re.search(r'\b(?:what|who) is\b', query, re.IGNORECASE) else self.wiki_settings['lang']
+        topic = WIKI_TRIGGERS.sub(' ', query).strip(" \t?!.,'\"")
+        if not topic:
+            return "📚 Ne hakkında bilgi istiyorsun? (ör. 'Ankara nedir', 'what is Python')"
+        article = self.wiki.lookup(topic, lang)
+        if article is None:
+            return None
+        summary = article.summary if len(article.summary) <= 600 else article.summary[:600].rsplit(' ', 1)[0] + "…"
+        source = " (önbellek)" if article.source == 'cache' else ""
+        link = f"\n   🔗 {article.url}" if article.url else ""
+        return f"📚 {article.title}{source}:\n   {summary}{link}"
+
+    def wiki_command(self, args):
+        """/wiki warm <döküm> [dil] | stats | <konu>"""
+        action = args[0].lower() if args else ""
+        if action in ("warm", "ısıt") and len(args) > 1:
+            path, lang = args[1], args[2] if len(args) > 2 else self.wiki_settings['lang']
+            if not os.path.exists(path):
+                self.speak(f"❌ Döküm dosyası bulunamadı: {path}", "warning")
+                return
+            self.run_job("wiki-warm", lambda: self.warm_wiki(path, lang))
+        elif action in ("stats", "durum"):
+            rows = self.wiki.cache.stats()
+            if not rows:
+                self.speak("📚 Vikipedi önbelleği boş. '/wiki warm <döküm>' ile doldurabilirsin.", "info")
+                return
+            lines = [f"📚 Vikipedi önbelleği ({self.wiki.cache.codec}):"]
+            for lang, count, size, stored in rows:
+                lines.append(f"   {lang}: {count:,} madde, {size / 1024 / 1024:.1f} MB → "
+                             f"{stored / 1024 / 1024:.1f} MB sıkıştırılmış")
+            self.speak("\n".join(lines), "info")
+        elif args:
+            query = " ".join(args)
+            self.run_job("wiki", lambda: self.wiki_lookup(query) or f"📚 '{query}' bulunamadı.")
+        else:
+            self.speak("Kullanım: /wiki [warm <döküm> [dil] | stats | <konu>]", "warning")
+
+    def warm_wiki(self, path, lang):
+        """Döküm dosyasını önbelleğe aktar (iş olarak çalışır)"""
+        start = time.perf_counter()
+        count = self.wiki.import_dump(path, lang)
+        elapsed = time.perf_counter() - start
+        return f"📚 {count:,} madde önbelleğe aktarıldı ({elapsed:.1f} s, {count / max(elapsed, 1e-9):,.0f} madde/s)"
+
+    @intent("archive", ["arşiv", "archive", "zip", "tar.gz", "tar.xz"], priority=10, kind=JOB_IO, raw=True)
+    def archive_tools(self, query):
+        """Arşiv listeleme, açma ve oluşturma (zip, tar.gz, tar.xz, tar)"""
+        words = self.split_query(query)
+        lowered = [turkish_lower(word) for word in words]
+        action = next((word for word in lowered if word in ARCHIVE_ACTIONS), None)
+        paths = [word for word, low in zip(words, lowered)
+                 if low not in ARCHIVE_ACTIONS and low not in ("arşiv", "archive", "zip")]
+        usage = ("📦 Kullanım: 'arşiv liste <arşiv>', 'arşiv aç <arşiv> [hedef dizin]' veya "
+                 "'arşiv oluştur <arşiv.zip|.tar.gz|.tar.xz> <dosya/dizin...>'")
+        action = ARCHIVE_ACTIONS.get(action)
+        if action is None or not paths:
+            return usage
+        toolkit = ArchiveToolkit()
+        job = current_job()
+        cancel = job.cancel_event if job else None
         try:
-            # Basit hava durumu simülasyonu (API olmadan)
-            cities = {
-                "istanbul": {"temp": random.randint(15, 25), "condition": "parçalı bulutlu", "humidity": random.randint(60, 80)},
-                "ankara": {"temp": random.randint(10, 20), "condition": "açık", "humidity": random.randint(50, 70)},
-                "izmir": {"temp": random.randint(18, 28), "condition": "güneşli", "humidity": random.randint(55, 75)},
-                "bursa": {"temp": random.randint(16, 24), "condition": "parçalı bulutlu", "humidity": random.randint(65, 85)},
-                "antalya": {"temp": random.randint(20, 30), "condition": "açık", "humidity": random.randint(60, 80)}
-            }
-            
-            city = self.extract_city(query)
-            if not city:
-                return "🌍 Hangi şehir için hava durumu istiyorsunuz? (İstanbul, Ankara, İzmir, Antalya, Bursa)"
-            
-            if city in cities:
-                data = cities[city]
-                return (f"🌤️ {city.capitalize()} Hava Durumu:\n"
-                       f"   ⛅ Durum: {data['condition']}\n"
-                       f"   🌡️ Sıcaklık: {data['temp']}°C\n"
-                       f"   💧 Nem: {data['humidity']}%")
-            else:
-                return "❌ Bu şehir için hava durumu bilgim yok"
-                
-        except Exception as e:
-            logger.error(f"Hava durumu hatası: {e}")
-            return "❌ Hava durumu bilgisi alınamadı"
+            if action == "list":
+                return self.list_archive(toolkit, paths[0])
+            if action == "extract":
+                dest = paths[1] if len(paths) > 1 else os.path.join('downloads', archive_stem(paths[0]))
+                stats = toolkit.extract(paths[0], dest, cancel)
+                skipped = f", {stats['skipped']} bağlantı/aygıt atlandı" if stats['skipped'] else ""
+                return (f"📦 {paths[0]} → {dest}: {stats['files']} dosya, {stats['dirs']} dizin, "
+                        f"{self.format_size(stats['bytes'])} ({stats['seconds']:.2f} s{skipped})")
+            sources = [path for path in paths[1:] if os.path.exists(path)]
+            if not sources:
+                return usage
+            stats = toolkit.create(paths[0], sources, cancel=cancel)
+            ratio = stats['size'] / stats['bytes'] * 100 if stats['bytes'] else 100
+            return (f"📦 {paths[0]} oluşturuldu: {stats['files']} dosya, {self.format_size(stats['bytes'])} → "
+                    f"{self.format_size(stats['size'])} (%{ratio:.0f}, {stats['seconds']:.2f} s)")
+        except ArchiveCancelled:
+            return "🛑 Arşiv işlemi iptal edildi"
+        except ArchiveError as e:
+            return f"❌ {e}"
+        except (OSError, zipfile.BadZipFile, tarfile.TarError, EOFError) as e:
+            return f"❌ Arşiv hatası: {e}"
+
+    def list_archive(self, toolkit, path, show=30):
+        """Arşiv içeriğini (ilk show üye) ve toplamları göster"""
+        if not os.path.isfile(path):
+            return f"❌ Arşiv bulunamadı: {path}"
+        lines, count, size, compressed = [], 0, 0, 0
+        for entry in toolkit.entries(path):
+            count += 1
+            size += entry.size
+            compressed += entry.compressed or 0
+            if count <= show:
+                lines.append(f"   {'📁' if entry.is_dir else '📄'} {entry.name} ({self.format_size(entry.size)})")
+        ratio = f", sıkıştırılmış {self.format_size(compressed)}" if compressed else ""
+        header = f"📦 {path}: {count} üye, {self.format_size(size)}{ratio}"
+        if count > show:
+            lines.append(f"   ... ilk {show} üye gösterildi")
+        return "\n".join([header] + lines)
 
+    @intent("files", ["dosya", "file", "klasör", "dizin"], priority=1, kind=JOB_IO, raw=True)
     def file_manager(self, query):
         """Gelişmiş dosya yöneticisi"""
-        if "liste" in query or "ls" in query:
-            path = self.extract_path(query) or "."
+        words = turkish_lower(query).split()
+        if "liste" in words or "listele" in words or "ls" in words:
+            options = self.parse_scan_options(query)
             try:
-                items = os.listdir(path)
-                result = f"📁 {path}:\n"
-                for item in items:
-                    full_path = os.path.join(path, item)
-                    if os.path.isdir(full_path):
-                        result += f"📂 {item}/\n"
-                    else:
-                        size = os.path.getsize(full_path)
-                        result += f"📄 {item} ({self.format_size(size)})\n"
-                return result
+                return self.list_directory(options)
             except Exception as e:
                 return f"❌ Dosya listeleme hatası: {e}"
         
-        elif "oku" in query:
-            file_path = self.extract_path(query)
-            if file_path and os.path.isfile(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read(1000)  # İlk 1000 karakter
-                        return f"📖 {file_path}:\n{content}..."
-                except Exception as e:
-                    return f"❌ Dosya okuma hatası: {e}"
+        elif "oku" in words or "göster" in words:
+            return self.view_file(query)
+        
+        elif "ara" in words or "grep" in words:
+            return self.search_in_files(query)
+        
+        return ("📂 Kullanım: 'dosya liste [dizin] [sayfa N] [-r] [derinlik N] [*.uzantı]', "
+                "'dosya liste [dizin] en büyük N', 'dosya liste [dizin] boyut', "
+                "'dosya oku [dosya] [satır N | bayt N | sayfa N]' veya 'dosya ara [kalıp] [dosya/dizin...]'")
+
+    def split_query(self, query):
+        """Sorguyu tırnakları dikkate alarak kelimelere ayır"""
+        try:
+            return shlex.split(query)
+        except ValueError:
+            # Kapanmamış kesme işareti ("istanbul'da") vb.
+            return query.split()
+
+    def view_file(self, query, page_lines=40, page_bytes=1024):
+        """Dosyayı satır veya bayt ofsetinden sayfa sayfa göster (ikili dosyalar onaltılık)"""
+        words = self.split_query(query)
+        lowered = [turkish_lower(word) for word in words]
+        path, line, offset, page = None, None, None, 1
+        i = 0
+        while i < len(words):
+            following = lowered[i + 1] if i + 1 < len(words) else ''
+            if lowered[i] in ('satır', 'line') and following.isdigit():
+                line = max(1, int(following))
+                i += 1
+            elif lowered[i] in ('bayt', 'byte', 'ofset', 'offset') and following.isdigit():
+                offset = int(following)
+                i += 1
+            elif lowered[i] in ('sayfa', 'page') and following.isdigit():
+                page = max(1, int(following))
+                i += 1
+            elif lowered[i] not in ('dosya', 'file', 'oku', 'göster') and path is None:
+                path = words[i]
+            i += 1
+        if not path or not os.path.isfile(path):
+            return "📂 Kullanım: 'dosya oku [dosya] [satır N | bayt N | sayfa N]'"
+        try:
+            with FileViewer(path) as viewer:
+                if viewer.size == 0:
+                    return f"📖 {path}: dosya boş"
+                if offset is not None or viewer.is_binary():
+                    offset = offset if offset is not None else (page - 1) * page_bytes
+                    data = bytes(viewer.read_bytes(offset, page_bytes))
+                    if viewer.is_binary():
+                        body = hexdump(data, offset)
+                    else:
+                        body = data.decode('utf-8', errors='replace')
+                    return (f"📖 {path} (bayt {offset}-{offset + len(data)} / {viewer.size}):\n{body}\n"
+                            f"➡️ Devamı: 'dosya oku {path} bayt {offset + len(data)}'")
+                start = line - 1 if line else (page - 1) * page_lines
+                lines = viewer.read_lines(start, page_lines)
+                if not lines:
+                    return f"📖 {path}: {start + 1}. satır dosyanın sonundan sonra"
+                body = "\n".join(f"{start + n + 1:>6} │ {text}" for n, text in enumerate(lines))
+                return (f"📖 {path} (satır {start + 1}-{start + len(lines)}, {self.format_size(viewer.size)}):\n"
+                        f"{body}\n➡️ Devamı: 'dosya oku {path} satır {start + len(lines) + 1}'")
+        except Exception as e:
+            return f"❌ Dosya okuma hatası: {e}"
+
+    def search_in_files(self, query, max_hits=100):
+        """Dosyalarda veya dizin ağaçlarında grep benzeri arama"""
+        words = self.split_query(query)
+        lowered = [turkish_lower(word) for word in words]
+        args = [word for word, low in zip(words, lowered) if low not in ('dosya', 'file', 'ara', 'grep', 'içinde')]
+        extensions = [word[1:] for word in args if word.startswith('*.')]
+        args = [word for word in args if not word.startswith('*.')]
+        if len(args) < 2:
+            return "🔎 Kullanım: 'dosya ara [kalıp] [dosya/dizin...] [*.uzantı]'"
+        pattern, targets = args[0], args[1:]
+        paths = []
+        for target in targets:
+            if os.path.isdir(target):
+                scanner = DirectoryScanner(target, recursive=True, extensions=extensions, sizes=False)
+                paths.extend(entry.path for entry in scanner if not entry.is_dir)
+            elif os.path.isfile(target):
+                paths.append(target)
+        if not paths:
+            return "❌ Aranacak dosya bulunamadı"
+        try:
+            start = time.perf_counter()
+            hits = search_files(paths, pattern, max_hits)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            return f"❌ Arama hatası: {e}"
+        lines = [f"🔎 '{pattern}': {len(paths)} dosyada {len(hits)} eşleşme ({elapsed:.2f} s)"]
+        lines += [f"   {hit.path}:{hit.line}: {hit.text.strip()}" for hit in hits]
+        if len(hits) >= max_hits:
+            lines.append(f"   ... ilk {max_hits} eşleşme gösterildi")
+        return "\n".join(lines)
+
+    def parse_scan_options(self, query):
+        """'dosya liste' seçeneklerini ayrıştır (yol büyük/küçük harf korunarak alınır)"""
+        words = query.split()
+        lowered = [turkish_lower(word) for word in words]
+        options = {'path': None, 'recursive': False, 'depth': None, 'largest': None,
+                   'extensions': [], 'page': 1, 'limit': None, 'summary': False}
+        skip = {'dosya', 'file', 'klasör', 'dizin', 'liste', 'listele', 'ls', 'en', 'path'}
+        numeric = {'derinlik': 'depth', 'depth': 'depth', 'büyük': 'largest', 'largest': 'largest',
+                   'sayfa': 'page', 'page': 'page', 'limit': 'limit'}
+        i = 0
+        while i < len(words):
+            word = lowered[i]
+            following = lowered[i + 1] if i + 1 < len(words) else ''
+            if word in numeric and following.isdigit():
+                options[numeric[word]] = int(following)
+                i += 1
+            elif word in ('-r', 'özyinelemeli', 'recursive'):
+                options['recursive'] = True
+            elif word in ('uzantı', 'ext') and following:
+                options['extensions'].extend(following.split(','))
+                i += 1
+            elif word.startswith('*.'):
+                options['extensions'].append(word[1:])
+            elif word in ('boyut', 'du', 'özet'):
+                options['summary'] = True
+            elif word not in skip and options['path'] is None:
+                options['path'] = words[i]
+            i += 1
+        # Boyut özeti, en büyükler ve derinlik sınırı alt dizinlere iner
+        if options['summary'] or options['largest'] or options['depth'] is not None:
+            options['recursive'] = True
+        return options
+
+    def list_directory(self, options):
+        """Dizin içeriğini sayfa sayfa, en büyükler veya boyut özeti olarak göster"""
+        path = options['path'] or "."
+        scanner = DirectoryScanner(path, recursive=options['recursive'], max_depth=options['depth'],
+                                   extensions=options['extensions'], limit=options['limit'])
+        if options['summary']:
+            stats = scanner.aggregate()
+            lines = [f"📊 {path}: {stats['files']} dosya, {stats['dirs']} dizin, "
+                     f"toplam {self.format_size(stats['bytes'])}"]
+            lines += [f"   📂 {name}: {self.format_size(size)}" for name, size in stats['children']]
+            lines += [f"   🏷️ {ext}: {count} dosya, {self.format_size(size)}"
+                      for ext, (count, size) in stats['extensions']]
+            return "\n".join(lines)
         
-        return "📂 Kullanım: 'dosya liste [dizin]' veya 'dosya oku [dosya]'"
+        if options['largest']:
+            entries = scanner.largest(options['largest'])
+            lines = [f"📊 {path} içindeki en büyük {len(entries)} dosya:"]
+            lines += [f"📄 {os.path.relpath(entry.path, path)} ({self.format_size(entry.size)})"
+                      for entry in entries]
+            return "\n".join(lines)
+        
+        page = max(1, options['page'])
+        entries, total = scanner.page(page, 50)
+        pages = max(1, -(-total // 50))
+        lines = [f"📁 {path} (sayfa {page}/{pages}, {total} öğe):"]
+        for entry in entries:
+            name = os.path.relpath(entry.path, path) if options['recursive'] else entry.name
+            if entry.is_dir:
+                lines.append(f"📂 {name}/")
+            else:
+                lines.append(f"📄 {name} ({self.format_size(entry.size)})")
+        if page < pages:
+            command = f"dosya liste {path}"
+            if options['depth'] is not None:
+                command += f" derinlik {options['depth']}"
+            elif options['recursive']:
+                command += " -r"
+            command += ''.join(f" *.{ext.lstrip('.')}" for ext in options['extensions'])
+            lines.append(f"➡️ Sonraki sayfa: '{command} sayfa {page + 1}'")
+        if scanner.errors:
+            lines.append(f"⚠️ {scanner.errors} girdi okunamadı")
+        return "\n".join(lines)
 
     def format_size(self, size):
         """Dosya boyutunu formatla"""
@@ -449,99 +5625,206 @@ class QuantumiaAI:
             size /= 1024.0
         return f"{size:.1f} TB"
 
+    @intent("network", ["ping", "ip", "ağ", "network"], priority=2, kind=JOB_IO)
     def network_tools(self, query):
         """Ağ araçları"""
         if "ping" in query:
-            host = self.extract_host(query) or "google.com"
+            targets = self.extract_targets(query) or [("google.com", None)]
             try:
-                # Basit ping simülasyonu
-                result = f"🌐 Ping {host}:"
-                for i in range(4):
-                    time_ms = random.randint(10, 100)
-                    result += f"\n   {i+1}. {time_ms}ms"
-                    time.sleep(0.5)
-                return result
-            except:
-                return f"❌ {host} ping atılamadı"
+                if len(targets) == 1:
+                    return self.ping_host(*targets[0])
+                return self.ping_sweep(targets)
+            except Exception as e:
+                logger.error(f"Ping hatası: {e}")
+                return f"❌ {targets[0][0]} ping atılamadı"
         
         elif "ip" in query:
             try:
-                # Yerel IP
-                hostname = socket.gethostname()
-                local_ip = socket.gethostbyname(hostname)
-                
-                return f"🖥️ Yerel IP: {local_ip}"
+                return f"🖥️ Yerel IP: {local_ip()}"
             except Exception as e:
                 return f"❌ IP alınamadı: {e}"
         
-        return "🌐 Ağ komutları: 'ping google.com' veya 'ip göster'"
+        return "🌐 Ağ komutları: 'ping google.com', 'ping 192.168.1.0/24' veya 'ip göster'"
+
+    def extract_targets(self, query, limit=4096):
+        """Sorgudan prob hedeflerini çıkar: host, host:port veya CIDR ağı"""
+        targets = []
+        for word in query.split():
+            host, _, port = word.partition(':')
+            port = int(port) if port.isdigit() else None
+            if '/' in host:
+                try:
+                    network = ipaddress.ip_network(host, strict=False)
+                except ValueError:
+                    continue
+                hosts = network.hosts() if network.num_addresses > 1 else [network.network_address]
+                targets.extend((str(ip), port) for ip in itertools.islice(hosts, limit))
+            elif '.' in host or host == 'localhost':
+                targets.append((host, port))
+        return targets[:limit]
+
+    def stream(self, text):
+        """Uzun işlemlerin ara sonuçlarını geldikçe yazdır (toplu modda yalnız özet döner)"""
+        sink = getattr(self._local, 'stream_sink', None)
+        if sink is not None:
+            sink(text)
+        elif self.interactive:
+            print(f"\033[90m{text}\033[0m", flush=True)
 
-    def security_tools(self, query):
+    def ping_host(self, host, port=None, count=4):
+        """Tek hosta ardışık problar gönder, sonuçları akıt ve özetle"""
+        # Port verildiyse TCP, yoksa izin varsa ICMP
+        prober = NetworkProber(port=port or 80, method="tcp" if port else "auto")
+
+        def on_result(result):
+            if result.rtt is not None:
+                self.stream(f"   {result.seq}. {result.rtt * 1000:.1f}ms")
+            else:
+                self.stream(f"   {result.seq}. ❌ {result.error}")
+
+        self.stream(f"🌐 Ping {host}:")
+        results, method = prober.run([(host, port)], count, on_result)
+        rtts = [r.rtt * 1000 for r in sorted(results[host], key=lambda r: r.seq) if r.rtt is not None]
+        label = "icmp" if method == "icmp" else f"tcp:{prober.port}"
+        summary = (f"🌐 Ping {host} ({label}): {count} gönderildi, {len(rtts)} yanıt, "
+                   f"%{(count - len(rtts)) * 100 // count} kayıp")
+        stats = probe_stats(rtts)
+        if stats:
+            summary += (f"\n   min/ort/maks/titreşim = {stats['min']:.1f}/{stats['avg']:.1f}/"
+                        f"{stats['max']:.1f}/{stats['jitter']:.1f} ms")
+        return summary
+
+    def ping_sweep(self, targets):
+        """Birçok hedefi aynı anda tek probla tara, yanıt verenleri geldikçe akıt"""
+        prober = NetworkProber(method="tcp" if any(port for _, port in targets) else "auto")
+        reachable = []
+
+        def on_result(result):
+            if result.rtt is not None:
+                reachable.append(result)
+                self.stream(f"   ✅ {result.host} {result.rtt * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        _, method = prober.run(targets, 1, on_result)
+        elapsed = time.perf_counter() - start
+        summary = (f"🌐 Tarama ({method}): {len(targets)} hedef, {len(reachable)} yanıt verdi "
+                   f"({elapsed:.2f} s)")
+        stats = probe_stats([r.rtt * 1000 for r in reachable])
+        if stats:
+            summary += f"\n   min/ort/maks = {stats['min']:.1f}/{stats['avg']:.1f}/{stats['max']:.1f} ms"
+        return summary
+
+    @intent("security", ["şifre", "password", "hash", "güvenlik"], priority=3, kind=JOB_CPU, raw=True)
+    def security_tools(self, raw_query):
         """Güvenlik araçları"""
+        query = turkish_lower(raw_query)
         if "şifre" in query:
             length = 12
             if "uzun" in query:
                 length = 16
             elif "kısa" in query:
                 length = 8
+            match = re.search(r'(\d+)\s*(?:karakter|haneli)', query)
+            if match:
+                length = max(4, min(128, int(match.group(1))))
+            match = re.search(r'(\d+)\s*(?:adet|tane)', query)
+            count = max(1, min(100, int(match.group(1)))) if match else 1
+            policy = PasswordPolicy(length, exclude_ambiguous="okunaklı" in query or "karışmayan" in query)
+            entropy = f"🎲 Entropi: {policy.entropy_bits():.1f} bit ({len(policy.alphabet)} karakterlik alfabe)"
+            if count > 1:
+                passwords = PasswordGenerator(policy).generate(count)
+                return f"🔐 {count} Güvenli Şifre:\n" + "\n".join(f"   {p}" for p in passwords) + f"\n   {entropy}"
             
-            password = self.generate_password(length)
-            return f"🔐 Güvenli Şifre: {password}"
+            password = PasswordGenerator(policy).generate_one()
+            return f"🔐 Güvenli Şifre: {password}\n   {entropy}"
         
         elif "hash" in query:
-            text = self.extract_text(query) or "merhaba"
-            md5 = hashlib.md5(text.encode()).hexdigest()
-            sha256 = hashlib.sha256(text.encode()).hexdigest()
-            return f"🔒 Hash Değerleri:\n   MD5: {md5}\n   SHA256: {sha256}"
+            targets, algorithms = self.parse_hash_args(raw_query)
+            if targets:
+                return self.hash_files(targets, algorithms)
+            return self.hash_text(self.extract_text(query) or "merhaba")
         
-        return "🔒 Güvenlik: 'şifre oluştur' veya 'hash merhaba'"
+        return "🔒 Güvenlik: 'şifre oluştur', 'hash merhaba' veya 'hash [dosya/dizin...] [blake2b sha3_256 ...]'"
+
+    def parse_hash_args(self, raw_query):
+        """'hash' sonrası var olan yolları ve algoritma adlarını ayır (yol yoksa metin özetlenir)"""
+        targets, algorithms = [], []
+        for word in self.split_query(raw_query):
+            if turkish_lower(word) == 'hash':
+                continue
+            name = HASH_ALIASES.get(turkish_lower(word), turkish_lower(word))
+            if name in HASH_ALGORITHMS:
+                algorithms.append(name)
+            elif os.path.exists(word):
+                targets.append(word)
+        return targets, algorithms or list(DEFAULT_HASH_ALGORITHMS)
+
+    def hash_files(self, targets, algorithms, show=20):
+        """Dosyaları/dizin ağaçlarını özetle; değişmeyen dosyalar SQLite önbelleğinden gelir"""
+        hasher = FileHasher(algorithms, cache=self.hash_cache)
+        paths = hasher.expand(targets)
+        if not paths:
+            return "❌ Özetlenecek dosya bulunamadı"
+        job = current_job()
+        try:
+            results, stats = hasher.hash_paths(paths, job.cancel_event if job else None)
+        except HashCancelled:
+            return "🛑 Özetleme iptal edildi"
+        lines = [f"🔒 {stats['files']} dosya, {self.format_size(stats['bytes'])} "
+                 f"({stats['cached']} önbellekten, {stats['errors']} hata) - {stats['seconds']:.2f} s, "
+                 f"{stats['mb_per_s']:.1f} MB/s"]
+        if len(results) > 1 or any(os.path.isdir(target) for target in targets):
+            root = tree_root(targets)
+            for name in algorithms:
+                lines.append(f"   🌳 Ağaç {name}: {tree_digest(results, name, root)}")
+        for r in results[:show]:
+            if r.error:
+                lines.append(f"   ❌ {r.path}: {r.error}")
+                continue
+            lines.append(f"   📄 {r.path} ({self.format_size(r.size)}){' ♻️' if r.cached else ''}")
+            lines.extend(f"      {name}: {digest}" for name, digest in r.digests.items())
+        if len(results) > show:
+            lines.append(f"   ... ilk {show} dosya gösterildi")
+        return "\n".join(lines)
+
+    @cached()
+    def hash_text(self, text):
+        """Metnin hash değerleri (saf fonksiyon, kalıcı önbellekte)"""
+        md5 = hashlib.md5(text.encode()).hexdigest()
+        sha256 = hashlib.sha256(text.encode()).hexdigest()
+        return f"🔒 Hash Değerleri:\n   MD5: {md5}\n   SHA256: {sha256}"
 
     def generate_password(self, length=12):
-        """Güvenli şifre oluştur"""
-        chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()"
-        return ''.join(random.choice(chars) for _ in range(length))
+        """Güvenli şifre oluştur (secrets; her karakter sınıfından en az bir)"""
+        return PasswordGenerator(PasswordPolicy(length)).generate_one()
 
     def machine_learning_response(self, user_input):
         """Makine öğrenmesi ile akıllı yanıt"""
-        patterns = {
-            r"(merhaba|selam|hey|hi|hello)": [
-                "Merhaba! Nasılsınız?", "Selam! Size nasıl yardımcı olabilirim?"
-            ],
-            r"(teşekkür|sağol|thanks|thank you)": [
-                "Rica ederim!", "Ne demek! Her zaman yardıma hazırım."
-            ],
-            r"(nasılsın|ne haber|how are you)": [
-                "Çok iyiyim, teşekkür ederim! Sen nasılsın?", "Harikayım! Sorma!"
-            ],
-            r"(görüşürüz|hoşça kal|goodbye|bye)": [
-                "Görüşürüz! İyi günler.", "Hoşça kal! Sonra görüşelim."
-            ]
-        }
-        
-        for pattern, responses in patterns.items():
-            if re.search(pattern, user_input, re.IGNORECASE):
-                return random.choice(responses)
+        match = self.route(user_input, STAGE_ML)
+        if match:
+            return self.fill_response(random.choice(self.router.responses(match.intent)))
         
         return None
 
+    @intent("system", ["sistem", "bilgi", "cpu", "bellek", "ram"], priority=4)
+    @cached(ttl=2)
     def get_system_info(self):
         """Detaylı sistem bilgileri"""
         try:
-            cpu_percent = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            boot_time = datetime.datetime.fromtimestamp(psutil.boot_time())
+            sample = self.sampler.wait(timeout=1)
+            boot_time = datetime.datetime.fromtimestamp(self.sampler.boot_time)
             
             return (f"💻 Detaylı Sistem Bilgisi:\n"
-                   f"   CPU: {cpu_percent}% kullanımda\n"
-                   f"   RAM: {memory.percent}% kullanımda ({memory.used//1024//1024}MB/{memory.total//1024//1024}MB)\n"
-                   f"   Disk: {disk.percent}% dolu\n"
+                   f"   CPU: {sample.cpu}% kullanımda\n"
+                   f"   RAM: {sample.memory}% kullanımda ({sample.memory_used//1024//1024}MB/{sample.memory_total//1024//1024}MB)\n"
+                   f"   Disk: {sample.disk}% dolu\n"
                    f"   İşletim Sistemi: {platform.system()} {platform.release()}\n"
                    f"   Açılış Zamanı: {boot_time.strftime('%d/%m/%Y %H:%M')}\n"
                    f"   Çalışma Süresi: {datetime.datetime.now() - boot_time}")
         except:
             return "❌ Sistem bilgileri alınamadı."
 
+    @intent("time", ["saat", "tarih", "zaman", "ne zaman"], priority=5)
     def get_time_info(self):
         """Detaylı zaman bilgisi"""
         now = datetime.datetime.now()
@@ -550,12 +5833,19 @@ class QuantumiaAI:
                f"   Tarih: {now.strftime('%d/%m/%Y')}\n"
                f"   Gün: {now.strftime('%A')}")
 
+    @intent("calendar", ["takvim", "calendar", "ayın"], priority=6)
     def show_calendar(self):
         """Takvim göster"""
         now = datetime.datetime.now()
-        cal = calendar.month(now.year, now.month)
-        return f"📅 {now.strftime('%B %Y')} Takvimi:\n{cal}"
+        return self.month_calendar(now.year, now.month)
+
+    @cached()
+    def month_calendar(self, year, month):
+        """Ay takvimi (yıl/ay anahtarıyla kalıcı önbellekte)"""
+        cal = calendar.month(year, month)
+        return f"📅 {datetime.date(year, month, 1).strftime('%B %Y')} Takvimi:\n{cal}"
 
+    @intent("joke", ["şaka", "güldür", "komik", "espri"], priority=7)
     def tell_joke(self):
         """Espri yap"""
         jokes = [
@@ -568,6 +5858,7 @@ class QuantumiaAI:
         ]
         return f"😄 {random.choice(jokes)}"
 
+    @intent("help", ["yardım", "help", "ne yapabilirsin", "özellikler"], priority=8)
     def show_help(self):
         """Detaylı yardım menüsü"""
         return (
@@ -575,36 +5866,80 @@ class QuantumiaAI:
             "📊 SİSTEM: 'sistem' - Sistem bilgileri\n"
             "⏰ ZAMAN: 'saat' - Zaman ve tarih\n"
             "📅 TAKVİM: 'takvim' - Bu ayın takvimi\n"
-            "🌤️ HAVA: 'hava durumu [şehir]' - Hava durumu\n"
+            "🌤️ HAVA: 'hava durumu [şehir...]' - Bir veya birden çok şehir için hava durumu\n"
             "🧮 HESAP: 'hesapla' - Matematik işlemleri\n"
             "🎮 OYUN: 'oyun' - Mini oyunlar\n"
             "🌐 WEB: 'aç [site]' - Web sitesi aç\n"
+            "📚 VİKİPEDİ: 'X nedir', 'what is X' - Özet (önce yerel önbellek), '/wiki warm <döküm> [dil]', '/wiki stats'\n"
             "📂 DOSYA: 'dosya liste' - Dosyaları listele\n"
+            "📦 ARŞİV: 'arşiv liste|aç|oluştur <arşiv> [...]' - zip, tar.gz, tar.xz\n"
             "😄 EĞLENCE: 'şaka' - Espri yap\n"
-            "🔒 GÜVENLİK: 'şifre oluştur' - Şifre üret\n"
+            "🔒 GÜVENLİK: 'şifre oluştur [N karakter] [N adet] [okunaklı]' - Şifre üret, 'hash [dosya/dizin] [blake2b sha3_256]' - Dosya özetleri\n"
             "🌐 AĞ: 'ping google.com' - Ping at\n"
             "👤 KİŞİSEL: 'benim adım [isim]' - İsmini değiştir\n"
+            "📈 İZLEME: '/stats [dakika]' - CPU, RAM, disk ve ağ eğilimleri (varsayılan 5 dk)\n"
+            "⏱️ PROFİL: '/profile on' - Niyet gecikmeleri ('/profile', 'json', 'prometheus', 'cpu')\n"
+            "🗣️ GEÇMİŞ: '/history' - Konuşma geçmişi ('kategori AD', 'ara METİN', 'son 2 saat', 'tarih 2024-01-01', 'devam')\n"
+            "📥 AKTARIM: '/import <dosya> [csv|jsonl|xml] [yeniden]' - Bilgi dosyasını yükle (kesilirse kaldığı yerden)\n"
+            "💾 YEDEK: '/backup' - Artımlı yedek ('/backup list', 'verify', 'restore <kimlik>')\n"
             "🚪 ÇIKIŞ: '/exit' - Programdan çık"
         )
 
     def show_system_status(self):
         """Detaylı sistem durumu"""
-        cpu = psutil.cpu_percent()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        network = psutil.net_io_counters()
+        sample = self.sampler.wait(timeout=1)
+        if sample is None:
+            self.speak("❌ Sistem bilgileri alınamadı.", "warning")
+            return
+        stats, _ = self.sampler.summary(60)
         
         status = (
             f"📊 Detaylı Sistem Durumu:\n"
-            f"   🖥️ CPU: {cpu}% kullanımda\n"
-            f"   💾 RAM: {memory.percent}% ({memory.used//1024//1024}MB/{memory.total//1024//1024}MB)\n"
-            f"   💿 Disk: {disk.percent}% dolu\n"
-            f"   📡 Ağ: Gönderilen: {network.bytes_sent//1024}KB, Alınan: {network.bytes_recv//1024}KB\n"
+            f"   🖥️ CPU: {sample.cpu}% kullanımda (1 dk ort. {stats['cpu'][1]:.1f}%)\n"
+            f"   💾 RAM: {sample.memory}% ({sample.memory_used//1024//1024}MB/{sample.memory_total//1024//1024}MB)\n"
+            f"   💿 Disk: {sample.disk}% dolu\n"
+            f"   📡 Ağ: ↑ {format_rate(sample.sent_rate)}, ↓ {format_rate(sample.recv_rate)} "
+            f"(toplam gönderilen {sample.bytes_sent//1024}KB, alınan {sample.bytes_recv//1024}KB)\n"
             f"   🕐 Çalışma Süresi: {datetime.datetime.now() - self.start_time}\n"
-            f"   💬 Konuşma Sayısı: {len(self.conversation_history)}"
+            f"   💬 Konuşma Sayısı: {len(self.history)}\n"
+            f"   {self.format_cache_stats()}"
         )
         self.speak(status, "info")
 
+    def show_system_trends(self, arg=""):
+        """/stats [dakika]: örnekleyici penceresinden ortalamalar, hızlar ve grafikler"""
+        try:
+            minutes = float(arg) if arg else 5.0
+        except ValueError:
+            minutes = None
+        if minutes is None or not math.isfinite(minutes) or minutes <= 0:
+            self.speak("Kullanım: /stats [dakika]", "warning")
+            return
+        stats, span = self.sampler.summary(minutes * 60)
+        if not stats:
+            self.speak("⏳ Henüz sistem örneği yok.", "info")
+            return
+        _, series = self.sampler.window(minutes * 60)
+        rows = (("🖥️ CPU", 'cpu', "{:5.1f}%"), ("💾 RAM", 'memory', "{:5.1f}%"), ("💿 Disk", 'disk', "{:5.1f}%"),
+                ("📤 Gönderim", 'sent_rate', None), ("📥 Alım", 'recv_rate', None))
+        lines = [f"📈 Sistem eğilimleri (son {span / 60:.1f} dk, {len(series['cpu'])} örnek, "
+                 f"{self.sampler.interval:g} s aralık):"]
+        for label, name, fmt in rows:
+            last, mean, low, high = stats[name]
+            show = fmt.format if fmt else format_rate
+            bounds = (0, 100) if fmt else (0, None)
+            lines.append(f"   {label:<12} {sparkline(series[name], 40, *bounds)}  "
+                         f"son {show(last)} | ort {show(mean)} | en yüksek {show(high)}")
+        self.speak("\n".join(lines), "info")
+
+    def format_cache_stats(self):
+        """Yanıt önbelleği sayaçlarını biçimlendir"""
+        stats = self.response_cache.stats()
+        return (f"🗃️ Önbellek: {stats['entries']} kayıt ({self.format_size(stats['bytes'])}), "
+                f"{stats['hits']} isabet / {stats['misses']} ıskalama "
+                f"(%{stats['hit_rate'] * 100:.0f}), {stats['evictions']} tahliye, "
+                f"{stats['expirations']} süresi dolan")
+
     def show_modules(self):
         """Aktif modülleri göster"""
         active = [mod for mod, active in self.modules.items() if active]
@@ -617,101 +5952,437 @@ class QuantumiaAI:
         )
         self.speak(status, "info")
 
-    def show_history(self):
-        """Konuşma geçmişini göster"""
-        if not self.conversation_history:
-            self.speak("Henüz konuşma geçmişi yok.", "info")
+    def show_history(self, args=()):
+        """/history [kategori AD] [ara METİN] [son N dk|saat|gün] [tarih BAŞ [SON]] | /history devam"""
+        args = list(args)
+        if args and turkish_lower(args[0]) in ('devam', 'daha', 'sonraki'):
+            if not self._history_query or self._history_query[1] is None:
+                self.speak("Gösterilecek başka kayıt yok.", "info")
+                return
+            filters, cursor = self._history_query
+        else:
+            try:
+                filters, cursor = self.parse_history_filters(args), None
+            except ValueError:
+                self.speak("Kullanım: /history [kategori AD] [ara METİN] [son N dk|saat|gün] "
+                           "[tarih YYYY-AA-GG [YYYY-AA-GG]] | /history devam", "warning")
+                return
+        try:
+            page = self.history.page(cursor, **filters)
+        except Exception as e:
+            logger.error(f"Geçmiş sorgu hatası: {e}")
+            self.speak("❌ Konuşma geçmişi okunamadı.", "sad")
             return
-        
-        self.speak("🗣️ Son Konuşmalar:", "info")
-        for timestamp, message in list(self.conversation_history)[-5:]:
-            time_str = timestamp.strftime("%H:%M:%S")
-            print(f"   [{time_str}] {message}")
+        self._history_query = (filters, page.cursor)
+        if not page.rows:
+            self.speak("Henüz konuşma geçmişi yok." if not any(filters.values()) else "Eşleşen kayıt yok.", "info")
+            return
+        labels = {'category': 'kategori', 'text': 'metin', 'since': 'başlangıç', 'until': 'bitiş'}
+        described = [f"{label}: {str(filters[key])[:16]}" for key, label in labels.items() if filters[key]]
+        lines = [f"🗣️ Konuşma Geçmişi{' (' + ', '.join(described) + ')' if described else ''}:"]
+        for _, timestamp, user_input, response, category in page.rows:
+            when = datetime.datetime.fromisoformat(timestamp).strftime("%d/%m %H:%M:%S")
+            response = (response or '').replace('\n', ' ')
+            if len(response) > 80:
+                response = response[:77] + "..."
+            lines.append(f"   [{when}] ({category}) 👤 {user_input} → {response}")
+        if page.cursor:
+            lines.append("   ➡️ Devamı: '/history devam'")
+        self.speak("\n".join(lines), "info")
+
+    def parse_history_filters(self, args):
+        """/history argümanlarını ConversationHistory.page() filtrelerine çevir"""
+        filters = {'limit': 10, 'category': None, 'text': None, 'since': None, 'until': None}
+        units = {'dk': 'minutes', 'dakika': 'minutes', 'saat': 'hours', 'gün': 'days'}
+        i = 0
+        while i < len(args):
+            word = turkish_lower(args[i])
+            rest = args[i + 1:]
+            if word in ('kategori', 'category') and rest:
+                filters['category'] = rest[0]
+                i += 2
+            elif word in ('ara', 'search'):
+                filters['text'] = ' '.join(rest) or None
+                break
+            elif word == 'son' and len(rest) >= 2 and rest[0].isdigit() and turkish_lower(rest[1]) in units:
+                delta = datetime.timedelta(**{units[turkish_lower(rest[1])]: int(rest[0])})
+                filters['since'] = (datetime.datetime.now() - delta).isoformat()
+                i += 3
+            elif word == 'tarih' and rest:
+                has_end = len(rest) > 1 and rest[1][:1].isdigit()
+                start = datetime.date.fromisoformat(rest[0])
+                end = datetime.date.fromisoformat(rest[1]) if has_end else start
+                filters['since'] = start.isoformat()
+                filters['until'] = (end + datetime.timedelta(days=1)).isoformat()
+                i += 3 if has_end else 2
+            elif word == 'limit' and rest and rest[0].isdigit():
+                filters['limit'] = max(1, min(100, int(rest[0])))
+                i += 2
+            else:
+                raise ValueError(args[i])
+        return filters
 
     def create_backup(self):
-        """Sistem yedeği oluştur"""
+        """Artımlı yedek: veritabanı anlık görüntüsü + içerik adresli parçalar"""
         try:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = f"backups/quantumia_backup_{timestamp}.zip"
-            
-            with zipfile.ZipFile(backup_file, 'w') as zipf:
-                for file in ['quantumia_config.json', 'ai_memory.db']:
-                    if os.path.exists(file):
-                        zipf.write(file)
-            
-            self.speak(f"✅ Yedek oluşturuldu: {backup_file}", "info")
+            self.writer.flush()
+            if not self.save_config():
+                self.speak("⚠️ Yapılandırma kaydedilemedi; yedek son kaydedilen sürümü içerecek", "warning")
+            manifest = self.backups.backup(self.memory_file, [self.config_file])
+            stats = manifest['stats']
+            self.speak(f"✅ Yedek oluşturuldu: {manifest['id']} "
+                       f"({self.format_size(stats['bytes'])}, {stats['new_chunks']}/{stats['chunks']} yeni parça, "
+                       f"+{self.format_size(stats['stored_bytes'])} depolandı, {stats['seconds']:.1f} s)", "info")
+        except BackupCancelled:
+            logger.info("Yedekleme iptal edildi")
         except Exception as e:
             self.speak(f"❌ Yedek oluşturulamadı: {e}", "error")
 
+    def import_knowledge(self, path, fmt=None, restart=False, progress=None):
+        """Bilgi dosyasını knowledge tablosuna aktar ve özet metni döndür"""
+        self.writer.flush()
+        importer = KnowledgeImporter(self.memory_file, self.memory_settings, fts=self.fts_enabled)
+        status = importer.run(path, fmt, progress=progress or self._import_progress, restart=restart)
+        return self.format_import(status)
+
+    def _import_progress(self, status):
+        report_progress(f"{status.records:,} kayıt, {status.inserted:,} eklendi, "
+                        f"{(status.records - status.resumed_from) / max(status.seconds, 1e-9):,.0f} kayıt/s")
+
+    def format_import(self, status):
+        """ImportStatus özetini kullanıcı metnine çevir"""
+        name = os.path.basename(status.source)
+        if status.state == 'done' and status.seconds == 0:
+            return f"📥 {name} zaten aktarılmış ({status.inserted:,} kayıt). Baştan almak için: /import {name} yeniden"
+        processed = status.records - status.resumed_from
+        text = (f"{status.records:,} kayıt: {status.inserted:,} eklendi, {status.duplicates:,} tekrar, "
+                f"{status.invalid:,} geçersiz ({status.seconds:.1f} s, "
+                f"{processed / max(status.seconds, 1e-9):,.0f} kayıt/s)")
+        if status.resumed_from:
+            text += f", {status.resumed_from:,}. kayıttan sürdürüldü"
+        if status.state != 'done':
+            return f"⏸️ {name} aktarımı durdu, {text}. Devam için: /import {name}"
+        return f"✅ {name} aktarıldı, {text}"
+
+    def import_command(self, args):
+        """/import [<dosya> [csv|jsonl|xml] [yeniden]]"""
+        if not args:
+            pending = KnowledgeImporter(self.memory_file, self.memory_settings).pending()
+            if not pending:
+                self.speak("Kullanım: /import <dosya> [csv|jsonl|xml] [yeniden]", "warning")
+                return
+            lines = ["📥 Yarıda kalan aktarımlar (/import <dosya> ile sürer):"]
+            for source, position, inserted in pending:
+                lines.append(f"   {source}: {position:,} kayıt işlendi, {inserted:,} eklendi")
+            self.speak("\n".join(lines), "info")
+            return
+        path, options = args[0], [option.lower() for option in args[1:]]
+        if not os.path.exists(path):
+            self.speak(f"❌ Dosya bulunamadı: {path}", "warning")
+            return
+        fmt = next((option for option in options if option in KNOWLEDGE_IMPORT_FORMATS), None)
+        if fmt is None and knowledge_format(path) not in KNOWLEDGE_IMPORT_FORMATS:
+            self.speak(f"❌ Biçim anlaşılamadı, belirtin: {', '.join(KNOWLEDGE_IMPORT_FORMATS)}", "warning")
+            return
+        restart = any(option in ("yeniden", "restart") for option in options)
+        self.run_job("import", lambda: self.import_knowledge(path, fmt, restart))
+
+    def backup_command(self, args):
+        """/backup list | verify [kimlik] | restore <kimlik>"""
+        action, rest = args[0], args[1:]
+        if action in ("list", "liste"):
+            self.list_backups()
+        elif action in ("verify", "doğrula"):
+            self.run_job("verify", lambda: self.verify_backup(rest[0] if rest else None), JOB_CPU)
+        elif action in ("restore", "geri") and rest:
+            self.run_job("restore", lambda: self.restore_backup(rest[0]))
+        else:
+            self.speak("Kullanım: /backup [list | verify [kimlik] | restore <kimlik|son>]", "warning")
+
+    def profile_command(self, args):
+        """/profile [on | off | reset | json [dosya] | prometheus [dosya] | cpu [N | off]]"""
+        action = args[0].lower() if args else ""
+        if not action:
+            self.speak(self.format_profile(), "info")
+        elif action in ("on", "aç"):
+            metrics.enabled = True
+            self.speak("⏱️ Ölçüm açıldı. /profile ile sonuçları görebilirsin.", "info")
+        elif action in ("off", "kapat"):
+            metrics.enabled = False
+            self.speak("⏱️ Ölçüm kapatıldı.", "info")
+        elif action in ("reset", "sıfırla"):
+            metrics.reset()
+            self.speak("⏱️ Ölçümler sıfırlandı.", "info")
+        elif action in ("json", "prometheus"):
+            default = 'data/metrics.json' if action == "json" else 'data/metrics.prom'
+            path = args[1] if len(args) > 1 else default
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(metrics.to_json() if action == "json" else metrics.to_prometheus())
+                self.speak(f"💾 Ölçümler yazıldı: {path}", "info")
+            except OSError as e:
+                self.speak(f"❌ Ölçümler yazılamadı: {e}", "error")
+        elif action == "cpu":
+            option = args[1].lower() if len(args) > 1 else ""
+            if option in ("off", "kapat", "dur"):
+                path = f"data/profile_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+                hotspots = metrics.stop_profiling(dump_path=path)
+                if hotspots is None:
+                    self.speak("cProfile örneklemesi açık değil.", "warning")
+                else:
+                    self.speak(f"🔥 En pahalı çağrılar ({path}):\n{hotspots or 'örnek alınmadı'}", "info")
+            else:
+                every = int(option) if option.isdigit() else 10
+                metrics.start_profiling(every)
+                self.speak(f"🔬 cProfile örneklemesi açıldı (her {every} yanıttan biri). "
+                           "'/profile cpu off' ile sıcak noktaları gör.", "info")
+        else:
+            self.speak("Kullanım: /profile [on | off | reset | json [dosya] | prometheus [dosya] | cpu [N | off]]",
+                       "warning")
+
+    def format_profile(self):
+        """Tür ve ada göre gecikme tablosu"""
+        snapshot = metrics.snapshot()
+        state = "açık" if metrics.enabled else "kapalı ('/profile on' ile aç)"
+        lines = [f"⏱️ Gecikme Profili (ölçüm {state}):"]
+        if not snapshot:
+            lines.append("   Henüz ölçüm yok.")
+        for kind, names in snapshot.items():
+            lines.append(f"   [{kind}]")
+            for name, stats in sorted(names.items(), key=lambda item: -item[1]['total_ms']):
+                errors = f"  ❌ {stats['errors']}" if stats['errors'] else ""
+                lines.append(f"     {name:<22} {stats['count']:>7}×  p50 {stats['p50_ms']:8.2f}  "
+                             f"p95 {stats['p95_ms']:8.2f}  p99 {stats['p99_ms']:8.2f}  "
+                             f"maks {stats['max_ms']:8.2f} ms{errors}")
+        return "\n".join(lines)
+
+    def list_backups(self, limit=20):
+        """Son yedekleri göster"""
+        ids = self.backups.manifests()
+        if not ids:
+            self.speak("Henüz yedek yok.", "info")
+            return
+        lines = ["💾 Yedekler:"]
+        for backup_id in ids[-limit:]:
+            try:
+                stats = self.backups.load_manifest(backup_id)['stats']
+                lines.append(f"   {backup_id}  {self.format_size(stats['bytes']):>10}  "
+                             f"+{self.format_size(stats['stored_bytes'])}")
+            except (OSError, ValueError, KeyError) as e:
+                lines.append(f"   {backup_id}  ❌ okunamadı: {e}")
+        self.speak("\n".join(lines), "info")
+
+    def verify_backup(self, backup_id=None):
+        """Yedeğin tüm parçalarını ve dosya özetlerini doğrula"""
+        resolved = self.backups.resolve(backup_id)
+        if resolved is None:
+            return "❌ Yedek bulunamadı", "warning"
+        try:
+            problems = self.backups.verify(resolved)
+        except BackupCancelled:
+            return None
+        except Exception as e:
+            return f"❌ Doğrulama hatası: {e}", "error"
+        if problems:
+            return f"❌ {resolved} bozuk:\n   " + "\n   ".join(problems[:10]), "sad"
+        return f"✅ {resolved} doğrulandı", "happy"
+
+    def restore_backup(self, backup_id):
+        """Yedeği doğrulayıp canlı veritabanına ve yapılandırmaya geri yükle"""
+        resolved = self.backups.resolve(backup_id)
+        if resolved is None:
+            return "❌ Yedek bulunamadı", "warning"
+        try:
+            self.writer.flush()
+            self.save_config()
+            restored = self.backups.restore(resolved, {
+                os.path.basename(self.memory_file): self.memory_file,
+                os.path.basename(self.config_file): self.config_file
+            })
+        except BackupCancelled:
+            return None
+        except Exception as e:
+            return f"❌ Geri yükleme başarısız (mevcut veriler değişmedi): {e}", "error"
+        if os.path.basename(self.config_file) in restored:
+            self.load_config()
+        self.response_cache.clear()
+        self.semantic.reset()
+        return f"✅ {resolved} geri yüklendi: {', '.join(restored)}", "happy"
+
     def check_updates(self):
         """Güncellemeleri kontrol et"""
         self.speak("🔍 Güncellemeler kontrol ediliyor...", "info")
-        time.sleep(2)
+        if cancellable_sleep(2):
+            return
         self.speak("✅ Sistem güncel", "happy")
 
     def run(self):
         """Ana çalıştırma döngüsü"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            self.speak("\nProgram sonlandırılıyor...", "warning")
+            self.shutdown_jobs()
+            self.cleanup()
+
+    async def run_async(self):
+        """Olay döngüsü: giriş ayrı iş parçacığında okunur, yavaş işleyiciler iş havuzunda çalışır"""
+        self.jobs = JobManager(asyncio.get_running_loop())
         self.speak(f"Merhaba {self.user_name}! Ben {self.name}, gelişmiş yapay zeka asistanın. 🤖", "excited")
         self.speak("'/' ile başlayarak sistem komutlarını kullanabilirsin. /help yazabilirsin. 🌟", "info")
         
         while True:
             try:
-                user_input = self.listen()
+                user_input = await self.read_input_async()
+                if user_input.startswith('/'):
+                    user_input = self.process_system_command(user_input)
                 
                 if user_input == "/exit":
                     self.speak(f"Görüşürüz {self.user_name}! İyi günler. 👋", "happy")
+                    self.shutdown_jobs()
                     self.cleanup()
                     break
                 
                 if not user_input:
                     continue
                 
-                # Makine öğrenmesi yanıtı
-                ml_response = self.machine_learning_response(user_input)
-                if ml_response:
-                    self.speak(ml_response, "happy")
-                    continue
-                
-                # Gelişmiş komut işleme
-                response = self.process_advanced_commands(user_input)
-                if response:
-                    self.speak(response, "neutral")
-                    continue
-                
-                # Doğal konuşma
-                response = self.natural_conversation(user_input)
-                self.speak(response, "neutral")
+                with metrics.timer('dispatch', 'repl'):
+                    self.dispatch(user_input)
                 
-            except KeyboardInterrupt:
-                self.speak("\nProgram sonlandırılıyor...", "warning")
-                self.cleanup()
-                break
             except Exception as e:
                 logger.error(f"Ana döngü hatası: {e}")
                 self.speak("❌ Bir hata oluştu, lütfen tekrar deneyin.", "sad")
 
-    def natural_conversation(self, user_input):
+    async def read_input_async(self):
+        """input() çağrısını olay döngüsünü bloklamayan bir daemon iş parçacığında yap"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def reader():
+            line = self.read_input()
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(line))
+
+        self._awaiting_input = True
+        threading.Thread(target=reader, name="quantumia-input", daemon=True).start()
+        try:
+            return await future
+        finally:
+            self._awaiting_input = False
+
+    def dispatch(self, user_input):
+        """Hızlı niyetleri hemen yanıtla, yavaş olanları iş olarak başlat"""
+        # ML kalıpları → gelişmiş komutlar → doğal konuşma, tek yönlendirme geçişiyle
+        match = self.route(user_input)
+        kind = self.router.kind(match.intent) if match else JOB_SYNC
+        if kind == JOB_SYNC or self.jobs is None:
+            response, emotion = self.converse(user_input, match)
+            self.speak(response, emotion)
+            return None
+        return self.run_job(match.intent, lambda: self.converse(user_input, match), kind)
+
+    def converse(self, user_input, match=None):
+        """Girdiyi yanıtla ve turu geçmişe yaz (yanıtlanamayanlar öğrenme kategorisinde)"""
+        self._local.fallback = False
+        response, emotion = self.respond(user_input, match)
+        category = FALLBACK_CATEGORY if self._local.fallback else (match.intent if match else "general")
+        self.save_to_memory(user_input, response, category)
+        return response, emotion
+
+    def batch_record(self, seq, tag, query, match):
+        """Tek sorguyu yanıtla ve JSONL kaydı olarak döndür"""
+        start = time.perf_counter()
+        record = {'seq': seq}
+        if tag is not None:
+            record['id'] = tag
+        record['query'] = query
+        try:
+            response, emotion = self.respond(query, match)
+            record.update(intent=match.intent if match else None, response=response, emotion=emotion)
+        except Exception as e:
+            record['error'] = str(e)
+        record['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return record
+
+    def run_batch(self, source, sink, workers=32, ordered=True, window=4096):
+        """Sorguları akıştan oku, JSONL sonuçları yaz; işlenen sorgu sayısını döndür
+
+        Senkron niyetler (yönlendirici, ML/doğal yanıtlar) okuyan iş parçacığında hemen
+        yanıtlanır; G/Ç ve CPU niyetleri havuzda çalışır. ordered=False ise sonuçlar
+        bittikçe yazılır ve 'seq' alanıyla eşleştirilir. Bellekte en fazla window bekleyen
+        sonuç tutulur.
+        """
+        pending = deque()
+        write = sink.write
+
+        def emit(item):
+            record = item if isinstance(item, dict) else item.result()
+            write(json.dumps(record, ensure_ascii=False))
+            write('\n')
+
+        count = 0
+        with ThreadPoolExecutor(workers, thread_name_prefix="quantumia-batch") as executor:
+            for count, (tag, query, error) in enumerate(iter_batch_queries(source), 1):
+                if error:
+                    item = {'seq': count, 'error': error}
+                    if tag is not None:
+                        item['id'] = tag
+                else:
+                    match = self.route(query)
+                    if match is None or self.router.kind(match.intent) == JOB_SYNC:
+                        item = self.batch_record(count, tag, query, match)
+                    else:
+                        item = executor.submit(self.batch_record, count, tag, query, match)
+                if ordered:
+                    pending.append(item)
+                    while pending and (isinstance(pending[0], dict) or pending[0].done()):
+                        emit(pending.popleft())
+                    while len(pending) > window:
+                        emit(pending.popleft())
+                elif isinstance(item, dict):
+                    emit(item)
+                else:
+                    pending.append(item)
+                    if len(pending) > window:
+                        done, rest = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            emit(future)
+                        pending = deque(rest)
+            for item in (pending if ordered else as_completed(pending)):
+                emit(item)
+        sink.flush()
+        return count
+
+    def new_session(self, user_name=None):
+        """Sunucu oturumu: yönlendirici, önbellek, dizin ve veritabanını paylaşan, kullanıcı adı,
+        geçmiş ve ruh hali kendine ait sığ kopya"""
+        session = copy.copy(self)
+        session.session_id = uuid.uuid4().hex
+        session.user_name = user_name or self.user_name
+        session.mood = self.mood
+        session.history = ConversationHistory(self.writer, self.db_pool, fts=self.history.fts)
+        session._history_query = None
+        session.interactive = False
+        session.last_seen = time.monotonic()
+        return session
+
+    def shutdown_jobs(self):
+        if self.jobs is not None:
+            self.jobs.shutdown()
+
+    def natural_conversation(self, user_input, match=None):
         """Doğal konuşma yanıtları"""
-        patterns_responses = {
-            "merhaba": [f"Merhaba {self.user_name}! Nasılsın? 😊", "Selam! Bugün nasılsın?", "Hoş geldin!"],
-            "selam": ["Selam! Nasılsın?", "Merhaba! Bugün nasılsın?", "Selamlar!"],
-            "teşekkür": ["Rica ederim!", "Ne demek! Her zaman yardıma hazırım.", "Benim için zevk!"],
-            "sağol": ["Rica ederim!", "Önemli değil!", "Her zaman!"],
-            "nasılsın": ["Çok iyiyim, teşekkür ederim! Sen nasılsın?", "Harikayım! Sorma!", "Süperim!"],
-            "iyiyim": ["Harika duydum! 😊", "Güzel!", "Sevindim!"],
-            "görüşürüz": ["Görüşürüz! İyi günler. 👋", "Hoşça kal! Sonra görüşelim.", "Güle güle!"],
-            "hoşça kal": ["Hoşça kalın!", "Görüşmek üzere!", "Kendinize iyi bakın!"],
-            "sen kimsin": [f"Ben {self.name}, {self.creator} tarafından geliştirilen gelişmiş bir yapay zekayım. 🤖", 
-                          f"Ben {self.name}! Size yardımcı olmak için buradayım."],
-            "adın ne": [f"Benim adım {self.name}. 👾", f"Bana {self.name} diyebilirsin. 😊"],
-            "aşk": ["❤️ Sevgi evrenin en güçlü enerjisidir.", "🤖 İnsan-AI dostluğu benim için önemli!"],
-            "yemek": ["🍕 Pizza sever misin?", "🍔 Burger mi yoksa döner mi?", "🥗 Sağlıklı yemekler en iyisi!"],
-            "müzik": ["🎵 Hangi tür müzikleri seversin?", "🎸 Rock müzik dinlemeyi severim!", "🎶 Müzik ruhun gıdasıdır."]
-        }
+        match = match or self.route(user_input, STAGE_NATURAL)
+        if match:
+            return self.fill_response(random.choice(self.router.responses(match.intent)))
 
-        for pattern, responses in patterns_responses.items():
-            if pattern in user_input.lower():
-                return random.choice(responses)
+        # Geçmiş konuşmalar ve bilgi tablosunda benzer bir kayıt ara
+        try:
+            with self.db_pool.connection() as conn:
+                answer = self.semantic.answer(user_input, conn)
+            if answer:
+                return answer
+        except Exception as e:
+            logger.error(f"Anlamsal arama hatası: {e}")
 
         # Öğrenmeye çalış
         learning_responses = [
@@ -721,22 +6392,166 @@ class QuantumiaAI:
             "Bu konuda henüz bilgim yok, ama öğrenmek isterim! 🌟",
             f"{self.user_name}, bu konuda bana biraz daha bilgi verebilir misin? 😊"
         ]
+        self._local.fallback = True
         return random.choice(learning_responses)
 
+    def fill_response(self, response):
+        """Sabit yanıttaki {user_name}, {name}, {creator} alanlarını doldur"""
+        if '{' not in response:
+            return response
+        return response.format(user_name=self.user_name, name=self.name, creator=self.creator)
+
     def cleanup(self):
         """Temizlik işlemleri"""
         try:
+            self.sampler.stop()
+            self.weather.close()
+            self.weather.cache.close()
+            self.wiki.close()
+            self.wiki.cache.close()
+            self.writer.close()
+            self.semantic.save()
+            self.db_pool.close()
             self.conn.close()
             self.save_config()
+            self.config_store.close()
             logger.info("Sistem temiz bir şekilde kapatıldı")
         except Exception as e:
             logger.error(f"Temizlik hatası: {e}")
 
 # -------------------- ANA PROGRAM --------------------
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştır"""
+    parser = argparse.ArgumentParser(description="Quantumia - Ultimate Yapay Zeka Sistemi")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Başlangıç aşamalarının süre dökümünü yazdır ve çık")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='DOSYA',
+                        help="Sorguları dosyadan veya stdin'den (-) oku, JSONL sonuç yaz")
+    parser.add_argument('--output', '-o', default='-', metavar='DOSYA',
+                        help="Toplu mod çıktısı (varsayılan stdout)")
+    parser.add_argument('--workers', type=int, default=32,
+                        help="Toplu modda G/Ç ve CPU niyetleri için iş parçacığı sayısı")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Toplu mod sonuçlarını bittikçe yaz ('seq' ile eşleştir)")
+    parser.add_argument('--log-json', action='store_true',
+                        help="quantumia.log kayıtlarını satır başına bir JSON nesnesi (JSONL) olarak yaz")
+    parser.add_argument('--metrics', action='store_true',
+                        help="Gecikme ölçümünü baştan aç (/profile, GET /metrics)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Niyet hattını HTTP/JSON sunucusu olarak çalıştır")
+    parser.add_argument('--count', type=int, metavar='N',
+                        help="N adet şifre üret ve satır satır yaz (--output, --length ile)")
+    parser.add_argument('--length', type=int, default=16, help="--count şifre uzunluğu")
+    parser.add_argument('--classes', default=','.join(PASSWORD_CLASSES),
+                        help="--count karakter sınıfları (lower,upper,digit,symbol)")
+    parser.add_argument('--no-ambiguous', action='store_true',
+                        help="--count şifrelerinde karışabilen karakterleri (Il1O0o) çıkar")
+    parser.add_argument('--import', dest='import_path', metavar='DOSYA',
+                        help="CSV/JSONL/XML bilgi dosyasını knowledge tablosuna aktar (.gz olabilir)")
+    parser.add_argument('--format', choices=KNOWLEDGE_IMPORT_FORMATS,
+                        help="--import biçimi (varsayılan: uzantıdan)")
+    parser.add_argument('--restart', action='store_true',
+                        help="--import'u kaldığı yerden sürdürmek yerine baştan al")
+    parser.add_argument('--host', default='127.0.0.1', help="Sunucu adresi")
+    parser.add_argument('--port', type=int, default=8765, help="Sunucu portu")
+    parser.add_argument('--token', default=os.environ.get('QUANTUMIA_TOKEN'),
+                        help="Sunucu erişim anahtarı (Authorization: Bearer); --host loopback değilse "
+                             "verilmezse rastgele üretilir")
+    parser.add_argument('--allow-host', action='append', default=[], metavar='AD',
+                        help="Host başlığında kabul edilecek ek ad (tekrarlanabilir)")
+    return parser.parse_args(argv)
+
+def run_server_mode(args):
+    """--serve: oturumlu HTTP sunucusunu Ctrl+C'ye kadar çalıştır"""
+    token = args.token
+    if not token and not is_loopback(args.host):
+        # Ağa açık sunucu anahtarsız çalışmaz: dosya, arşiv ve yedek işleyicileri uzaktan erişilebilir
+        token = secrets.token_urlsafe(24)
+        print(f"🔑 Erişim anahtarı: {token}", file=sys.stderr, flush=True)
+    ai = QuantumiaAI(interactive=False)
+    server = QuantumiaServer((args.host, args.port), ai, token=token, allowed_hosts=args.allow_host)
+    host, port = server.server_address[:2]
+    print(f"🌐 {ai.name} http://{host}:{port} adresinde dinliyor (Ctrl+C ile dur)", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        ai.cleanup()
+
+def run_batch_mode(args):
+    """--batch: ekran ve renk çıktısı olmadan toplu işle, özeti stderr'e yaz"""
+    ai = QuantumiaAI(interactive=False)
+    source = sys.stdin if args.batch == '-' else open(args.batch, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', buffering=1024 * 1024)
+    start = time.perf_counter()
+    try:
+        count = ai.run_batch(source, sink, workers=args.workers, ordered=not args.unordered)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        ai.cleanup()
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count:,} sorgu {elapsed:.2f} s ({count / max(elapsed, 1e-9) * 60:,.0f}/dk)", file=sys.stderr)
+
+def run_password_mode(args):
+    """--count N: şifreleri gruplar halinde üretip akıt, özeti stderr'e yaz"""
+    policy = PasswordPolicy(args.length, [name for name in args.classes.split(',') if name],
+                            exclude_ambiguous=args.no_ambiguous)
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', buffering=1024 * 1024)
+    start = time.perf_counter()
+    try:
+        generator = PasswordGenerator(policy)
+        for password in generator.stream(args.count):
+            sink.write(password + "\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    print(f"✅ {args.count:,} şifre {elapsed:.2f} s ({args.count / max(elapsed, 1e-9):,.0f}/s), "
+          f"şifre başına {policy.entropy_bits():.1f} bit entropi", file=sys.stderr)
+
+def run_import_mode(args):
+    """--import: bilgi dosyasını aktar, ilerlemeyi stderr'e yaz (Ctrl+C sonrası aynı komutla sürer)"""
+    ai = QuantumiaAI(interactive=False)
+
+    def progress(status):
+        rate = (status.records - status.resumed_from) / max(status.seconds, 1e-9)
+        print(f"\r📥 {status.records:,} kayıt, {status.inserted:,} eklendi, {status.duplicates:,} tekrar, "
+              f"{rate:,.0f} kayıt/s", end='', file=sys.stderr, flush=True)
+
+    try:
+        message = ai.import_knowledge(args.import_path, args.format, args.restart, progress)
+        print(f"\r{message}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\n⏸️ Durduruldu; devam için aynı komutu çalıştırın.", file=sys.stderr)
+    finally:
+        ai.cleanup()
+
 if __name__ == "__main__":
     try:
-        ai = QuantumiaAI()
-        ai.run()
+        args = parse_args()
+        if args.log_json:
+            setup_logging(json_format=True)
+        metrics.enabled = args.metrics
+        if args.count is not None:
+            run_password_mode(args)
+        elif args.import_path:
+            run_import_mode(args)
+        elif args.batch:
+            run_batch_mode(args)
+        elif args.serve:
+            run_server_mode(args)
+        elif args.profile_startup:
+            ai = QuantumiaAI()
+            ai.wait_for_startup()
+            print(ai.profiler.report())
+            ai.cleanup()
+        else:
+            QuantumiaAI().run()
     except Exception as e:
         print(f"❌ Kritik hata: {e}")
         print("Lütfen log dosyasını kontrol edin: quantumia.log")
@@ -223,10 +223,10 @@ install_requirements() {
         warning_msg "requirements.txt bulunamadı, temel paketler kuruluyor..."
         
         # Temel paketleri kur
-        pip3 install requests wikipedia psutil pyjokes scikit-learn numpy
+        pip3 install requests psutil pyjokes scikit-learn numpy
         
         # Kurulumu doğrula
-        if python3 -c "import requests, wikipedia, psutil, pyjokes, sklearn, numpy" &> /dev/null; then
+        if python3 -c "import requests, psutil, pyjokes, sklearn, numpy" &> /dev/null; then
             success_msg "Temel paketler başarıyla kuruldu"
             
             # requirements.txt oluştur
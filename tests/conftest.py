@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Ortak test düzeneği: depo kökü içe aktarma yolunda, yerel soket/sunucu fixture'ları"""
+
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def closed_port():
+    """Dinleyeni olmayan bir port (bağlantı reddedilir)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def weather_server():
+    """benchmark.py'deki Open-Meteo taklidi; istek sayacı sıfırdan başlar"""
+    import benchmark
+    benchmark.StubWeatherHandler.hits = 0
+    benchmark.StubWeatherHandler.connections = set()
+    with benchmark.stub_weather_server() as base_url:
+        yield base_url
+
+
+@pytest.fixture
+def wiki_server():
+    """benchmark.py'deki Vikipedi taklidi ("Yok" ile başlayan başlıklar 404)"""
+    import benchmark
+    benchmark.StubWikiHandler.hits = 0
+    with benchmark.stub_wiki_server() as base_url:
+        yield base_url
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""ArchiveToolkit: güvensiz üye yolları ve bağlantılar reddedilir, reddedilen arşivden hiçbir şey yazılmaz"""
+
+import io
+import os
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+import run
+
+needs_symlinks = pytest.mark.skipif(sys.platform == 'win32', reason="sembolik bağlantı izni gerekir")
+
+
+def make_tar(path, members):
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def make_zip(path, members):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return path
+
+
+@pytest.fixture(params=['tar.gz', 'zip'])
+def make_archive(request, tmp_path):
+    def make(members):
+        path = os.path.join(tmp_path, f"test.{request.param}")
+        return (make_zip if request.param == 'zip' else make_tar)(path, members)
+    return make
+
+
+@pytest.fixture(params=[1, 4], ids=['tek', 'havuz'])
+def toolkit(request):
+    return run.ArchiveToolkit(workers=request.param)
+
+
+@pytest.fixture
+def dest(tmp_path):
+    return os.path.join(tmp_path, "hedef")
+
+
+@pytest.fixture
+def outside(tmp_path):
+    path = os.path.join(tmp_path, "dışarı")
+    os.mkdir(path)
+    return path
+
+
+def tree(path):
+    return sorted(os.path.relpath(os.path.join(d, name), path)
+                  for d, dirs, files in os.walk(path) for name in dirs + files)
+
+
+def test_safe_archive_is_extracted(make_archive, toolkit, dest):
+    archive = make_archive([("a.txt", b"a"), ("alt/b.txt", b"b" * 5000), ("alt/derin/c.txt", b"c")])
+    stats = toolkit.extract(archive, dest)
+    assert stats['files'] == 3
+    assert tree(dest) == ["a.txt", "alt", os.path.join("alt", "b.txt"), os.path.join("alt", "derin"),
+                          os.path.join("alt", "derin", "c.txt")]
+    with open(os.path.join(dest, "alt", "b.txt"), 'rb') as f:
+        assert f.read() == b"b" * 5000
+
+
+@pytest.mark.parametrize('name', ["../kaçak.txt", "alt/../../kaçak.txt", "/tmp/kaçak.txt", "C:/kaçak.txt"])
+def test_traversal_member_is_rejected_before_anything_is_written(make_archive, toolkit, dest, tmp_path, name):
+    # Güvensiz üye sonda: ondan önceki güvenli üyeler de yazılmamalı
+    archive = make_archive([("önce.txt", b"1"), ("alt/önce.txt", b"2"), (name, b"zararli")])
+    with pytest.raises(run.ArchiveError):
+        toolkit.extract(archive, dest)
+    assert tree(dest) == []
+    assert not os.path.exists(os.path.join(tmp_path, "kaçak.txt"))
+
+
+@needs_symlinks
+def test_symlinked_parent_pointing_outside_is_not_followed(make_archive, toolkit, dest, outside):
+    os.makedirs(dest)
+    os.symlink(outside, os.path.join(dest, "bağ"))
+    archive = make_archive([("bağ/yeni/dosya.txt", b"zararli")])
+    with pytest.raises(run.ArchiveError):
+        toolkit.extract(archive, dest)
+    assert os.listdir(outside) == []
+
+
+@needs_symlinks
+def test_existing_symlink_at_target_is_not_followed(make_archive, toolkit, dest, outside):
+    victim = os.path.join(outside, "kurban.txt")
+    with open(victim, 'wb') as f:
+        f.write(b"orijinal")
+    os.makedirs(dest)
+    os.symlink(victim, os.path.join(dest, "dosya.txt"))
+    archive = make_archive([("dosya.txt", b"zararli")])
+    with pytest.raises(run.ArchiveError):
+        toolkit.extract(archive, dest)
+    with open(victim, 'rb') as f:
+        assert f.read() == b"orijinal"
+
+
+@needs_symlinks
+def test_symlink_inside_destination_is_allowed(make_archive, toolkit, dest):
+    os.makedirs(os.path.join(dest, "gerçek"))
+    os.symlink(os.path.join(dest, "gerçek"), os.path.join(dest, "kısayol"))
+    toolkit.extract(make_archive([("kısayol/dosya.txt", b"tamam")]), dest)
+    with open(os.path.join(dest, "gerçek", "dosya.txt"), 'rb') as f:
+        assert f.read() == b"tamam"
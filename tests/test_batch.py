@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Toplu mod: girdi satırlarının ayrıştırılması, sıralı/sırasız JSONL çıktısı ve hata satırları"""
+
+import io
+import json
+import threading
+import time
+import types
+
+import pytest
+
+import run
+
+
+class FakeRouter:
+    def kind(self, intent):
+        return run.JOB_IO if intent == 'slow' else run.JOB_SYNC
+
+
+def batch_ai():
+    """run_batch() için gereken üç alanla örnek: 'yavaş N' havuzda N×10 ms sürer, 'hata' patlar"""
+    ai = object.__new__(run.QuantumiaAI)
+    ai.router = FakeRouter()
+    ai.threads = set()
+
+    def route(query):
+        return types.SimpleNamespace(intent='slow' if query.startswith('yavaş') else 'fast')
+
+    def respond(query, match):
+        ai.threads.add(threading.current_thread().name)
+        if query.startswith('yavaş'):
+            time.sleep(int(query.split()[1]) / 100)
+        if 'hata' in query:
+            raise RuntimeError("işleyici patladı")
+        return query.upper(), 'mutlu'
+
+    ai.route = route
+    ai.respond = respond
+    return ai
+
+
+def run_batch(lines, **kwargs):
+    ai = batch_ai()
+    sink = io.StringIO()
+    count = ai.run_batch(io.StringIO("\n".join(lines) + "\n"), sink, workers=8, **kwargs)
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    return count, records, ai
+
+
+@pytest.mark.parametrize('line, expected', [
+    ("merhaba", (None, "merhaba", None)),
+    ('"merhaba dünya"', (None, "merhaba dünya", None)),
+    ('"Ankara" nedir', (None, '"Ankara" nedir', None)),
+    ('{"id": 7, "query": "saat"}', (7, "saat", None)),
+    ('{"id": "a", "text": "tarih"}', ("a", "tarih", None)),
+    ('{"message": "selam", "query": 5}', (None, "selam", None)),
+    ('{"id": 8}', (8, None, "sorgu alanı yok")),
+    ('[1, 2]', (None, "[1, 2]", None)),
+])
+def test_iter_batch_queries(line, expected):
+    assert list(run.iter_batch_queries([line])) == [expected]
+
+
+def test_invalid_json_object_is_an_error_and_blank_lines_are_skipped():
+    (tag, query, error), = run.iter_batch_queries(["", "   ", '{"query": "x"'])
+    assert tag is None and query is None and error.startswith("geçersiz JSON")
+
+
+LINES = [
+    "yavaş 20",
+    '{"id": "j1", "query": "merhaba"}',
+    '{"id": "bozuk"',
+    "yavaş 1",
+    '{"id": "j2"}',
+    '{"id": "h", "query": "yavaş 5 hata"}',
+    "",
+    '"Ankara" nedir',
+    "anında hata",
+]
+
+
+def test_ordered_output_follows_input_with_error_lines():
+    count, records, ai = run_batch(LINES, ordered=True)
+    assert count == 8
+    assert [record['seq'] for record in records] == list(range(1, 9))
+    by_seq = {record['seq']: record for record in records}
+    assert by_seq[1]['response'] == "YAVAŞ 20" and by_seq[1]['intent'] == 'slow'
+    assert by_seq[2] == {**by_seq[2], 'id': "j1", 'response': "MERHABA", 'emotion': 'mutlu'}
+    assert by_seq[3]['error'].startswith("geçersiz JSON") and 'query' not in by_seq[3]
+    assert by_seq[5] == {'seq': 5, 'id': "j2", 'error': "sorgu alanı yok"}
+    assert by_seq[6]['id'] == "h" and by_seq[6]['error'] == "işleyici patladı"
+    assert by_seq[7]['query'] == '"Ankara" nedir' and 'error' not in by_seq[7]
+    assert by_seq[8]['error'] == "işleyici patladı" and 'response' not in by_seq[8]
+    assert all('latency_ms' in by_seq[seq] for seq in (1, 2, 4, 6, 7, 8))
+    # Yavaş niyetler havuzda, diğerleri okuyan iş parçacığında yanıtlanır
+    assert any(name.startswith("quantumia-batch") for name in ai.threads)
+
+
+def test_unordered_output_is_emitted_as_results_finish():
+    count, records, _ = run_batch(LINES, ordered=False)
+    assert count == 8
+    seqs = [record['seq'] for record in records]
+    assert sorted(seqs) == list(range(1, 9))
+    # Senkron sonuçlar ve hata satırları beklemeden yazılır; en yavaş iş en sona kalır
+    assert seqs[-1] == 1
+    assert seqs.index(2) < seqs.index(4) and seqs.index(3) < seqs.index(4)
+    assert {record['seq']: record.get('id') for record in records}[6] == "h"
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_small_window_keeps_every_record(ordered):
+    lines = [f"yavaş {(i * 7) % 5}" if i % 3 else f"soru {i}" for i in range(60)]
+    count, records, _ = run_batch(lines, ordered=ordered, window=2)
+    assert count == 60
+    seqs = [record['seq'] for record in records]
+    assert (seqs == list(range(1, 61))) if ordered else (sorted(seqs) == list(range(1, 61)))
+    assert all(record['response'] == line.upper()
+               for record, line in zip(sorted(records, key=lambda r: r['seq']), lines))
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""ConfigStore: debounce, atomik yazım, anlık görüntü geri dönüşü ve başarısız yazımın yeniden denenmesi"""
+
+import json
+import os
+import time
+
+import pytest
+
+import run
+
+
+@pytest.fixture
+def store_factory(tmp_path):
+    stores = []
+
+    def make(config, **settings):
+        path = os.path.join(tmp_path, "quantumia_config.json")
+        store = run.ConfigStore(path, lambda: dict(config), **settings)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def leftovers(path):
+    folder = os.path.dirname(path)
+    return [name for name in os.listdir(folder) if name.endswith('.tmp')]
+
+
+def test_changes_within_debounce_are_coalesced(store_factory):
+    config = {'user_data': {}}
+    store = store_factory(config, debounce=0.2, max_delay=5.0)
+    for i in range(50):
+        config['user_data'] = {'n': i}
+        store.mark_dirty()
+    assert store.writes == 0 and store.pending() == 50
+    deadline = time.monotonic() + 3
+    while store.pending() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert store.writes == 1
+    assert store.load() == {'user_data': {'n': 49}}
+
+
+def test_continuous_changes_are_written_by_max_delay(store_factory):
+    config = {'user_data': {}}
+    store = store_factory(config, debounce=0.2, max_delay=0.3)
+    start = time.monotonic()
+    while store.writes == 0 and time.monotonic() - start < 3:
+        store.mark_dirty()
+        time.sleep(0.05)
+    assert store.writes == 1
+    assert time.monotonic() - start < 1.0
+
+
+def test_flush_replaces_file_atomically(store_factory, monkeypatch):
+    config = {'user_data': {'a': 1}}
+    store = store_factory(config, debounce=60)
+    store.mark_dirty()
+    assert store.flush(timeout=5)
+    with open(store.path, 'rb') as f:
+        before = f.read()
+
+    def fail_replace(src, dst):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(run.os, 'replace', fail_replace)
+    config['user_data'] = {'a': 2}
+    store.mark_dirty()
+    assert not store.flush(timeout=5)
+    with open(store.path, 'rb') as f:
+        assert f.read() == before
+    assert leftovers(store.path) == []
+
+
+def test_failed_write_is_retried_with_backoff(store_factory, monkeypatch):
+    config = {'user_data': {'a': 1}}
+    store = store_factory(config, debounce=0.05, retry_max=0.5)
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        calls.append(time.monotonic())
+        if len(calls) <= 2:
+            raise PermissionError(13, "Permission denied")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(run.os, 'replace', flaky_replace)
+    store.mark_dirty()
+    deadline = time.monotonic() + 5
+    while store.pending() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert store.pending() == 0
+    assert store.failures == 2 and store.writes == 1
+    assert store.load() == {'user_data': {'a': 1}}
+    # Aralık ikiye katlanır: 0.5 s, ardından 0.5 s sınırı
+    assert calls[1] - calls[0] >= 0.45 and calls[2] - calls[1] >= 0.45
+
+
+def test_snapshot_used_until_json_is_edited(store_factory):
+    config = {'user_data': {f"k{i}": i for i in range(20)}}
+    store = store_factory(config, snapshot_threshold=10)
+    store.mark_dirty()
+    assert store.flush(timeout=5)
+    assert os.path.exists(store.snapshot_path)
+    with open(store.snapshot_path, 'rb') as f:
+        data = f.read()
+    # JSON'dan farklı içerikli ama geçerli başlıklı anlık görüntü: load() onu okumalı
+    header = run.CONFIG_SNAPSHOT_HEADER.unpack_from(data)
+    payload = run.marshal.dumps({'user_data': 'snapshot'})
+    with open(store.snapshot_path, 'wb') as f:
+        f.write(run.CONFIG_SNAPSHOT_HEADER.pack(*header[:5], run.zlib.crc32(payload)) + payload)
+    assert store.load() == {'user_data': 'snapshot'}
+    # Elle düzenlenen JSON anlık görüntüden önceliklidir
+    with open(store.path, 'w', encoding='utf-8') as f:
+        json.dump({'user_data': {'edited': True}}, f)
+    assert store.load() == {'user_data': {'edited': True}}
+
+
+def test_corrupt_snapshot_falls_back_to_json(store_factory):
+    config = {'user_data': {f"k{i}": i for i in range(20)}}
+    store = store_factory(config, snapshot_threshold=10)
+    store.mark_dirty()
+    assert store.flush(timeout=5)
+    with open(store.snapshot_path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert store.load() == config
+
+
+def test_small_config_removes_stale_snapshot(store_factory):
+    config = {'user_data': {f"k{i}": i for i in range(20)}}
+    store = store_factory(config, snapshot_threshold=10)
+    store.mark_dirty()
+    assert store.flush(timeout=5)
+    config['user_data'] = {'k': 1}
+    store.mark_dirty()
+    assert store.flush(timeout=5)
+    assert not os.path.exists(store.snapshot_path)
+    assert store.load() == config
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""FileHasher ve ağaç özeti: göreli yollar istenen köke göre hesaplanır"""
+
+import os
+
+import run
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def digest(targets):
+    hasher = run.FileHasher(['sha256'])
+    results, _ = hasher.hash_paths(hasher.expand(targets))
+    return run.tree_digest(results, 'sha256', run.tree_root(targets))
+
+
+def test_nested_file_differs_from_top_level_file(tmp_path):
+    nested, flat = os.path.join(tmp_path, "nested"), os.path.join(tmp_path, "flat")
+    write(os.path.join(nested, "sub", "a.txt"), b"veri")
+    write(os.path.join(flat, "a.txt"), b"veri")
+    assert digest([nested]) != digest([flat])
+
+
+def test_same_tree_in_different_places_has_same_digest(tmp_path):
+    for name in ("bir", "iki"):
+        write(os.path.join(tmp_path, name, "sub", "a.txt"), b"a")
+        write(os.path.join(tmp_path, name, "sub", "deep", "b.txt"), b"b")
+    assert digest([os.path.join(tmp_path, "bir")]) == digest([os.path.join(tmp_path, "iki")])
+
+
+def test_new_top_level_file_does_not_rename_existing_entries(tmp_path):
+    root = os.path.join(tmp_path, "ağaç")
+    write(os.path.join(root, "sub", "a.txt"), b"a")
+    write(os.path.join(root, "sub", "b.txt"), b"b")
+    hasher = run.FileHasher(['sha256'])
+    results, _ = hasher.hash_paths(hasher.expand([root]))
+    before = run.tree_digest(results, 'sha256', run.tree_root([root]))
+    write(os.path.join(root, "c.txt"), b"c")
+    results, _ = hasher.hash_paths(hasher.expand([root]))
+    # Eklenen dosya çıkarılınca özet eskisine döner: kök, dosyalarla kaymıyor
+    kept = [r for r in results if not r.path.endswith("c.txt")]
+    assert run.tree_digest(kept, 'sha256', run.tree_root([root])) == before
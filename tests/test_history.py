@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""ConversationHistory.page ve /history: imleçle (keyset) sayfalama, filtreler ve 'devam'"""
+
+import datetime
+import os
+import sqlite3
+
+import pytest
+
+import benchmark
+import run
+
+ROWS = 200
+
+
+@pytest.fixture(scope='module')
+def database(tmp_path_factory):
+    path = os.path.join(tmp_path_factory.mktemp("history"), "history.db")
+    vocabulary, start = benchmark.fill_conversations(path, ROWS)
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT id, timestamp, user_input, response, category FROM conversations").fetchall()
+    return path, vocabulary, start, rows
+
+
+@pytest.fixture(params=[True, False], ids=['fts', 'like'])
+def history(request, database):
+    path = database[0]
+    pool = run.ConnectionPool(path)
+    writer = run.WriteBehindQueue(path)
+    yield run.ConversationHistory(writer, pool, fts=request.param)
+    writer.close()
+    pool.close()
+
+
+def walk(history, limit, **filters):
+    """Tüm sayfaları imleçle dolaş: (id listesi, sayfa sayısı)"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = history.page(cursor, limit, **filters)
+        assert len(page.rows) <= limit
+        ids.extend(row[0] for row in page.rows)
+        pages += 1
+        if page.cursor is None:
+            return ids, pages
+        assert page.cursor == page.rows[-1][0]
+        cursor = page.cursor
+
+
+@pytest.mark.parametrize('limit', [1, 7, 20, ROWS, ROWS + 5])
+def test_pages_cover_every_row_newest_first(history, limit):
+    ids, pages = walk(history, limit)
+    assert ids == list(range(ROWS, 0, -1))
+    assert pages == max(1, -(-ROWS // limit))
+
+
+def test_category_filter(history, database):
+    rows = database[3]
+    ids, _ = walk(history, 9, category='weather')
+    assert ids == sorted((row[0] for row in rows if row[4] == 'weather'), reverse=True)
+
+
+def test_text_filter(history, database):
+    _, vocabulary, _, rows = database
+    # FTS5 önek, LIKE alt dizgi eşler: başka kelimenin parçası olmayan ASCII kelimede ikisi de tam eşleşir
+    distinct = [w for w in vocabulary if w.isascii() and not any(w in other for other in vocabulary if other != w)]
+    word = max(distinct, key=lambda w: sum(w in row[2].split() + row[3].split() for row in rows))
+    ids, _ = walk(history, 5, text=word)
+    expected = sorted((row[0] for row in rows if word in row[2].split() + row[3].split()), reverse=True)
+    assert ids == expected and len(ids) > 5
+
+
+def test_time_range_filter(history, database):
+    _, _, start, rows = database
+    since = (start + datetime.timedelta(seconds=15 * 40)).isoformat()
+    until = (start + datetime.timedelta(seconds=15 * 90)).isoformat()
+    ids, _ = walk(history, 8, since=since, until=until)
+    assert ids == sorted((row[0] for row in rows if since <= row[1] < until), reverse=True)
+    ids, _ = walk(history, 8, since=since, until=until, category='weather')
+    assert ids == sorted((row[0] for row in rows if since <= row[1] < until and row[4] == 'weather'),
+                         reverse=True)
+
+
+def test_since_after_last_row_is_empty(history, database):
+    since = (database[2] + datetime.timedelta(days=365)).isoformat()
+    assert history.page(None, 10, since=since) == run.HistoryPage([], None)
+
+
+def test_cursor_is_stable_while_new_turns_arrive(tmp_path):
+    path = os.path.join(tmp_path, "live.db")
+    benchmark.fill_conversations(path, 30)
+    pool = run.ConnectionPool(path)
+    writer = run.WriteBehindQueue(path)
+    history = run.ConversationHistory(writer, pool)
+    try:
+        first = history.page(None, 10)
+        for i in range(5):
+            history.record(f"yeni soru {i}", "yeni yanıt", "general")
+        # OFFSET ile ikinci sayfa 5 satır kayardı; imleç kaldığı yerden devam eder
+        second = history.page(first.cursor, 10)
+        assert [row[0] for row in second.rows] == list(range(20, 10, -1))
+        assert history.page(None, 5).rows[0][2] == "yeni soru 4"
+        assert [turn.user_input for turn in history.recent(2)] == ["yeni soru 3", "yeni soru 4"]
+    finally:
+        writer.close()
+        pool.close()
+
+
+@pytest.fixture
+def history_ai(history):
+    ai = object.__new__(run.QuantumiaAI)
+    ai.history = history
+    ai._history_query = None
+    ai.said = []
+    ai.speak = lambda text, emotion=None: ai.said.append(text)
+    return ai
+
+
+def test_history_command_continues_with_devam(history_ai):
+    history_ai.show_history(["limit", "80"])
+    history_ai.show_history(["devam"])
+    history_ai.show_history(["devam"])
+    pages = history_ai.said
+    assert [page.count("👤") for page in pages] == [80, 80, 40]
+    assert "/history devam" in pages[1] and "/history devam" not in pages[2]
+    history_ai.show_history(["devam"])
+    assert history_ai.said[-1] == "Gösterilecek başka kayıt yok."
+
+
+def test_history_command_filters_and_usage(history_ai):
+    history_ai.show_history(["kategori", "weather", "limit", "100"])
+    assert "kategori: weather" in history_ai.said[-1]
+    assert all("(weather)" in line for line in history_ai.said[-1].splitlines()[1:] if "👤" in line)
+    history_ai.show_history(["tarih", "1990-01-01"])
+    assert history_ai.said[-1] == "Eşleşen kayıt yok."
+    history_ai.show_history(["bilinmeyen"])
+    assert history_ai.said[-1].startswith("Kullanım: /history")
+
+
+def test_parse_history_filters(history_ai):
+    filters = history_ai.parse_history_filters(["kategori", "hava", "tarih", "2024-01-01", "2024-01-03",
+                                                "limit", "500", "ara", "iki", "kelime"])
+    assert filters == {'limit': 100, 'category': "hava", 'text': "iki kelime",
+                       'since': "2024-01-01", 'until': "2024-01-04"}
+    since = datetime.datetime.fromisoformat(history_ai.parse_history_filters(["son", "2", "saat"])['since'])
+    assert abs((datetime.datetime.now() - since) - datetime.timedelta(hours=2)) < datetime.timedelta(seconds=5)
+    with pytest.raises(ValueError):
+        history_ai.parse_history_filters(["son", "2", "yıl"])
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""NetworkProber: yerel dinleyicilerle ulaşılabilir / reddedilen / zaman aşımı ve tarama süresi"""
+
+import socket
+import sys
+import time
+
+import pytest
+
+import run
+
+TIMEOUT = 0.5
+SWEEP = 256
+
+
+def sweep_targets(port, count=SWEEP):
+    """127.0.0.0/8 içinde count farklı adres (hepsi loopback, hepsi aynı porta)"""
+    return [(f"127.0.{i // 250}.{i % 250 + 1}", port) for i in range(count)]
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket()
+    sock.bind(("0.0.0.0", 0))
+    sock.listen(512)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+@pytest.fixture
+def blackhole():
+    """Kabul kuyruğu dolu dinleyici: yeni SYN'ler düşürülür, bağlantı zaman aşımına uğrar"""
+    if not sys.platform.startswith('linux'):
+        pytest.skip("dolu kabul kuyruğunda SYN düşürme Linux davranışı")
+    sock = socket.socket()
+    sock.bind(("0.0.0.0", 0))
+    sock.listen(0)
+    port = sock.getsockname()[1]
+    fillers = []
+    for _ in range(4):
+        filler = socket.socket()
+        filler.setblocking(False)
+        try:
+            filler.connect(("127.0.0.1", port))
+        except BlockingIOError:
+            pass
+        fillers.append(filler)
+    time.sleep(0.1)
+    yield port
+    for filler in fillers:
+        filler.close()
+    sock.close()
+
+
+def probe_one(port):
+    prober = run.NetworkProber(timeout=TIMEOUT, method="tcp", interval=0)
+    results, method = prober.run([("127.0.0.1", port)], count=1)
+    assert method == "tcp"
+    return results["127.0.0.1"][0]
+
+
+def test_listening_port_is_up(listener):
+    result = probe_one(listener)
+    assert result.error is None
+    assert 0 <= result.rtt < TIMEOUT
+
+
+def test_refused_port_counts_as_reachable(closed_port):
+    result = probe_one(closed_port)
+    assert result.error is None
+    assert 0 <= result.rtt < TIMEOUT
+
+
+def test_dropped_syn_times_out(blackhole):
+    start = time.perf_counter()
+    result = probe_one(blackhole)
+    assert result.rtt is None
+    assert result.error == "zaman aşımı"
+    assert time.perf_counter() - start < TIMEOUT * 2
+
+
+def test_sweep_of_reachable_targets_is_concurrent(listener):
+    prober = run.NetworkProber(timeout=TIMEOUT, method="tcp", interval=0)
+    start = time.perf_counter()
+    results, _ = prober.run(sweep_targets(listener), count=1)
+    elapsed = time.perf_counter() - start
+    assert len(results) == SWEEP
+    assert all(probes[0].error is None for probes in results.values())
+    assert elapsed < TIMEOUT * 2
+
+
+def test_sweep_of_unreachable_targets_is_bounded_by_one_timeout(blackhole):
+    prober = run.NetworkProber(timeout=TIMEOUT, method="tcp", interval=0)
+    start = time.perf_counter()
+    results, _ = prober.run(sweep_targets(blackhole), count=1)
+    elapsed = time.perf_counter() - start
+    assert len(results) == SWEEP
+    assert all(probes[0].error == "zaman aşımı" for probes in results.values())
+    # Sıralı tarama SWEEP × TIMEOUT sürerdi; eşzamanlı tarama yaklaşık tek zaman aşımıdır
+    assert elapsed < TIMEOUT * 2
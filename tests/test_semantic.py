@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""SemanticIndex: eşitleme/yeniden eğitim yarışı ve pickle'sız model kaydı"""
+
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pytest
+
+import run
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = os.path.join(tmp_path, "memory.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE conversations (id INTEGER PRIMARY KEY, user_input TEXT, response TEXT, category TEXT)")
+    conn.execute("CREATE TABLE knowledge (id INTEGER PRIMARY KEY, topic TEXT, information TEXT)")
+    conn.executemany("INSERT INTO conversations (user_input, response, category) VALUES (?, ?, 'chat')",
+                     [(f"soru {i} elma armut", f"yanıt {i}") for i in range(20)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_rows(path, rows):
+    with sqlite3.connect(path) as conn:
+        conn.executemany("INSERT INTO conversations (user_input, response, category) VALUES (?, ?, 'chat')", rows)
+
+
+@pytest.fixture
+def index(db, tmp_path):
+    index = run.SemanticIndex(db, os.path.join(tmp_path, "semantic_index.npz"), refit_ratio=1e9)
+    index.refit()
+    return index
+
+
+def test_sync_drops_batch_when_refit_lands_in_between(index, db):
+    add_rows(db, [("kiraz vişne çilek", "meyve"), ("kayısı şeftali", "yaz meyvesi")])
+    read_docs = index._read_docs
+
+    def read_then_refit(conn, last_ids):
+        docs = read_docs(conn, last_ids)
+        index.refit()  # Yeni sözlükle eğitim, eşitleme kilidi almadan önce biter
+        return docs
+
+    index._read_docs = read_then_refit
+    index.sync()
+    index._read_docs = read_docs
+    assert index.tail is None
+    assert len(index.doc_rowid) == len(set(index.doc_rowid.tolist())) == 22
+    assert index.last_ids['conversations'] == 22
+    assert index.query("kiraz vişne")[0][2] == 21
+    add_rows(db, [("şeftali şeftali kayısı", "yaz meyvesi")])
+    index.sync()
+    assert index.tail.shape == (1, index.matrix.shape[1])
+    assert index.query("şeftali")[0][2] == 23
+
+
+def test_model_round_trips_without_pickle(index, db, tmp_path):
+    add_rows(db, [("kiraz vişne çilek", "meyve")])
+    index.sync()
+    index.save()
+    with np.load(index.model_path, allow_pickle=False) as state:
+        assert all(state[name].dtype != object for name in state.files)
+    loaded = run.SemanticIndex(db, index.model_path)
+    assert loaded.load()
+    assert loaded.last_ids == index.last_ids
+    assert loaded.query("kiraz") == index.query("kiraz")
+    assert loaded.query("armut elma", k=3) == index.query("armut elma", k=3)
+
+
+def test_corrupt_model_falls_back_to_refit(db, tmp_path):
+    path = os.path.join(tmp_path, "semantic_index.npz")
+    with open(path, "wb") as f:
+        f.write(b"bozuk")
+    assert not run.SemanticIndex(db, path).load()
+
+
+def test_reset_waits_for_running_refit_and_reindexes(index, db):
+    # Geri yükleme: aynı rowid'ler artık başka içerik taşıyor
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM conversations")
+        conn.executemany("INSERT INTO conversations (id, user_input, response, category) VALUES (?, ?, ?, 'chat')",
+                         [(i, f"mango papaya {i}", f"tropik {i}") for i in range(1, 6)])
+    index._refit_lock.acquire()  # Geri yüklemeden önce başlamış arka plan eğitimi
+    worker = threading.Thread(target=index.reset)
+    worker.start()
+    worker.join(0.2)
+    assert worker.is_alive()
+    index._refit_lock.release()
+    worker.join(5)
+    assert index.last_ids == {'conversations': 5, 'knowledge': 0}
+    assert sorted(index.doc_rowid.tolist()) == [1, 2, 3, 4, 5]
+    assert index.query("elma armut") == []
+    assert index.query("mango")[0][2] in range(1, 6)
+
+
+def test_reset_on_empty_database_forgets_saved_model(index, db):
+    index.dirty = True
+    index.save()
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM conversations")
+    index.reset()
+    assert not index.ready
+    assert not os.path.exists(index.model_path)
+    assert index.query("elma") == []
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""QuantumiaServer: Host izin listesi, erişim anahtarı ve istek gövdesi doğrulaması"""
+
+import http.client
+import json
+import socket
+import threading
+import types
+import uuid
+
+import pytest
+
+import run
+
+TOKEN = "gizli-anahtar"
+
+
+class FakeAI:
+    """new_session() dışında hiçbir şeye dokunulmayan yerine geçen nesne"""
+    def new_session(self, user_name=None):
+        session = types.SimpleNamespace(session_id=uuid.uuid4().hex, user_name=user_name or "Kullanıcı",
+                                        mood="mutlu", history=types.SimpleNamespace(recent=lambda: []))
+        session.route = lambda query: None
+        session.converse = lambda query, match: (f"yankı: {query}", "mutlu")
+        return session
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(token=None, allowed_hosts=(), host="127.0.0.1"):
+        server = run.QuantumiaServer((host, 0), FakeAI(), token=token, allowed_hosts=allowed_hosts)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def call(server, method, path, body=None, headers=None):
+    """İsteği gönder: (durum, başlıklar, JSON gövde); başlıklar otomatik eklenmez"""
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+        headers = {'Host': 'localhost', **(headers or {})}
+        if body is not None and 'Content-Length' not in headers:
+            headers['Content-Length'] = str(len(body))
+        for name, value in headers.items():
+            if value is not None:
+                conn.putheader(name, value)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, response.headers, json.loads(response.read() or b'null')
+    finally:
+        conn.close()
+
+
+def post_json(server, path, payload, **headers):
+    return call(server, 'POST', path, json.dumps(payload).encode(),
+                {'Content-Type': 'application/json', **headers})
+
+
+def test_chat_round_trip(serve):
+    server = serve()
+    status, _, body = post_json(server, '/chat', {'query': "merhaba"})
+    assert status == 200 and body['response'] == "yankı: merhaba"
+
+
+@pytest.mark.parametrize('host', ["localhost", "localhost:8080", "127.0.0.1:80", "[::1]:8080", "LOCALHOST"])
+def test_loopback_host_headers_are_accepted(serve, host):
+    assert call(serve(), 'GET', '/health', headers={'Host': host})[0] == 200
+
+
+@pytest.mark.parametrize('host', ["evil.example", "evil.example:8080", "127.0.0.1.evil.example", "", None])
+def test_foreign_host_is_rejected(serve, host):
+    status, headers, body = call(serve(), 'GET', '/health', headers={'Host': host})
+    assert status == 403 and 'Host' in body['error']
+    assert headers['Connection'] == 'close'
+
+
+def test_allow_host_extends_the_list(serve):
+    server = serve(allowed_hosts=["Quantumia.LAN"])
+    assert call(server, 'GET', '/health', headers={'Host': "quantumia.lan:8080"})[0] == 200
+
+
+def test_wildcard_bind_accepts_machine_name(serve):
+    server = serve(host="0.0.0.0")
+    assert socket.gethostname().lower() in server.allowed_hosts
+    assert "evil.example" not in server.allowed_hosts
+
+
+@pytest.mark.parametrize('authorization', [None, "", "Bearer", "Bearer yanlis", f"bearer {TOKEN}", TOKEN])
+def test_missing_or_wrong_token_is_rejected(serve, authorization):
+    server = serve(token=TOKEN)
+    status, headers, _ = post_json(server, '/sessions', {}, Authorization=authorization)
+    assert status == 401
+    assert headers['WWW-Authenticate'] == 'Bearer'
+    assert call(server, 'GET', '/metrics', headers={'Authorization': authorization})[0] == 401
+
+
+def test_valid_token_is_accepted_and_health_stays_open(serve):
+    server = serve(token=TOKEN)
+    assert post_json(server, '/sessions', {}, Authorization=f"Bearer {TOKEN}")[0] == 201
+    assert call(server, 'GET', '/health')[0] == 200
+
+
+def test_host_is_checked_before_token(serve):
+    server = serve(token=TOKEN)
+    status = post_json(server, '/chat', {'query': "x"}, Host="evil.example", Authorization=f"Bearer {TOKEN}")[0]
+    assert status == 403
+
+
+@pytest.mark.parametrize('content_type', [None, "text/plain", "application/x-www-form-urlencoded",
+                                          "multipart/form-data; boundary=x"])
+def test_non_json_content_type_is_rejected(serve, content_type):
+    status, _, _ = call(serve(), 'POST', '/chat', b'{"query": "merhaba"}', {'Content-Type': content_type})
+    assert status == 415
+
+
+def test_json_content_type_with_charset_is_accepted(serve):
+    status, _, _ = call(serve(), 'POST', '/chat', b'{"query": "merhaba"}',
+                        {'Content-Type': "Application/JSON; charset=utf-8"})
+    assert status == 200
+
+
+@pytest.mark.parametrize('length', ["abc", "-1", "1.5", " "])
+def test_invalid_content_length_is_rejected(serve, length):
+    status, headers, body = call(serve(), 'POST', '/chat', b'{}',
+                                 {'Content-Type': 'application/json', 'Content-Length': length})
+    assert status == 400 and body['error'] == 'geçersiz Content-Length'
+    assert headers['Connection'] == 'close'
+
+
+def test_oversized_body_is_rejected_without_reading_it(serve):
+    server = serve()
+    length = str(run.QuantumiaRequestHandler.max_body + 1)
+    status, headers, _ = call(server, 'POST', '/chat', b'',
+                              {'Content-Type': 'application/json', 'Content-Length': length})
+    assert status == 413 and headers['Connection'] == 'close'
+
+
+def test_missing_body_is_an_empty_object(serve):
+    status, _, body = call(serve(), 'POST', '/sessions', headers={'Content-Type': 'application/json'})
+    assert status == 201 and body['user_name'] == "Kullanıcı"
+    status, _, body = call(serve(), 'POST', '/chat', headers={'Content-Type': 'application/json'})
+    assert status == 400 and "'query'" in body['error']
+
+
+@pytest.mark.parametrize('payload', [b'{"query": ', b'[1, 2]', b'"metin"'])
+def test_malformed_or_non_object_json_is_rejected(serve, payload):
+    assert call(serve(), 'POST', '/chat', payload, {'Content-Type': 'application/json'})[0] == 400
+
+
+@pytest.mark.parametrize('host, loopback', [("localhost", True), ("127.0.0.1", True), ("127.8.9.10", True),
+                                            ("::1", True), ("0.0.0.0", False), ("192.168.1.5", False),
+                                            ("example.com", False)])
+def test_is_loopback(host, loopback):
+    assert run.is_loopback(host) is loopback
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""WeatherProvider ve Gazetteer: yerel taklit Open-Meteo sunucusuyla önbellek ve birleştirme"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import benchmark
+import run
+
+ANKARA = run.Place("Ankara", 39.93, 32.86, "TR", None)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return os.path.join(tmp_path, "weather_cache.db")
+
+
+def provider(cache_path, base_url, **kwargs):
+    return run.WeatherProvider(run.WeatherCache(cache_path), base_url, **kwargs)
+
+
+def close(weather):
+    weather.close()
+    weather.cache.close()
+
+
+def test_concurrent_calls_for_one_place_send_one_request(cache_path, weather_server, monkeypatch):
+    monkeypatch.setattr(benchmark.StubWeatherHandler, 'delay', 0.2)
+    weather = provider(cache_path, weather_server)
+    barrier = threading.Barrier(16)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(weather.forecast(ANKARA))
+
+    threads = [threading.Thread(target=call) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    close(weather)
+    assert benchmark.StubWeatherHandler.hits == 1
+    assert len(results) == 16 and len({result.temperature for result in results}) == 1
+
+
+def test_request_counter_is_exact_under_concurrency(cache_path, weather_server):
+    weather = provider(cache_path, weather_server, workers=16)
+    places = [run.Place(f"Yer {i}", 36 + i * 0.05, 26 + i * 0.05, "TR", None) for i in range(100)]
+    results = weather.forecast_many(places)
+    close(weather)
+    assert len(results) == 100
+    assert weather.requests_sent == benchmark.StubWeatherHandler.hits == 100
+
+
+def test_fresh_entry_is_served_from_cache_until_ttl_expires(cache_path, weather_server):
+    weather = provider(cache_path, weather_server, ttl=0.3)
+    first = weather.forecast(ANKARA)
+    assert weather.forecast(ANKARA) == first
+    assert benchmark.StubWeatherHandler.hits == 1
+    time.sleep(0.4)
+    refreshed = weather.forecast(ANKARA)
+    close(weather)
+    assert benchmark.StubWeatherHandler.hits == 2
+    assert refreshed.fetched_at > first.fetched_at and not refreshed.stale
+
+
+def test_disk_cache_stays_warm_across_a_new_weather_cache(cache_path, weather_server):
+    weather = provider(cache_path, weather_server)
+    first = weather.forecast(ANKARA)
+    close(weather)
+    restarted = provider(cache_path, weather_server)
+    again = restarted.forecast(ANKARA)
+    close(restarted)
+    assert benchmark.StubWeatherHandler.hits == 1
+    assert again.temperature == first.temperature and not again.stale
+
+
+def test_stale_entry_is_used_when_endpoint_is_down(cache_path, weather_server, closed_port):
+    weather = provider(cache_path, weather_server)
+    first = weather.forecast(ANKARA)
+    close(weather)
+    offline = provider(cache_path, f"http://127.0.0.1:{closed_port}", ttl=0, timeout=1)
+    stale = offline.forecast(ANKARA)
+    other = run.Place("İzmir", 38.42, 27.14, "TR", None)
+    with pytest.raises(run.WeatherUnavailable):
+        offline.forecast(other)
+    (_, result), = offline.forecast_many([other])
+    close(offline)
+    assert stale.stale and stale.temperature == first.temperature
+    assert isinstance(result, run.WeatherUnavailable)
+
+
+@pytest.mark.parametrize("query, name", [
+    ("IĞDIR hava durumu", "Iğdır"),
+    ("Izmir'de hava nasıl", "İzmir"),
+    ("ankarada yarın hava", "Ankara"),
+    ("İSTANBUL", "İstanbul"),
+    ("antep hava durumu", "Gaziantep"),
+])
+def test_gazetteer_folds_turkish_case_and_suffixes(query, name):
+    assert run.Gazetteer.load().find(query).name == name
+
+
+def test_gazetteer_finds_several_places_in_order():
+    found = run.Gazetteer.load().find_all("ankara ve izmirdeki hava")
+    assert [place.name for place in found] == ["Ankara", "İzmir"]
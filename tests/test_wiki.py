@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""WikiLookup ve WikiCache: yerel taklit Vikipedi uç noktasıyla önbellek, birleştirme ve döküm aktarımı"""
+
+import gzip
+import json
+import os
+import statistics
+import threading
+import time
+
+import pytest
+
+import benchmark
+import run
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = run.WikiCache(os.path.join(tmp_path, "wiki_cache.db"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def lookup(cache, wiki_server):
+    lookup = run.WikiLookup(cache, wiki_server, prefetch=0)
+    yield lookup
+    lookup.close()
+
+
+@pytest.fixture
+def offline(cache, closed_port):
+    """Ulaşılamayan uç noktaya bakan arama: yanıt yalnız önbellekten gelebilir"""
+    lookup = run.WikiLookup(cache, f"http://127.0.0.1:{closed_port}", prefetch=0, timeout=1)
+    yield lookup
+    lookup.close()
+
+
+def test_cached_article_is_served_without_network(cache, offline):
+    cache.put('tr', "Ankara", "Ankara, Türkiye'nin başkentidir.", aliases=[run.wiki_key("başkent")])
+    article = offline.lookup("ANKARA")
+    assert article.source == 'cache' and article.title == "Ankara"
+    assert offline.lookup("başkent").title == "Ankara"
+    assert offline.requests_sent == 0
+
+
+def test_miss_is_fetched_stored_and_then_served_from_cache(cache, lookup):
+    article = lookup.lookup("Boğaziçi Köprüsü")
+    assert article.source == 'network'
+    assert benchmark.StubWikiHandler.hits == 1
+    assert cache.contains('tr', run.wiki_key("Boğaziçi Köprüsü"))
+    again = lookup.lookup("boğaziçi köprüsü")
+    assert again.source == 'cache' and again.summary == article.summary
+    assert benchmark.StubWikiHandler.hits == 1
+
+
+def test_not_found_is_negatively_cached(lookup):
+    assert lookup.lookup("Yok böyle bir madde") is None
+    assert lookup.lookup("yok böyle bir madde") is None
+    assert benchmark.StubWikiHandler.hits == 1
+
+
+def test_negative_cache_is_bounded_and_expires(cache, wiki_server, monkeypatch):
+    lookup = run.WikiLookup(cache, wiki_server, prefetch=0, missing_ttl=60, missing_limit=3)
+    try:
+        for i in range(10):
+            assert lookup.lookup(f"Yok {i}") is None
+        assert len(lookup._missing) == 3
+        assert [key for _, key in lookup._missing] == ["yok 7", "yok 8", "yok 9"]
+        # missing_ttl sonrası ilk eklemede süresi dolanlar da atılır ve başlık yeniden sorulur
+        now = time.time()
+        monkeypatch.setattr(run.time, 'time', lambda: now + 61)
+        assert lookup.lookup("Yok 9") is None
+        assert [key for _, key in lookup._missing] == ["yok 9"]
+        assert benchmark.StubWikiHandler.hits == 11
+    finally:
+        lookup.close()
+
+
+def test_request_counter_is_exact_under_concurrency(lookup):
+    titles = [f"Konu {i}" for i in range(64)]
+    threads = [threading.Thread(target=lookup.lookup, args=(title,)) for title in titles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lookup.requests_sent == benchmark.StubWikiHandler.hits == 64
+
+
+def test_concurrent_lookups_for_one_title_send_one_request(lookup, monkeypatch):
+    monkeypatch.setattr(benchmark.StubWikiHandler, 'delay', 0.2)
+    barrier = threading.Barrier(16)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(lookup.lookup("Eşzamanlı konu"))
+
+    threads = [threading.Thread(target=call) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert benchmark.StubWikiHandler.hits == 1
+    assert len(results) == 16 and all(result is not None for result in results)
+
+
+def write_jsonl(path, records):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for title, extract in records:
+            f.write(json.dumps({'title': title, 'extract': extract}, ensure_ascii=False) + "\n")
+
+
+def write_abstract_xml(path, records):
+    docs = ''.join(f"<doc><title>Vikipedi: {title}</title><url>https://tr.wikipedia.org/wiki/{title}</url>"
+                   f"<abstract>{abstract}</abstract></doc>\n" for title, abstract in records)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(f"<feed>\n{docs}</feed>\n")
+
+
+@pytest.mark.parametrize("name, writer", [("dump.jsonl.gz", write_jsonl), ("dump-abstract.xml.gz", write_abstract_xml)])
+def test_dump_import(tmp_path, offline, name, writer):
+    records = [(f"Madde {i}", benchmark.synthetic_extract(f"Madde {i}")) for i in range(500)]
+    records.append(("İstanbul Boğazı", "İstanbul Boğazı, Karadeniz'i Marmara'ya bağlar."))
+    path = os.path.join(tmp_path, name)
+    writer(path, records)
+    assert offline.import_dump(path, batch=100) == len(records)
+    article = offline.lookup("istanbul bogazi")
+    assert article.title == "İstanbul Boğazı" and article.summary.startswith("İstanbul Boğazı,")
+    assert offline.lookup("Madde 250").summary == records[250][1]
+    assert offline.requests_sent == 0
+
+
+def test_cache_hit_returns_in_under_a_millisecond(cache, offline):
+    titles = [f"Konu {i}" for i in range(2000)]
+    cache.put_many('tr', [(title, benchmark.synthetic_extract(title), None) for title in titles])
+    timings = []
+    for title in titles[::10]:
+        start = time.perf_counter()
+        assert offline.lookup(title) is not None
+        timings.append(time.perf_counter() - start)
+    assert statistics.median(timings) < 0.001